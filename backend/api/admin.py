@@ -1,16 +1,109 @@
+from django.conf import settings
 from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from django.utils.html import format_html
+
 from .models import Category, PasswordEntry, SecretBundle
 
+
+def estimated_row_count(model, alias="default"):
+    """Estimation du planificateur (pg_class.reltuples), None si la table n'a jamais été analysée."""
+    connection = connections[alias]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [model._meta.db_table])
+        row = cursor.fetchone()
+    return row[0] if row and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Changelist non filtrée : COUNT(*) exact remplacé par l'estimation de
+    pg_class au-delà de ADMIN_EXACT_COUNT_THRESHOLD lignes. Une recherche
+    reste comptée exactement (résultat borné par l'index qui la sert).
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimated_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate > settings.ADMIN_EXACT_COUNT_THRESHOLD:
+                return estimate
+        return super().count
+
+
+class OwnerFilter(admin.SimpleListFilter):
+    """
+    Filtre ?owner=<id>, servi par les index préfixés par owner_id. Pas de liste
+    de tous les utilisateurs : seul le propriétaire sélectionné (lien de la
+    colonne owner) est affiché.
+    """
+
+    title = "owner"
+    parameter_name = "owner"
+
+    def lookups(self, request, model_admin):
+        value = self.value()
+        if not value or not value.isdigit():
+            return ()
+        return get_user_model().objects.filter(pk=value).values_list("pk", "username")
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(owner_id=self.value())
+        return queryset
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    # Pas de second COUNT(*) sur toute la table quand une recherche est active.
+    show_full_result_count = False
+    # Tri sur la clé primaire : pas de tri de la table entière par titre ou par propriétaire.
+    ordering = ("-id",)
+    # Pas de <select> chargeant tous les utilisateurs / catégories dans le formulaire.
+    raw_id_fields = ("owner",)
+    # Colonnes chiffrées jamais lues ni rendues (liste, formulaire, suppression).
+    deferred_fields = ()
+    # Propriétaire filtré par id (OwnerFilter), jamais recherché : un OR sur la
+    # jointure auth_user empêcherait l'usage des index de la table.
+    list_filter = (OwnerFilter,)
+
+    @admin.display(description="owner")
+    def owner_link(self, obj):
+        return format_html('<a href="?owner={}">{}</a>', obj.owner_id, obj.owner)
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        return queryset.defer(*self.deferred_fields) if self.deferred_fields else queryset
+
+
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
-    list_display = ("id", "name", "owner")
+class CategoryAdmin(LargeTableAdmin):
+    list_display = ("id", "name", "owner_link")
+    list_select_related = ("owner",)
+
 
 @admin.register(PasswordEntry)
-class PasswordEntryAdmin(admin.ModelAdmin):
-    list_display = ("id", "title", "owner", "category", "created_at", "updated_at")
+class PasswordEntryAdmin(LargeTableAdmin):
+    list_display = ("id", "title", "owner_link", "category", "created_at", "updated_at")
+    list_select_related = ("owner", "category")
+    raw_id_fields = ("owner", "category")
+    exclude = ("ciphertext",)
+    deferred_fields = ("ciphertext",)
 
 
 @admin.register(SecretBundle)
-class SecretBundleAdmin(admin.ModelAdmin):
-    list_display = ("id", "owner", "app", "environment", "created_at", "updated_at")
-    search_fields = ("owner__username", "app", "environment")
+class SecretBundleAdmin(LargeTableAdmin):
+    list_display = ("id", "owner_link", "app", "environment", "created_at", "updated_at")
+    list_select_related = ("owner",)
+    # Seule colonne recherchée : préfixe d'application servi par secret_app_prefix_idx,
+    # présent dans toutes les installations (pas de recherche par titre ou par nom,
+    # que seul pg_trgm sait indexer).
+    search_fields = ("app__startswith",)
+    exclude = ("payload",)
+    deferred_fields = ("payload",)
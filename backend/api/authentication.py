@@ -0,0 +1,135 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.db import router
+from django.http import JsonResponse
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotAuthenticated
+from rest_framework.settings import api_settings as drf_settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from .token_blacklist import VaultRefreshToken
+from .token_versions import TOKEN_VERSION_CLAIM, arevocation_state, get_token_version, revocation_state
+
+
+def add_user_claims(token, user):
+    """Claims utilisés par l'authentification sans état."""
+    token[get_user_model().USERNAME_FIELD] = user.get_username()
+    token["is_active"] = user.is_active
+    token[TOKEN_VERSION_CLAIM] = get_token_version(user.pk)
+    return token
+
+
+def user_from_claims(user_id, validated_token):
+    """
+    Instance utilisateur non chargée, bâtie sur les claims : les autres
+    champs sont différés et ne coûtent une requête que s'ils sont lus.
+    """
+    user_model = get_user_model()
+    claims = {
+        api_settings.USER_ID_FIELD: user_id,
+        user_model.USERNAME_FIELD: validated_token[user_model.USERNAME_FIELD],
+        "is_active": True,
+    }
+    fields = [f.attname for f in user_model._meta.concrete_fields if f.attname in claims]
+    return user_model.from_db(router.db_for_read(user_model), fields, [claims[name] for name in fields])
+
+
+class VaultTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = VaultRefreshToken
+
+    @classmethod
+    def get_token(cls, user):
+        return add_user_claims(super().get_token(user), user)
+
+
+class VaultTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = VaultRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        version = refresh.get(TOKEN_VERSION_CLAIM)
+        if version is not None and version != get_token_version(refresh.get(api_settings.USER_ID_CLAIM)):
+            raise InvalidToken(_("Token has been revoked"))
+        return super().validate(attrs)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT sans requête sur auth_user : l'utilisateur vient des claims signés,
+    la révocation (compte désactivé, version de jetons incrémentée) est
+    vérifiée via le cache du processus. Les jetons émis sans ces claims
+    retombent sur le chargement complet.
+    """
+
+    def get_user(self, validated_token):
+        if TOKEN_VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        user_id = self.claimed_user_id(validated_token)
+        return self.user_for_state(user_id, validated_token, revocation_state(user_id))
+
+    async def aauthenticate(self, request):
+        """Équivalent async de authenticate() pour les vues ASGI (hors DRF)."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        if TOKEN_VERSION_CLAIM not in validated_token:
+            return await sync_to_async(super().get_user)(validated_token), validated_token
+        user_id = self.claimed_user_id(validated_token)
+        state = await arevocation_state(user_id)
+        return self.user_for_state(user_id, validated_token, state), validated_token
+
+    def claimed_user_id(self, validated_token):
+        try:
+            # simplejwt sérialise l'identifiant en chaîne.
+            return self.user_model._meta.get_field(api_settings.USER_ID_FIELD).to_python(
+                validated_token[api_settings.USER_ID_CLAIM]
+            )
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+    def user_for_state(self, user_id, validated_token, state):
+        is_active, version = state
+        if version is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if not (is_active and validated_token.get("is_active")):
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if validated_token[TOKEN_VERSION_CLAIM] != version:
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+        return user_from_claims(user_id, validated_token)
+
+
+async def aauthenticate_request(request):
+    """(user, token) via les classes DRF configurées, ou None ; lève AuthenticationFailed/InvalidToken."""
+    # Même convention que rest_framework.request.Request (APIClient.force_authenticate).
+    forced_user = getattr(request, "_force_auth_user", None)
+    if forced_user is not None:
+        return forced_user, getattr(request, "_force_auth_token", None)
+    for authenticator in authenticators():
+        if hasattr(authenticator, "aauthenticate"):
+            result = await authenticator.aauthenticate(request)
+        else:
+            result = await sync_to_async(authenticator.authenticate)(request)
+        if result is not None:
+            return result
+    return None
+
+
+def authenticators():
+    return [auth_class() for auth_class in drf_settings.DEFAULT_AUTHENTICATION_CLASSES]
+
+
+def unauthorized_response(exc=None):
+    """401 au format DRF pour les vues async hors DRF."""
+    if exc is None:
+        exc = NotAuthenticated()
+    detail = exc.detail if isinstance(exc.detail, dict) else {"detail": exc.detail}
+    response = JsonResponse(detail, status=401)
+    response["WWW-Authenticate"] = authenticators()[0].authenticate_header(None)
+    return response
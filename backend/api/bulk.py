@@ -0,0 +1,137 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Category, PasswordEntry
+from .serializers import PasswordBulkDataSerializer
+from .vault_version import bump_vault_version, coalesced_vault_bumps
+
+BULK_OPERATIONS = ("create", "update", "patch", "delete")
+BULK_MAX_OPERATIONS = 1000
+BULK_BATCH_SIZE = 500
+
+
+def _parse_operations(operations):
+    parsed, errors, seen_ids = [], [], set()
+    for index, item in enumerate(operations):
+        if not isinstance(item, dict):
+            errors.append({"index": index, "errors": {"detail": ["Each operation must be an object."]}})
+            continue
+
+        op = item.get("op")
+        if op not in BULK_OPERATIONS:
+            errors.append({"index": index, "errors": {"op": [f"Must be one of: {', '.join(BULK_OPERATIONS)}."]}})
+            continue
+
+        pk = None
+        if op != "create":
+            pk = item.get("id")
+            if not isinstance(pk, int) or isinstance(pk, bool):
+                errors.append({"index": index, "errors": {"id": ["A valid integer is required."]}})
+                continue
+            if pk in seen_ids:
+                errors.append({"index": index, "errors": {"id": ["Duplicate id in batch."]}})
+                continue
+            seen_ids.add(pk)
+
+        data = None
+        if op != "delete":
+            serializer = PasswordBulkDataSerializer(data=item.get("data"), partial=op == "patch")
+            if not serializer.is_valid():
+                errors.append({"index": index, "errors": serializer.errors})
+                continue
+            data = serializer.validated_data
+
+        parsed.append((index, op, pk, data))
+    return parsed, errors
+
+
+def _check_ownership(owner, parsed):
+    """Deux requêtes pour tout le lot : catégories puis entrées du propriétaire."""
+    category_ids = {
+        data["category"]
+        for _, _, _, data in parsed
+        if data and data.get("category") is not None
+    }
+    entry_ids = {pk for _, _, pk, _ in parsed if pk is not None}
+
+    owned_categories = set(
+        Category.objects.filter(owner=owner, id__in=category_ids).values_list("id", flat=True)
+    ) if category_ids else set()
+    owned_entries = set(
+        PasswordEntry.objects.filter(owner=owner, id__in=entry_ids).values_list("id", flat=True)
+    ) if entry_ids else set()
+
+    errors = []
+    for index, _, pk, data in parsed:
+        item_errors = {}
+        if pk is not None and pk not in owned_entries:
+            item_errors["id"] = ["Not found."]
+        category = data.get("category") if data else None
+        if category is not None and category not in owned_categories:
+            item_errors["category"] = [f'Invalid pk "{category}" - object does not exist.']
+        if item_errors:
+            errors.append({"index": index, "errors": item_errors})
+    return errors
+
+
+def _entry_from_data(entry, data):
+    fields = []
+    for name, value in data.items():
+        if name == "category":
+            entry.category_id = value
+        else:
+            setattr(entry, name, value)
+        fields.append(name)
+    return fields
+
+
+def apply_password_bulk(owner, operations):
+    """
+    Applique un lot mixte create/update/patch/delete dans une seule transaction.
+    Retourne (results, errors) ; rien n'est écrit si une opération est invalide.
+    """
+    parsed, errors = _parse_operations(operations)
+    if not errors:
+        errors = _check_ownership(owner, parsed)
+    if errors:
+        return None, errors
+
+    now = timezone.now()
+    created, updated_groups, delete_ids = [], defaultdict(list), []
+    for index, op, pk, data in parsed:
+        if op == "create":
+            entry = PasswordEntry(owner=owner)
+            _entry_from_data(entry, data)
+            created.append(entry)
+        elif op == "delete":
+            delete_ids.append(pk)
+        else:
+            entry = PasswordEntry(pk=pk, owner=owner)
+            fields = _entry_from_data(entry, data)
+            # bulk_update n'applique pas auto_now.
+            entry.updated_at = now
+            updated_groups[tuple(sorted(fields)) + ("updated_at",)].append(entry)
+
+    with transaction.atomic(), coalesced_vault_bumps():
+        if created:
+            PasswordEntry.objects.bulk_create(created, batch_size=BULK_BATCH_SIZE)
+        for fields, entries in updated_groups.items():
+            PasswordEntry.objects.bulk_update(entries, fields, batch_size=BULK_BATCH_SIZE)
+        if delete_ids:
+            PasswordEntry.objects.filter(owner=owner, id__in=delete_ids).delete()
+        # bulk_create/bulk_update n'émettent pas de signaux.
+        bump_vault_version(owner.id)
+
+    created_iter = iter(created)
+    results = []
+    for index, op, pk, _ in parsed:
+        if op == "create":
+            entry = next(created_iter)
+            results.append({"index": index, "op": op, "id": entry.pk, "status": 201, "updated_at": entry.updated_at})
+        elif op == "delete":
+            results.append({"index": index, "op": op, "id": pk, "status": 204})
+        else:
+            results.append({"index": index, "op": op, "id": pk, "status": 200, "updated_at": now})
+    return results, None
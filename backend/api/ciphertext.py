@@ -0,0 +1,139 @@
+"""
+Format de stockage binaire versionné des `ciphertext` de PasswordEntry.
+
+Le serveur ne déchiffre rien : il se contente de stocker sans base64 les
+composants produits par frontend/src/utils/crypto.js.
+
+    v1 : 0x01 | présence (1 bit par composant) | (longueur varint | octets)*
+    v0 : 0x00 | JSON UTF-8 (toute forme non canonique, restituée telle quelle)
+"""
+import base64
+import binascii
+import json
+
+FORMAT_JSON = 0
+FORMAT_PACKED = 1
+
+# Ordre de stockage ; bit i du masque de présence = PACKED_PARTS[i].
+PACKED_PARTS = ("iv", "salt", "key", "data")
+# Ordre de restitution identique à celui de jsonb (longueur puis octets),
+# pour que la sortie de l'API reste la même qu'avant la migration.
+OUTPUT_ORDER = tuple(sorted(PACKED_PARTS, key=lambda name: (len(name), name)))
+
+
+def _decode_canonical_b64(value):
+    if not isinstance(value, str):
+        return None
+    try:
+        raw = base64.b64decode(value, validate=True)
+    except (binascii.Error, ValueError):
+        return None
+    # Seul un base64 canonique est stocké en binaire : la restitution est exacte.
+    if base64.b64encode(raw).decode("ascii") != value:
+        return None
+    return raw
+
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(buf, pos):
+    shift = result = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def pack_raw_parts(parts):
+    """dict nom -> octets (composants connus uniquement) -> blob v1."""
+    mask = 0
+    body = bytearray()
+    for bit, name in enumerate(PACKED_PARTS):
+        raw = parts.get(name)
+        if raw is None:
+            continue
+        mask |= 1 << bit
+        _write_varint(body, len(raw))
+        body += raw
+    return bytes((FORMAT_PACKED, mask)) + bytes(body)
+
+
+def pack_ciphertext(value):
+    """Valeur JSON (dict de base64 en pratique) -> blob versionné."""
+    if isinstance(value, dict) and value and set(value) <= set(PACKED_PARTS):
+        parts = {}
+        for name, encoded in value.items():
+            raw = _decode_canonical_b64(encoded)
+            if raw is None:
+                break
+            parts[name] = raw
+        else:
+            return pack_raw_parts(parts)
+    return bytes((FORMAT_JSON,)) + json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def unpack_raw_parts(blob):
+    """Blob v1 -> dict nom -> octets, dans l'ordre de restitution."""
+    mask = blob[1]
+    pos = 2
+    parts = {}
+    for bit, name in enumerate(PACKED_PARTS):
+        if mask & (1 << bit):
+            size, pos = _read_varint(blob, pos)
+            parts[name] = blob[pos:pos + size]
+            pos += size
+    return {name: parts[name] for name in OUTPUT_ORDER if name in parts}
+
+
+def unpack_ciphertext(blob):
+    """Blob versionné -> valeur JSON d'origine (composants en base64)."""
+    blob = bytes(blob)
+    if blob[0] == FORMAT_PACKED:
+        return {
+            name: base64.b64encode(raw).decode("ascii")
+            for name, raw in unpack_raw_parts(blob).items()
+        }
+    if blob[0] == FORMAT_JSON:
+        return json.loads(blob[1:])
+    raise ValueError(f"Unknown ciphertext format {blob[0]}")
+
+
+def unpack_ciphertext_binary(blob):
+    """Représentation binaire (msgpack) : octets bruts en v1, JSON d'origine en v0."""
+    blob = bytes(blob)
+    if blob[0] == FORMAT_PACKED:
+        return unpack_raw_parts(blob)
+    return unpack_ciphertext(blob)
+
+
+def ciphertext_to_binary(value):
+    """Valeur JSON déjà décodée -> représentation binaire équivalente."""
+    if isinstance(value, dict) and set(value) <= set(PACKED_PARTS):
+        parts = {name: _decode_canonical_b64(encoded) for name, encoded in value.items()}
+        if all(raw is not None for raw in parts.values()):
+            return parts
+    return value
+
+
+def ciphertext_json_bytes(blob):
+    """
+    Blob versionné -> texte JSON de la représentation API, sans passer par
+    un dict : concaténation directe en v1, JSON stocké tel quel en v0.
+    """
+    blob = bytes(blob)
+    if blob[0] == FORMAT_PACKED:
+        return b"{" + b",".join(
+            b'"%s":"%s"' % (name.encode("ascii"), base64.b64encode(raw))
+            for name, raw in unpack_raw_parts(blob).items()
+        ) + b"}"
+    if blob[0] == FORMAT_JSON:
+        return blob[1:]
+    raise ValueError(f"Unknown ciphertext format {blob[0]}")
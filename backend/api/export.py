@@ -0,0 +1,104 @@
+"""
+Export NDJSON de la voûte d'un propriétaire : une ligne par catégorie,
+entrée et bundle de secrets, lues par curseur côté serveur (par pages sur
+clé derrière pgbouncer) et émises par blocs. La mémoire du worker ne
+dépend pas de la taille de la voûte, sous WSGI comme sous ASGI.
+"""
+from contextlib import nullcontext
+
+from asgiref.sync import sync_to_async
+from django.db import connection, connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Category, PasswordEntry, SecretBundle
+from .projection import get_projection
+from .renderers import FastJSONRenderer
+from .serializers import CategorySerializer, PasswordSerializer, SecretBundleSerializer
+
+EXPORT_FORMAT = "gestionnaire-mdp"
+EXPORT_VERSION = 1
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_BUFFER_BYTES = 64 * 1024
+
+EXPORT_SECTIONS = (
+    ("category", Category, CategorySerializer, ("id",)),
+    ("password", PasswordEntry, PasswordSerializer, ("id",)),
+    ("secret", SecretBundle, SecretBundleSerializer, ("app", "environment")),
+)
+
+
+def export_records(owner_id, chunk_size=EXPORT_CHUNK_SIZE):
+    yield {
+        "type": "meta",
+        "format": EXPORT_FORMAT,
+        "version": EXPORT_VERSION,
+        "exported_at": timezone.now().isoformat().replace("+00:00", "Z"),
+    }
+    for kind, model, serializer_class, ordering in EXPORT_SECTIONS:
+        projection = get_projection(serializer_class)
+        transform = projection.transformer()
+        queryset = model.objects.filter(owner_id=owner_id).order_by(*ordering)
+        for row in _section_rows(projection, queryset, ordering, chunk_size):
+            yield {"type": kind, **transform(row)}
+
+
+def _section_rows(projection, queryset, ordering, chunk_size):
+    if not connections[queryset.db].settings_dict.get("DISABLE_SERVER_SIDE_CURSORS"):
+        yield from projection.rows(queryset).iterator(chunk_size=chunk_size)
+        return
+    # Sans curseur serveur (pgbouncer en mode transaction), iterator() chargerait
+    # toute la section d'un coup : pages de `chunk_size` lignes sur la clé de tri,
+    # lues dans le même instantané que le reste de l'export.
+    positions = [projection.columns.index(name) for name in ordering]
+    page_queryset = queryset
+    while True:
+        page = list(projection.rows(page_queryset)[:chunk_size])
+        yield from page
+        if len(page) < chunk_size:
+            return
+        page_queryset = queryset.filter(_after(ordering, [page[-1][index] for index in positions]))
+
+
+def _after(ordering, values):
+    """Lignes strictement après `values` dans l'ordre (unique) `ordering`."""
+    condition = Q()
+    for index, name in enumerate(ordering):
+        condition |= Q(**dict(zip(ordering[:index], values[:index])), **{f"{name}__gt": values[index]})
+    return condition
+
+
+def stream_export(owner_id, chunk_size=EXPORT_CHUNK_SIZE, buffer_bytes=EXPORT_BUFFER_BYTES):
+    """Lignes NDJSON regroupées en blocs d'environ `buffer_bytes`."""
+    # Instantané cohérent des trois tables (références de catégories comprises),
+    # sauf si un appelant a déjà ouvert une transaction.
+    outermost = not connection.in_atomic_block
+    with transaction.atomic() if outermost else nullcontext():
+        if outermost:
+            with connection.cursor() as cursor:
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+        render = FastJSONRenderer().render
+        buffer = bytearray()
+        for record in export_records(owner_id, chunk_size):
+            buffer += render(record)
+            buffer += b"\n"
+            if len(buffer) >= buffer_bytes:
+                yield bytes(buffer)
+                buffer.clear()
+        if buffer:
+            yield bytes(buffer)
+
+
+async def astream_export(owner_id, chunk_size=EXPORT_CHUNK_SIZE, buffer_bytes=EXPORT_BUFFER_BYTES):
+    """
+    stream_export pour ASGI : un itérateur sync y serait lu en entier avant
+    l'envoi. Chaque bloc est produit dans le thread de la requête, celui qui
+    tient la connexion et la transaction de l'export.
+    """
+    chunks = stream_export(owner_id, chunk_size, buffer_bytes)
+    next_chunk = sync_to_async(next)
+    try:
+        while (chunk := await next_chunk(chunks, None)) is not None:
+            yield chunk
+    finally:
+        await sync_to_async(chunks.close)()
@@ -0,0 +1,32 @@
+import json
+
+from django.db import models
+
+from .ciphertext import pack_ciphertext, unpack_ciphertext
+
+
+class CiphertextField(models.BinaryField):
+    """
+    `bytea` au format versionné de api.ciphertext ; côté Python la valeur
+    reste le dict JSON habituel ({iv, salt, key, data} en base64).
+    """
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return None
+        return unpack_ciphertext(value)
+
+    def to_python(self, value):
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return unpack_ciphertext(value)
+        if isinstance(value, str):
+            return json.loads(value)
+        return value
+
+    def get_prep_value(self, value):
+        if value is None or isinstance(value, (bytes, bytearray, memoryview)):
+            return value
+        return pack_ciphertext(value)
+
+    def value_to_string(self, obj):
+        return json.dumps(self.value_from_object(obj))
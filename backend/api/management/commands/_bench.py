@@ -0,0 +1,53 @@
+"""Outils communs aux commandes bench_* (données temporaires, chronométrage)."""
+import base64
+import os
+import time
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from api.models import PasswordEntry
+
+
+def random_b64(size):
+    return base64.b64encode(os.urandom(size)).decode()
+
+
+def fake_ciphertext():
+    """Tailles proches de celles produites par frontend/src/utils/crypto.js."""
+    return {"iv": random_b64(12), "salt": random_b64(16), "key": random_b64(32), "data": random_b64(160)}
+
+
+@contextmanager
+def rolled_back():
+    """Transaction systématiquement annulée : la base reste intacte."""
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def seed_bench_vault(rows, prefix="bench"):
+    owner = get_user_model().objects.create_user(username=f"{prefix}-{rows}-{time.time_ns()}")
+    PasswordEntry.objects.bulk_create(
+        [
+            PasswordEntry(
+                owner=owner,
+                title=f"entry-{i:06d}",
+                url=f"https://site-{i}.example.com/login",
+                ciphertext=fake_ciphertext(),
+            )
+            for i in range(rows)
+        ],
+        batch_size=1000,
+    )
+    return owner
+
+
+def best_of(fn, repeat):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
@@ -0,0 +1,108 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import ThreadSensitiveContext, sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import AsyncClient, Client, override_settings
+
+from api.authentication import add_user_claims
+from api.models import SecretBundle
+from api.token_blacklist import VaultRefreshToken
+
+from ._bench import fake_ciphertext
+
+URL = "/api/secrets/?app=bench&env=prod"
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare WSGI (threads fixes) et ASGI (vues async) pour une rafale de lectures de secrets ; "
+        "latences mesurées depuis l'envoi, attente de file comprise"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument("--threads", type=int, default=4, help="threads d'un worker gunicorn WSGI")
+        parser.add_argument("--db-latency-ms", type=float, default=0.0, help="latence réseau DB simulée")
+        parser.add_argument("--cache", action="store_true", help="garde le cache des secrets (sinon chaque lecture va en base)")
+
+    def handle(self, *args, **opts):
+        # Données validées (pas de transaction annulée) : les threads doivent les voir.
+        owner = get_user_model().objects.create_user(username=f"bench-asgi-{time.time_ns()}")
+        SecretBundle.objects.create(owner=owner, app="bench", environment="prod", payload=fake_ciphertext())
+        access = add_user_claims(VaultRefreshToken.for_user(owner), owner).access_token
+        headers = {"Authorization": f"Bearer {access}"}
+
+        latency = opts["db_latency_ms"] / 1000
+        def slow_query(execute, sql, params, many, context):
+            time.sleep(latency)
+            return execute(sql, params, many, context)
+        def add_latency(sender, connection, **kwargs):
+            connection.execute_wrappers.append(slow_query)
+
+        if latency:
+            connection.close()
+            connection_created.connect(add_latency)
+        overrides = {"ALLOWED_HOSTS": ["testserver"]}
+        # Un seul processus ici : le cache local suffit, avec ou sans CACHE_REDIS_URL.
+        overrides["SECRETS_CACHE_TIMEOUT"] = (settings.SECRETS_CACHE_TIMEOUT or 300) if opts["cache"] else 0
+        try:
+            with override_settings(**overrides):
+                self.stdout.write(f"{'serveur':>8} {'req/s':>8} {'p50':>9} {'p95':>9} {'p99':>9}")
+                # URLconf de chaque mode (voir ROOT_URLCONF), quel que soit APP_SERVER ici.
+                with override_settings(ROOT_URLCONF="gestionnaire_mdp.urls"):
+                    self.report("wsgi", *self.run_wsgi(headers, opts))
+                with override_settings(ROOT_URLCONF="gestionnaire_mdp.asgi_urls"):
+                    self.report("asgi", *self.run_asgi(headers, opts))
+        finally:
+            connection_created.disconnect(add_latency)
+            owner.delete()
+
+    def run_wsgi(self, headers, opts):
+        def one(submitted):
+            response = Client().get(URL, headers=headers)
+            assert response.status_code == 200, response.status_code
+            return time.perf_counter() - submitted
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=opts["threads"]) as pool:
+            futures = [pool.submit(one, time.perf_counter()) for _ in range(opts["requests"])]
+            timings = [future.result() for future in futures]
+        return time.perf_counter() - start, timings
+
+    def run_asgi(self, headers, opts):
+        async def run():
+            client = AsyncClient()
+            gate = asyncio.Semaphore(opts["concurrency"])
+
+            async def one():
+                start = time.perf_counter()
+                # Comme ASGIHandler.__call__ : un contexte (donc un thread ORM) par requête.
+                async with gate, ThreadSensitiveContext():
+                    response = await client.get(URL, headers=headers)
+                    # Sous ASGI, CONN_MAX_AGE=0 : la connexion du thread de la requête est fermée
+                    # (le client de test ne le fait pas lui-même).
+                    await sync_to_async(lambda: connection.close())()
+                    assert response.status_code == 200, response.status_code
+                    return time.perf_counter() - start
+
+            start = time.perf_counter()
+            timings = await asyncio.gather(*(one() for _ in range(opts["requests"])))
+            return time.perf_counter() - start, timings
+
+        return asyncio.run(run())
+
+    def report(self, name, elapsed, timings):
+        timings = sorted(timings)
+        pct = lambda q: timings[min(len(timings) - 1, int(len(timings) * q))] * 1000
+        self.stdout.write(
+            f"{name:>8} {len(timings) / elapsed:>8.0f} {statistics.median(timings) * 1000:>7.1f}ms "
+            f"{pct(0.95):>7.1f}ms {pct(0.99):>7.1f}ms"
+        )
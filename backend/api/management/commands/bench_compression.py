@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from api.models import PasswordEntry
+from api.projection import get_projection
+from api.renderers import FastJSONRenderer
+from api.serializers import PasswordSerializer
+from gestionnaire_mdp.compression import available_codecs
+
+from ._bench import best_of, rolled_back, seed_bench_vault
+
+
+class Command(BaseCommand):
+    help = "Mesure octets et latence gagnés par la compression de GET /api/passwords/"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000, 5000])
+        parser.add_argument("--mbps", type=float, default=20.0, help="débit client simulé")
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **opts):
+        bytes_per_second = opts["mbps"] * 1_000_000 / 8
+        self.stdout.write(
+            f"{'lignes':>7} {'codec':>6} {'octets':>10} {'ratio':>6} {'compr.':>9} {'transfert':>10} {'gagné':>9}"
+        )
+        for rows in opts["rows"]:
+            with rolled_back():
+                queryset = PasswordEntry.objects.filter(owner=seed_bench_vault(rows, "bench-gzip"))
+                body = FastJSONRenderer().render(get_projection(PasswordSerializer).project(queryset))
+            raw_transfer = len(body) / bytes_per_second
+            self.stdout.write(
+                f"{rows:>7} {'aucun':>6} {len(body):>10} {1:>6.2f} {0:>7.1f}ms {raw_transfer * 1000:>8.1f}ms {0:>7.1f}ms"
+            )
+            for codec in available_codecs():
+                elapsed, compressed = best_of(lambda: codec.compress(body), opts["repeat"])
+                transfer = len(compressed) / bytes_per_second
+                saved = raw_transfer - (transfer + elapsed)
+                self.stdout.write(
+                    f"{rows:>7} {codec.name:>6} {len(compressed):>10} {len(body) / len(compressed):>6.2f} "
+                    f"{elapsed * 1000:>7.1f}ms {transfer * 1000:>8.1f}ms {saved * 1000:>7.1f}ms"
+                )
@@ -0,0 +1,51 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connection
+
+from gestionnaire_mdp.db_backend.base import connection_stats
+
+MODES = {
+    "none": {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False},
+    "persistent": {"CONN_MAX_AGE": 60, "CONN_HEALTH_CHECKS": True},
+}
+
+
+class Command(BaseCommand):
+    help = "Compare la latence par requête avec et sans connexions persistantes"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+
+    def simulated_request(self):
+        # Même cycle qu'une requête WSGI : close_old_connections() avant et après.
+        request_started.send(sender=self.__class__)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        request_finished.send(sender=self.__class__)
+
+    def handle(self, *args, **opts):
+        original = {key: connection.settings_dict[key] for key in ("CONN_MAX_AGE", "CONN_HEALTH_CHECKS")}
+        self.stdout.write(f"{'mode':>11} {'moy.':>9} {'p50':>9} {'p95':>9} {'connexions':>11} {'connexion moy.':>15}")
+        try:
+            for mode, overrides in MODES.items():
+                connection.close()
+                connection.settings_dict.update(overrides)
+                connection_stats.reset()
+                timings = []
+                for _ in range(opts["requests"]):
+                    start = time.perf_counter()
+                    self.simulated_request()
+                    timings.append(time.perf_counter() - start)
+                stats = connection_stats.snapshot()
+                timings.sort()
+                self.stdout.write(
+                    f"{mode:>11} {statistics.mean(timings) * 1000:>7.2f}ms {timings[len(timings) // 2] * 1000:>7.2f}ms "
+                    f"{timings[int(len(timings) * 0.95)] * 1000:>7.2f}ms {stats['opened']:>11} "
+                    f"{stats['connect_avg_ms']:>13.2f}ms"
+                )
+        finally:
+            connection.close()
+            connection.settings_dict.update(original)
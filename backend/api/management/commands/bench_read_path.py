@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from api.models import PasswordEntry
+from api.projection import get_projection
+from api.renderers import FastJSONRenderer, orjson
+from api.serializers import PasswordSerializer
+
+from ._bench import best_of, rolled_back, seed_bench_vault
+
+
+class Command(BaseCommand):
+    help = "Compare la liste des mots de passe : serializer + json contre values_list + orjson"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **opts):
+        self.stdout.write(f"orjson: {'oui' if orjson else 'non (repli json)'}")
+        self.stdout.write(f"{'lignes':>8} {'serializer':>12} {'projection':>12} {'gain':>7} {'octets':>10}")
+        for rows in opts["rows"]:
+            with rolled_back():
+                self._bench(rows, opts["repeat"])
+
+    def _bench(self, rows, repeat):
+        queryset = PasswordEntry.objects.filter(owner=seed_bench_vault(rows, "bench-read"))
+
+        def serializer_path():
+            return JSONRenderer().render(PasswordSerializer(queryset, many=True).data)
+
+        def projected_path():
+            return FastJSONRenderer().render(get_projection(PasswordSerializer).project(queryset))
+
+        slow, body = best_of(serializer_path, repeat)
+        fast, _ = best_of(projected_path, repeat)
+        self.stdout.write(
+            f"{rows:>8} {slow * 1000:>10.1f}ms {fast * 1000:>10.1f}ms {slow / fast:>6.1f}x {len(body):>10}"
+        )
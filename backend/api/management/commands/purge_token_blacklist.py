@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.token_blacklist import blacklist_stats, purge_expired_tokens
+
+
+class Command(BaseCommand):
+    help = "Purge par lots les jetons JWT expirés (OutstandingToken/BlacklistedToken)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--pause", type=float, default=0.0, help="secondes entre deux lots")
+        parser.add_argument("--max-batches", type=int, default=None)
+        parser.add_argument("--stats", action="store_true", help="affiche la volumétrie sans purger")
+
+    def handle(self, *args, **opts):
+        if opts["stats"]:
+            self._print_stats()
+            return
+
+        deleted = batches = 0
+        start = time.perf_counter()
+        for count in purge_expired_tokens(batch_size=opts["batch_size"]):
+            deleted += count
+            batches += 1
+            if opts["max_batches"] and batches >= opts["max_batches"]:
+                break
+            if opts["pause"]:
+                time.sleep(opts["pause"])
+        elapsed = time.perf_counter() - start
+
+        rate = deleted / elapsed if elapsed else 0
+        self.stdout.write(f"{deleted} jetons supprimés en {batches} lots, {elapsed:.2f}s ({rate:.0f}/s)")
+        self._print_stats()
+
+    def _print_stats(self):
+        stats = blacklist_stats()
+        for table in ("token_blacklist_outstandingtoken", "token_blacklist_blacklistedtoken"):
+            estimated = " (estimation)" if stats[table]["rows_estimated"] else ""
+            self.stdout.write(f"{table}: {stats[table]['rows']} lignes{estimated}, {stats[table]['bytes'] // 1024} Kio")
+        self.stdout.write(f"expirés restants: {stats['expired']}")
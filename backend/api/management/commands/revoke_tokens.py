@@ -0,0 +1,19 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from api.token_versions import bump_token_version
+
+
+class Command(BaseCommand):
+    help = "Révoque tous les jetons JWT émis pour un utilisateur (incrémente sa version de jetons)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("username")
+
+    def handle(self, *args, **opts):
+        U = get_user_model()
+        user_id = U.objects.filter(**{U.USERNAME_FIELD: opts["username"]}).values_list("pk", flat=True).first()
+        if user_id is None:
+            raise CommandError(f"Utilisateur inconnu : {opts['username']}")
+        bump_token_version(user_id)
+        self.stdout.write(f"Jetons révoqués pour {opts['username']}.")
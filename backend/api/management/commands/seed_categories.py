@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
 from api.models import Category
+from api.vault_version import bump_vault_version
 
 DEFAULTS = [
     ("Matériel","Équipements, routeurs, etc."),
@@ -28,9 +29,15 @@ class Command(BaseCommand):
         if not owner:
             self.stdout.write("Aucun superutilisateur. Crée-le avant: manage.py createsuperuser")
             return
-        created = 0
-        for name, desc in DEFAULTS:
-            obj, was = Category.objects.get_or_create(name=name, owner=owner, defaults={"description": desc})
-            created += int(was)
-            self.stdout.write(("[OK] Créée  " if was else "[=] Existe ") + f"{obj.name}")
-        self.stdout.write(f"Terminé. {created} nouvelles catégories.")
+        existing = set(Category.objects.filter(owner=owner).values_list("name", flat=True))
+        missing = [
+            Category(owner=owner, name=name, description=desc) for name, desc in DEFAULTS if name not in existing
+        ]
+        # Un seul INSERT ; ignore_conflicts couvre une création concurrente entre-temps.
+        Category.objects.bulk_create(missing, ignore_conflicts=True)
+        if missing:
+            # bulk_create n'émet pas post_save : ETag de voûte à invalider explicitement.
+            bump_vault_version(owner.id)
+        for name, _desc in DEFAULTS:
+            self.stdout.write(("[=] Existe " if name in existing else "[OK] Créée  ") + name)
+        self.stdout.write(f"Terminé. {len(missing)} nouvelles catégories.")
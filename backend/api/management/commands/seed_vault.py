@@ -0,0 +1,166 @@
+import base64
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from api.ciphertext import pack_raw_parts
+from api.models import Category, PasswordEntry, SecretBundle, VaultVersion
+from api.payloads import payload_hash
+
+from .seed_categories import DEFAULTS
+
+SERVICES = (
+    "github", "gitlab", "google", "outlook", "amazon", "netflix", "spotify", "paypal", "banque", "impots",
+    "hydro", "videotron", "slack", "notion", "docker", "linode", "ovh", "steam", "dropbox", "mutuelle",
+)
+ENVIRONMENTS = ("prod", "staging", "dev", "test")
+
+
+class Command(BaseCommand):
+    help = (
+        "Génère un jeu de données synthétique (utilisateurs, catégories, entrées, secrets) "
+        "déterministe pour le profilage ; bulk_create par lots, une transaction par groupe d'utilisateurs"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10)
+        parser.add_argument("--categories", type=int, default=8, help="catégories par utilisateur")
+        parser.add_argument("--entries", type=int, default=200, help="entrées par utilisateur")
+        parser.add_argument("--secrets", type=int, default=10, help="bundles de secrets par utilisateur")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--prefix", default="seed", help="préfixe des noms d'utilisateur")
+        parser.add_argument("--password", default=None, help="mot de passe commun (défaut : inutilisable)")
+        parser.add_argument("--batch-size", type=int, default=5000, help="lignes par INSERT")
+
+    def handle(self, *args, **opts):
+        if opts["categories"] > len(DEFAULTS) * 10:
+            raise CommandError(f"--categories limité à {len(DEFAULTS) * 10}")
+        if opts["secrets"] > len(SERVICES) * len(ENVIRONMENTS) * 10:
+            raise CommandError("--secrets trop grand pour des couples (app, env) uniques")
+
+        user_model = get_user_model()
+        usernames = [f"{opts['prefix']}{opts['seed']}-{index:07d}" for index in range(opts["users"])]
+        if user_model.objects.filter(username__in=usernames[:1] + usernames[-1:]).exists():
+            raise CommandError(
+                f"Des utilisateurs {opts['prefix']}{opts['seed']}-* existent déjà : changer --prefix ou --seed"
+            )
+
+        # Un seul hachage : le coût PBKDF2 par utilisateur dominerait sinon la génération.
+        password_hash = make_password(opts["password"])
+        batch_size = opts["batch_size"]
+        rows_per_user = max(1, opts["categories"] + opts["entries"] + opts["secrets"])
+        users_per_chunk = max(1, batch_size // rows_per_user)
+        totals = {"users": 0, "categories": 0, "entries": 0, "secrets": 0}
+
+        start = time.perf_counter()
+        for chunk_start in range(0, len(usernames), users_per_chunk):
+            chunk = usernames[chunk_start:chunk_start + users_per_chunk]
+            with transaction.atomic():
+                counts = self._seed_chunk(chunk, password_hash, opts, batch_size)
+            for key, value in counts.items():
+                totals[key] += value
+            elapsed = time.perf_counter() - start
+            rows = sum(totals.values())
+            self.stdout.write(
+                f"{totals['users']}/{len(usernames)} utilisateurs, {rows} lignes, "
+                f"{rows / elapsed:.0f} lignes/s"
+            )
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Terminé en {elapsed:.1f}s : {totals['users']} utilisateurs, {totals['categories']} catégories, "
+            f"{totals['entries']} entrées, {totals['secrets']} secrets."
+        ))
+
+    def _seed_chunk(self, usernames, password_hash, opts, batch_size):
+        user_model = get_user_model()
+        users = user_model.objects.bulk_create(
+            [user_model(username=name, password=password_hash) for name in usernames], batch_size=batch_size
+        )
+        # bulk_create n'émet pas de signaux : versions de voûte posées explicitement pour les ETag.
+        VaultVersion.objects.bulk_create(
+            [VaultVersion(owner=user, version=1) for user in users], batch_size=batch_size
+        )
+
+        categories = Category.objects.bulk_create(
+            [
+                Category(
+                    owner=user, name=self._category_name(index), description=DEFAULTS[index % len(DEFAULTS)][1]
+                )
+                for user in users
+                for index in range(opts["categories"])
+            ],
+            batch_size=batch_size,
+        )
+        by_owner = {}
+        for category in categories:
+            by_owner.setdefault(category.owner_id, []).append(category.pk)
+
+        # Générateur par utilisateur : mêmes données pour une graine donnée, quel que soit --batch-size.
+        rngs = {user.pk: random.Random(f"{opts['seed']}:{user.username}") for user in users}
+
+        entries = 0
+        pending = []
+        for user in users:
+            rng = rngs[user.pk]
+            category_ids = by_owner.get(user.pk) or [None]
+            for index in range(opts["entries"]):
+                service = SERVICES[rng.randrange(len(SERVICES))]
+                pending.append(PasswordEntry(
+                    owner=user,
+                    title=f"{service.capitalize()} {index}",
+                    url=f"https://{service}.example.com/login" if rng.random() < 0.8 else "",
+                    category_id=None if rng.random() < 0.1 else rng.choice(category_ids),
+                    ciphertext=self._ciphertext(rng),
+                ))
+                if len(pending) >= batch_size:
+                    PasswordEntry.objects.bulk_create(pending, batch_size=batch_size)
+                    entries += len(pending)
+                    pending = []
+        if pending:
+            PasswordEntry.objects.bulk_create(pending, batch_size=batch_size)
+            entries += len(pending)
+
+        bundles = []
+        for user in users:
+            rng = rngs[user.pk]
+            for index in range(opts["secrets"]):
+                payload = self._secret_payload(rng)
+                bundles.append(SecretBundle(
+                    owner=user,
+                    app=f"{SERVICES[index % len(SERVICES)]}-{index // (len(SERVICES) * len(ENVIRONMENTS))}",
+                    environment=ENVIRONMENTS[(index // len(SERVICES)) % len(ENVIRONMENTS)],
+                    payload=payload,
+                    # save() n'est pas appelé par bulk_create.
+                    content_hash=payload_hash(payload),
+                ))
+        SecretBundle.objects.bulk_create(bundles, batch_size=batch_size)
+
+        return {"users": len(users), "categories": len(categories), "entries": entries, "secrets": len(bundles)}
+
+    @staticmethod
+    def _category_name(index):
+        name = DEFAULTS[index % len(DEFAULTS)][0]
+        return name if index < len(DEFAULTS) else f"{name} {index // len(DEFAULTS) + 1}"
+
+    @staticmethod
+    def _ciphertext(rng):
+        # Blob déjà au format binaire de la colonne ; données de 48 à 512 octets (mot de passe + notes).
+        return pack_raw_parts({
+            "iv": rng.randbytes(12),
+            "salt": rng.randbytes(16),
+            "key": rng.randbytes(32),
+            "data": rng.randbytes(rng.randint(48, 512)),
+        })
+
+    @staticmethod
+    def _secret_payload(rng):
+        # Fichier .env chiffré : quelques centaines d'octets à quelques Kio.
+        return {
+            "iv": base64.b64encode(rng.randbytes(12)).decode(),
+            "data": base64.b64encode(rng.randbytes(rng.randint(200, 4000))).decode(),
+        }
@@ -0,0 +1,38 @@
+# Generated by Django 5.0.6 on 2026-10-19 17:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY : pas de verrou d'écriture sur les grosses voûtes.
+    atomic = False
+
+    dependencies = [
+        ('api', '0005_vaultversion'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='passwordentry',
+            index=models.Index(fields=['owner', 'title', 'id'], name='pwd_owner_title_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='passwordentry',
+            index=models.Index(fields=['owner', 'updated_at'], name='pwd_owner_updated_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='passwordentry',
+            index=models.Index(fields=['owner', 'category'], name='pwd_owner_category_idx'),
+        ),
+        # L'index simple sur owner_id devient redondant (préfixe de pwd_owner_title_id_idx).
+        migrations.AlterField(
+            model_name='passwordentry',
+            name='owner',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='passwords', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
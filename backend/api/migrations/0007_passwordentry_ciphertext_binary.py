@@ -0,0 +1,152 @@
+# Generated by Django 5.0.6 on 2026-10-19 18:30
+
+import base64
+import binascii
+import json
+
+import api.fields
+from django.db import migrations, models, transaction
+
+BATCH_SIZE = 1000
+
+# Format figé à la date de cette migration (copie de api/ciphertext.py) : une évolution
+# du module ne doit pas changer ce qu'elle écrit ni ce qu'elle relit.
+#   v1 : 0x01 | présence (1 bit par composant) | (longueur varint | octets)*
+#   v0 : 0x00 | JSON UTF-8
+FORMAT_JSON = 0
+FORMAT_PACKED = 1
+PACKED_PARTS = ("iv", "salt", "key", "data")
+OUTPUT_ORDER = tuple(sorted(PACKED_PARTS, key=lambda name: (len(name), name)))
+
+
+def _decode_canonical_b64(value):
+    if not isinstance(value, str):
+        return None
+    try:
+        raw = base64.b64decode(value, validate=True)
+    except (binascii.Error, ValueError):
+        return None
+    if base64.b64encode(raw).decode("ascii") != value:
+        return None
+    return raw
+
+
+def pack_ciphertext(value):
+    if isinstance(value, dict) and value and set(value) <= set(PACKED_PARTS):
+        parts = {}
+        for name, encoded in value.items():
+            raw = _decode_canonical_b64(encoded)
+            if raw is None:
+                break
+            parts[name] = raw
+        else:
+            mask = 0
+            body = bytearray()
+            for bit, name in enumerate(PACKED_PARTS):
+                raw = parts.get(name)
+                if raw is None:
+                    continue
+                mask |= 1 << bit
+                size = len(raw)
+                while size >= 0x80:
+                    body.append((size & 0x7F) | 0x80)
+                    size >>= 7
+                body.append(size)
+                body += raw
+            return bytes((FORMAT_PACKED, mask)) + bytes(body)
+    return bytes((FORMAT_JSON,)) + json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def unpack_ciphertext(blob):
+    blob = bytes(blob)
+    if blob[0] == FORMAT_JSON:
+        return json.loads(blob[1:])
+    if blob[0] != FORMAT_PACKED:
+        raise ValueError(f"Unknown ciphertext format {blob[0]}")
+    mask = blob[1]
+    pos = 2
+    parts = {}
+    for bit, name in enumerate(PACKED_PARTS):
+        if mask & (1 << bit):
+            shift = size = 0
+            while True:
+                byte = blob[pos]
+                pos += 1
+                size |= (byte & 0x7F) << shift
+                if byte < 0x80:
+                    break
+                shift += 7
+            parts[name] = blob[pos:pos + size]
+            pos += size
+    return {name: base64.b64encode(parts[name]).decode("ascii") for name in OUTPUT_ORDER if name in parts}
+
+
+def convert_in_batches(apps, schema_editor, source, target, convert):
+    """
+    Lots de BATCH_SIZE lignes sur la clé primaire, chacun dans sa propre transaction :
+    seules les lignes du lot en cours sont verrouillées. Seules les lignes pas encore
+    converties sont lues : une migration interrompue reprend où elle s'est arrêtée.
+    """
+    PasswordEntry = apps.get_model("api", "PasswordEntry")
+    alias = schema_editor.connection.alias
+    pending = PasswordEntry.objects.using(alias).filter(**{f"{target}__isnull": True}).order_by("pk")
+    last_pk = 0
+    while True:
+        with transaction.atomic(using=alias):
+            rows = list(pending.filter(pk__gt=last_pk).values_list("pk", source)[:BATCH_SIZE])
+            if not rows:
+                return
+            PasswordEntry.objects.using(alias).bulk_update(
+                [PasswordEntry(pk=pk, **{target: convert(value)}) for pk, value in rows], [target]
+            )
+        last_pk = rows[-1][0]
+
+
+def pack_existing(apps, schema_editor):
+    convert_in_batches(apps, schema_editor, "ciphertext", "ciphertext_packed", pack_ciphertext)
+
+
+def unpack_existing(apps, schema_editor):
+    convert_in_batches(apps, schema_editor, "ciphertext_packed", "ciphertext", unpack_ciphertext)
+
+
+class Migration(migrations.Migration):
+
+    # Conversion par lots, chacun committé (voir convert_in_batches) : pas de transaction
+    # unique gardant toute la table verrouillée. Les opérations de schéma prennent chacune
+    # un verrou exclusif bref ; seule la dernière (SET NOT NULL) parcourt la table sous ce
+    # verrou. Les écritures de l'application doivent être arrêtées pendant la migration.
+    atomic = False
+
+    dependencies = [
+        ('api', '0006_passwordentry_owner_composite_indexes'),
+    ]
+
+    operations = [
+        # Nullable le temps de la conversion (et pour rendre la migration réversible).
+        migrations.AlterField(
+            model_name='passwordentry',
+            name='ciphertext',
+            field=models.JSONField(null=True),
+        ),
+        migrations.AddField(
+            model_name='passwordentry',
+            name='ciphertext_packed',
+            field=models.BinaryField(null=True),
+        ),
+        migrations.RunPython(pack_existing, unpack_existing),
+        migrations.RemoveField(
+            model_name='passwordentry',
+            name='ciphertext',
+        ),
+        migrations.RenameField(
+            model_name='passwordentry',
+            old_name='ciphertext_packed',
+            new_name='ciphertext',
+        ),
+        migrations.AlterField(
+            model_name='passwordentry',
+            name='ciphertext',
+            field=api.fields.CiphertextField(),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.0.6 on 2026-10-19 17:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+from api.payloads import payload_hash
+
+BATCH_SIZE = 1000
+
+
+def hash_existing(apps, schema_editor):
+    SecretBundle = apps.get_model("api", "SecretBundle")
+    batch = []
+    for pk, payload in SecretBundle.objects.order_by("pk").values_list("pk", "payload").iterator(chunk_size=BATCH_SIZE):
+        batch.append(SecretBundle(pk=pk, content_hash=payload_hash(payload)))
+        if len(batch) >= BATCH_SIZE:
+            SecretBundle.objects.bulk_update(batch, ["content_hash"])
+            batch = []
+    if batch:
+        SecretBundle.objects.bulk_update(batch, ["content_hash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_tokenversion'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='secretbundle',
+            name='content_hash',
+            field=models.CharField(default='', editable=False, max_length=32),
+        ),
+        migrations.RunPython(hash_existing, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='secretbundle',
+            index=models.Index(fields=['owner', 'app', 'environment'], include=('content_hash',), name='secret_owner_app_env_hash_idx'),
+        ),
+    ]
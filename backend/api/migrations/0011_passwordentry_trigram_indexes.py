@@ -0,0 +1,43 @@
+from django.db import migrations
+
+TRIGRAM_INDEXES = (
+    ("pwd_title_trgm_idx", "title"),
+    ("pwd_url_trgm_idx", "url"),
+)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # pg_trgm est livré avec PostgreSQL (contrib) mais absent de certaines installations
+    # minimales : sans lui, la recherche reste fonctionnelle, en scan borné au propriétaire.
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for name, column in TRIGRAM_INDEXES:
+            cursor.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{name}" '
+                f'ON "api_passwordentry" USING gin ((UPPER("{column}")) gin_trgm_ops)'
+            )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        for name, _column in TRIGRAM_INDEXES:
+            cursor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY : pas de verrou d'écriture sur les grosses voûtes.
+    atomic = False
+
+    dependencies = [
+        ('api', '0010_importcheckpoint'),
+    ]
+
+    # Index hors de l'état des migrations (absents du modèle) : ils n'existent en base
+    # que si pg_trgm est disponible, ce SQL est seul à les créer et à les supprimer.
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-19 18:24
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY : pas de verrou d'écriture sur la table des secrets.
+    atomic = False
+
+    dependencies = [
+        ('api', '0011_passwordentry_trigram_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='secretbundle',
+            index=models.Index(fields=['app'], name='secret_app_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
@@ -1,6 +1,9 @@
 from django.conf import settings
 from django.db import models
 
+from .fields import CiphertextField
+from .payloads import payload_hash
+
 class Category(models.Model):
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="categories")
     name = models.CharField(max_length=100)
@@ -11,15 +14,24 @@ class Category(models.Model):
     def __str__(self): return self.name
 
 class PasswordEntry(models.Model):
-    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="passwords")
+    # Pas d'index simple sur owner_id : préfixe des index composites ci-dessous.
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="passwords", db_index=False)
     title = models.CharField(max_length=200)
     url = models.URLField(blank=True, default="")
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True, related_name="passwords")
-    ciphertext = models.JSONField()  # {iv, salt, data, ...}
+    ciphertext = CiphertextField()  # {iv, salt, data, key} — stocké en binaire, voir api/ciphertext.py
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     class Meta:
         ordering = ["title","id"]
+        # Index alignés sur les querysets filtrés par propriétaire (voir tests_query_plans).
+        indexes = [
+            models.Index(fields=["owner","title","id"], name="pwd_owner_title_id_idx"),
+            models.Index(fields=["owner","updated_at"], name="pwd_owner_updated_idx"),
+            models.Index(fields=["owner","category"], name="pwd_owner_category_idx"),
+        ]
+        # Index trigrammes pwd_title_trgm_idx / pwd_url_trgm_idx (recherche, api/search.py) : hors de
+        # l'état des migrations, créés en SQL par 0011 seulement si pg_trgm est disponible.
     def __str__(self): return self.title
 
 
@@ -28,12 +40,72 @@ class SecretBundle(models.Model):
     app = models.CharField(max_length=100)
     environment = models.CharField(max_length=50)
     payload = models.JSONField(default=dict)  # Encrypted payload only (zero-knowledge storage)
+    content_hash = models.CharField(max_length=32, default="", editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ("owner", "app", "environment")
         ordering = ["app", "environment", "id"]
+        indexes = [
+            # Validation d'ETag en index-only scan, sans toucher au payload.
+            models.Index(
+                fields=["owner", "app", "environment"],
+                include=["content_hash"],
+                name="secret_owner_app_env_hash_idx",
+            ),
+            # Recherche par préfixe d'application dans l'admin (LIKE 'x%', tous propriétaires).
+            models.Index(fields=["app"], opclasses=["varchar_pattern_ops"], name="secret_app_prefix_idx"),
+        ]
 
     def __str__(self):
         return f"{self.owner_id}:{self.app}:{self.environment}"
+
+    def save(self, *args, **kwargs):
+        self.content_hash = payload_hash(self.payload)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "payload" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "content_hash"}
+        super().save(*args, **kwargs)
+
+
+class VaultVersion(models.Model):
+    """Compteur par propriétaire, incrémenté à chaque écriture sur ses catégories/entrées."""
+    owner = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="vault_version",
+    )
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.owner_id}:v{self.version}"
+
+
+class TokenVersion(models.Model):
+    """Version des jetons JWT d'un utilisateur ; l'incrémenter révoque tous ses jetons émis."""
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="token_version",
+    )
+    version = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id}:t{self.version}"
+
+
+class ImportCheckpoint(models.Model):
+    """Dernière ligne validée d'un import NDJSON (par propriétaire et identifiant d'import), pour la reprise."""
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="import_checkpoints")
+    import_id = models.CharField(max_length=64)
+    last_line = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("owner", "import_id")
+
+    def __str__(self):
+        return f"{self.owner_id}:{self.import_id}@{self.last_line}"
@@ -0,0 +1,52 @@
+"""Pagination par curseur (keyset) : le curseur encode la clé de tri du dernier élément servi."""
+import base64
+import json
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.urls import replace_query_param
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(list(values), separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+NUMBER = (int, float)
+
+
+def _valid_value(value, expected):
+    # bool est un int pour isinstance ; NUL est refusé par PostgreSQL dans une chaîne.
+    if isinstance(value, bool) or not isinstance(value, expected):
+        return False
+    return "\x00" not in value if isinstance(value, str) else True
+
+
+def decode_cursor(raw, types):
+    """Valeurs du curseur, une par type attendu (ex. (str, int)) ; 400 pour tout curseur non conforme."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(raw + "=" * (-len(raw) % 4)))
+    except (ValueError, TypeError):
+        values = None
+    if (
+        not isinstance(values, list)
+        or len(values) != len(types)
+        or not all(_valid_value(value, expected) for value, expected in zip(values, types))
+    ):
+        raise ValidationError({"cursor": ["Invalid cursor."]})
+    return values
+
+
+def parse_limit(request, default, maximum):
+    raw = request.query_params.get("limit")
+    if raw is None:
+        return default
+    try:
+        limit = int(raw)
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= maximum:
+        raise ValidationError({"limit": [f"Must be an integer between 1 and {maximum}."]})
+    return limit
+
+
+def next_page_url(request, values):
+    return replace_query_param(request.build_absolute_uri(), "cursor", encode_cursor(values))
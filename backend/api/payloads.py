@@ -0,0 +1,66 @@
+"""
+Validation des charges chiffrées opaques (ciphertext, payload de secrets) :
+forme et taille seulement, sans aller-retour json.dumps/json.loads.
+"""
+import hashlib
+import json
+import re
+
+try:
+    import orjson
+except ImportError:  # dépendance optionnelle
+    orjson = None
+
+
+# Caractères qu'un encodeur JSON échappe (jusqu'à 6 octets chacun).
+_NEEDS_ESCAPE = re.compile(r'["\\\x00-\x1f]')
+
+
+def _plain(text):
+    return isinstance(text, str) and text.isascii() and _NEEDS_ESCAPE.search(text) is None
+
+
+def _flat_plain(value):
+    return isinstance(value, dict) and all(_plain(k) and _plain(v) for k, v in value.items())
+
+
+def _has_nul(value):
+    # jsonb refuse \u0000 : l'insertion échouerait en erreur serveur.
+    if isinstance(value, str):
+        return "\x00" in value
+    if isinstance(value, dict):
+        return any(_has_nul(k) or _has_nul(v) for k, v in value.items())
+    if isinstance(value, list):
+        return any(_has_nul(item) for item in value)
+    return False
+
+
+def encoded_size(value):
+    """Taille JSON compacte en UTF-8 (octets) ; calcul direct pour un objet plat de chaînes ASCII sans échappement."""
+    if _flat_plain(value):
+        # {"k":"v",...} : guillemets, deux-points et virgules compris ; 1 caractère = 1 octet.
+        return max(2, 1 + sum(len(k) + len(v) + 6 for k, v in value.items()))
+    if orjson is not None:
+        return len(orjson.dumps(value))
+    return len(json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode())
+
+
+def opaque_object_error(value, max_bytes):
+    """Message d'erreur si `value` n'est pas un objet JSON d'au plus `max_bytes`, sinon None."""
+    if not isinstance(value, dict):
+        return "must be a JSON object."
+    try:
+        size = encoded_size(value)
+    except (TypeError, ValueError):
+        return "must be JSON-serializable."
+    if size > max_bytes:
+        return f"must not exceed {max_bytes} bytes."
+    if not _flat_plain(value) and _has_nul(value):
+        return "must not contain NUL characters."
+    return None
+
+
+def payload_hash(value):
+    """Empreinte du contenu (JSON canonique), servie comme ETag des bundles de secrets."""
+    canonical = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
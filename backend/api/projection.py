@@ -0,0 +1,108 @@
+"""
+Chemin de lecture projeté : values_list() + transformation ligne -> dict
+précompilée à partir des champs d'un ModelSerializer, sans instancier de
+modèle ni de champ de serializer par ligne.
+"""
+from functools import lru_cache
+
+from django.conf import settings
+from django.db.models import BinaryField, ExpressionWrapper, F
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from .ciphertext import ciphertext_json_bytes, unpack_ciphertext_binary
+from .fields import CiphertextField
+from .renderers import RawJSON
+
+
+def _iso_datetime_converter(tz):
+    """Équivalent de DateTimeField.to_representation (ISO 8601) avec le fuseau résolu une fois."""
+    def convert(value):
+        if tz is not None and value.tzinfo is not None:
+            value = value.astimezone(tz)
+        text = value.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    return convert
+
+
+def _ciphertext_fragment(blob):
+    return RawJSON(ciphertext_json_bytes(blob))
+
+
+def _is_default_iso(field):
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    return (
+        output_format is not None
+        and output_format.lower() == ISO_8601
+        and getattr(field, "timezone", None) is None
+    )
+
+
+class RowProjection:
+    def __init__(self, serializer_class, fields=None, binary=False):
+        model = serializer_class.Meta.model
+        declared = serializer_class().fields
+        names = list(fields or serializer_class.Meta.fields)
+        model_fields = [model._meta.get_field(name) for name in names]
+
+        self.keys = tuple(names)
+        self.columns = tuple(field.attname for field in model_fields)
+        # Les blobs de ciphertext sont lus bruts (sans from_db_value) : octets
+        # découpés en binaire, fragment JSON prêt à insérer sinon — jamais de dict.
+        self.raw_blob_fields = tuple(
+            field.name for field in model_fields if isinstance(field, CiphertextField)
+        )
+        self.blob_converter = unpack_ciphertext_binary if binary else _ciphertext_fragment
+        if self.raw_blob_fields:
+            self.columns = tuple(
+                ExpressionWrapper(F(field.attname), output_field=BinaryField())
+                if field.name in self.raw_blob_fields else field.attname
+                for field in model_fields
+            )
+        # Seuls les champs dont la représentation diffère de la valeur brute
+        # sont convertis, avec la même sortie que le serializer (fuseau, « Z »).
+        self.datetime_fields = tuple(
+            name for name in names
+            if isinstance(declared[name], serializers.DateTimeField) and _is_default_iso(declared[name])
+        )
+        self.other_converters = tuple(
+            (name, declared[name].to_representation)
+            for name in names
+            if name not in self.datetime_fields
+            and isinstance(declared[name], (serializers.DateTimeField, serializers.DateField, serializers.DecimalField))
+        )
+
+    def rows(self, queryset):
+        return queryset.values_list(*self.columns)
+
+    def transformer(self):
+        """Fonction ligne -> dict, fuseau courant résolu une seule fois."""
+        keys = self.keys
+        tz = timezone.get_current_timezone() if settings.USE_TZ else None
+        converters = tuple(
+            (name, _iso_datetime_converter(tz)) for name in self.datetime_fields
+        ) + self.other_converters + tuple(
+            (name, self.blob_converter) for name in self.raw_blob_fields
+        )
+
+        def transform(row):
+            item = dict(zip(keys, row))
+            for name, convert in converters:
+                value = item[name]
+                if value is not None:
+                    item[name] = convert(value)
+            return item
+        return transform
+
+    def transform(self, row):
+        return self.transformer()(row)
+
+    def project(self, queryset):
+        transform = self.transformer()
+        return [transform(row) for row in self.rows(queryset)]
+
+
+@lru_cache(maxsize=64)
+def get_projection(serializer_class, fields=None, binary=False):
+    return RowProjection(serializer_class, fields, binary)
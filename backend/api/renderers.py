@@ -0,0 +1,140 @@
+import json
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # dépendance optionnelle : repli sur le json de la stdlib
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # dépendance optionnelle : pas de représentation binaire
+    msgpack = None
+
+
+_encoder_default = JSONEncoder().default
+
+
+class RawJSON:
+    """Texte JSON déjà sérialisé, inséré tel quel dans la réponse (colonnes jsonb::text, blobs)."""
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        self.data = data
+
+    def __eq__(self, other):
+        return isinstance(other, RawJSON) and other.data == self.data
+
+    def __repr__(self):
+        return f"RawJSON({self.data[:40]!r})"
+
+    def loads(self):
+        return json.loads(self.data)
+
+
+def _fallback_default(obj):
+    # Renderers sans insertion brute (json stdlib, msgpack) : on décode le fragment.
+    if isinstance(obj, RawJSON):
+        return obj.loads()
+    return _encoder_default(obj)
+
+
+class RawJSONEncoder(JSONEncoder):
+    def default(self, obj):
+        if isinstance(obj, RawJSON):
+            return obj.loads()
+        return super().default(obj)
+
+
+def _orjson_default(obj):
+    if isinstance(obj, RawJSON):
+        return orjson.Fragment(obj.data)
+    return _encoder_default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Rendu JSON via orjson quand il est installé, même sortie que JSONRenderer
+    (compact, UTF-8, U+2028/U+2029 échappés). Repli sur JSONRenderer sinon,
+    ou quand une indentation est demandée.
+    """
+
+    encoder_class = RawJSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if isinstance(data, RawJSON):
+            ret = data.data
+        else:
+            ret = orjson.dumps(data, default=_orjson_default)
+        if b"\xe2\x80" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class NDJSONRenderer(FastJSONRenderer):
+    """
+    application/x-ndjson : les exports sont des StreamingHttpResponse écrites
+    ligne à ligne ; ce renderer sert la négociation et les réponses d'erreur
+    (un seul objet, une ligne).
+    """
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return super().render(data, None, renderer_context) + b"\n"
+
+
+class MessagePackRenderer(BaseRenderer):
+    """application/msgpack ; les composants de `ciphertext` y sont des octets bruts."""
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+    binary_ciphertext = True
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, use_bin_type=True, default=_fallback_default)
+
+
+class MessagePackParser(BaseParser):
+    media_type = "application/msgpack"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, msgpack.ExtraData, msgpack.FormatError, msgpack.StackError) as exc:
+            raise ParseError(f"MessagePack parse error - {exc}")
+
+
+def binary_renderers():
+    return [MessagePackRenderer] if msgpack is not None else []
+
+
+def binary_parsers():
+    return [MessagePackParser] if msgpack is not None else []
+
+
+class FastJSONParser(JSONParser):
+    """Décodage via orjson quand il est installé (même erreurs que JSONParser)."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
@@ -0,0 +1,83 @@
+"""
+Recherche côté serveur sur les métadonnées en clair des entrées (title, url).
+
+Avec pg_trgm, les filtres icontains sont servis par les index GIN
+trigrammes sur UPPER(title) et UPPER(url) (migration 0011), les résultats
+classés par similarité de mots.
+Sans l'extension (base de dev minimale), même filtre en scan borné au
+propriétaire, classement préfixe puis sous-chaîne.
+"""
+import re
+from urllib.parse import urlsplit
+
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connections
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.functions import Cast, Greatest
+from rest_framework.exceptions import ValidationError
+
+SEARCH_MAX_LENGTH = 200
+# Une correspondance dans l'URL pèse moins qu'une correspondance dans le titre.
+URL_WEIGHT = 0.5
+
+_HOST_RE = re.compile(r"^[a-z0-9](?:[a-z0-9.-]*[a-z0-9])?(?::[0-9]{1,5})?$")
+_trigram_available = {}
+
+
+def trigram_available(alias="default"):
+    """pg_trgm installé dans la base (lu une fois par processus)."""
+    if alias not in _trigram_available:
+        connection = connections[alias]
+        available = False
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                available = cursor.fetchone() is not None
+        _trigram_available[alias] = available
+    return _trigram_available[alias]
+
+
+def parse_search(raw):
+    term = " ".join((raw or "").split())
+    if len(term) > SEARCH_MAX_LENGTH:
+        raise ValidationError({"search": [f"At most {SEARCH_MAX_LENGTH} characters."]})
+    return term or None
+
+
+def parse_url_host(raw):
+    """Hôte seul, en minuscules ; une URL complète est acceptée et réduite à son hôte."""
+    value = (raw or "").strip().lower()
+    if "://" in value:
+        value = urlsplit(value).netloc.rpartition("@")[2]
+    value = value.rstrip("/")
+    if not value:
+        return None
+    if not _HOST_RE.match(value):
+        raise ValidationError({"url_host": ["Invalid host name."]})
+    return value
+
+
+def search_entries(queryset, term):
+    """Entrées dont le titre ou l'URL contient `term`, annotées d'un score `rank` (décroissant = meilleur)."""
+    queryset = queryset.filter(Q(title__icontains=term) | Q(url__icontains=term))
+    if trigram_available(queryset.db):
+        score = Greatest(
+            TrigramWordSimilarity(Value(term), "title"),
+            TrigramWordSimilarity(Value(term), "url") * Value(URL_WEIGHT),
+        )
+    else:
+        score = Case(
+            When(title__istartswith=term, then=Value(1.0)),
+            When(title__icontains=term, then=Value(0.75)),
+            default=Value(URL_WEIGHT),
+        )
+    # double precision : le score repasse exactement par le curseur JSON (real ne le ferait pas).
+    return queryset.annotate(rank=Cast(score, output_field=FloatField()))
+
+
+def filter_url_host(queryset, host):
+    """URL dont l'hôte est `host` ou l'un de ses sous-domaines (schéma, identifiants et port ignorés)."""
+    port = "" if ":" in host else "(:[0-9]+)?"
+    pattern = rf"^[a-z][a-z0-9+.-]*://([^/@]*@)?([^/@]*\.)?{re.escape(host)}{port}([/?#]|$)"
+    # icontains en plus de la regex : filtre de sous-chaîne servi par l'index trigramme sur UPPER(url).
+    return queryset.filter(url__icontains=host, url__iregex=pattern)
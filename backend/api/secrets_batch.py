@@ -0,0 +1,97 @@
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db.models import Q, TextField
+from django.db.models.functions import Cast
+
+from .models import SecretBundle
+from .payloads import opaque_object_error, payload_hash
+from .renderers import RawJSON
+from .secrets_cache import invalidate_secrets
+
+SECRETS_BATCH_MAX = 100
+
+
+def _check_names(app, env_name):
+    for name, value in (("app", app), ("environment", env_name)):
+        if not value:
+            return {name: ["This field is required."]}
+        max_length = SecretBundle._meta.get_field(name).max_length
+        if len(value) > max_length:
+            return {name: [f"Ensure this field has no more than {max_length} characters."]}
+    return None
+
+
+def parse_secret_pairs(raw_pairs):
+    """`app:env` -> (app, env) ; l'environnement est après le dernier ':'."""
+    pairs, errors = [], []
+    for index, raw in enumerate(raw_pairs):
+        app, sep, env_name = raw.strip().rpartition(":")
+        error = _check_names(app.strip(), env_name.strip()) if sep else {"pair": ["Expected 'app:env'."]}
+        if error:
+            errors.append({"index": index, "errors": error})
+            continue
+        pairs.append((app.strip(), env_name.strip()))
+    return list(dict.fromkeys(pairs)), errors
+
+
+def fetch_secret_payloads(owner_id, pairs):
+    """Un seul SELECT pour tous les couples ; payloads renvoyés en texte jsonb brut."""
+    rows = (
+        SecretBundle.objects.filter(owner_id=owner_id)
+        .filter(reduce(or_, (Q(app=app, environment=env_name) for app, env_name in pairs)))
+        .values_list("app", "environment", Cast("payload", output_field=TextField()))
+    )
+    found = {(app, env_name): payload for app, env_name, payload in rows}
+    items = [
+        {"app": app, "environment": env_name, "payload": RawJSON(found[app, env_name].encode())}
+        for app, env_name in pairs
+        if (app, env_name) in found
+    ]
+    missing = [{"app": app, "environment": env_name} for app, env_name in pairs if (app, env_name) not in found]
+    return items, missing
+
+
+def parse_secret_items(items):
+    bundles, errors, seen = [], [], set()
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors.append({"index": index, "errors": {"detail": ["Each item must be an object."]}})
+            continue
+        app = str(item.get("app", "")).strip()
+        env_name = str(item.get("env", item.get("environment", ""))).strip()
+        error = _check_names(app, env_name)
+        if error is None and (app, env_name) in seen:
+            error = {"detail": ["Duplicate (app, env) in batch."]}
+        payload_error = opaque_object_error(item.get("payload"), settings.SECRET_PAYLOAD_MAX_BYTES)
+        if error is None and payload_error:
+            error = {"payload": [f"'payload' {payload_error}"]}
+        if error:
+            errors.append({"index": index, "errors": error})
+            continue
+        seen.add((app, env_name))
+        bundles.append((app, env_name, item["payload"]))
+    return bundles, errors
+
+
+def upsert_secret_bundles(owner_id, bundles):
+    """INSERT … ON CONFLICT (owner, app, environment) DO UPDATE : une instruction pour le lot."""
+    objs = SecretBundle.objects.bulk_create(
+        [
+            SecretBundle(
+                owner_id=owner_id,
+                app=app,
+                environment=env_name,
+                payload=payload,
+                content_hash=payload_hash(payload),
+            )
+            for app, env_name, payload in bundles
+        ],
+        update_conflicts=True,
+        unique_fields=["owner", "app", "environment"],
+        update_fields=["payload", "content_hash", "updated_at"],
+    )
+    # bulk_create n'appelle ni save() ni post_save : empreinte et invalidation explicites.
+    invalidate_secrets(owner_id, [(app, env_name) for app, env_name, _ in bundles])
+    return [{"app": obj.app, "environment": obj.environment, "updated_at": obj.updated_at} for obj in objs]
@@ -0,0 +1,85 @@
+"""
+Cache des bundles de secrets, clé (propriétaire, app, env). Seuls le
+payload déjà chiffré (texte jsonb) et son empreinte y sont stockés ; les
+écritures l'invalident après leur commit (signaux de SecretBundle, upsert
+par lot) : avant, une lecture concurrente remettrait l'ancienne ligne en
+cache.
+"""
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+
+class CacheCounters:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def snapshot(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "hit_ratio": self.hits / total if total else 0.0}
+
+    def reset(self):
+        with self._lock:
+            self.hits = self.misses = 0
+
+
+secrets_cache_counters = CacheCounters()
+
+
+def _cache():
+    return caches[settings.SECRETS_CACHE_ALIAS]
+
+
+def secret_cache_key(owner_id, app, environment):
+    # app/env sont libres : empreinte pour rester compatible avec tous les backends.
+    digest = hashlib.blake2b(f"{app}\0{environment}".encode(), digest_size=16).hexdigest()
+    return f"secret:{owner_id}:{digest}"
+
+
+def get_cached_secret(owner_id, app, environment):
+    """(content_hash, texte du payload) en cache, ou None."""
+    if settings.SECRETS_CACHE_TIMEOUT <= 0:
+        return None
+    entry = _cache().get(secret_cache_key(owner_id, app, environment))
+    secrets_cache_counters.record(entry is not None)
+    return entry
+
+
+def cache_secret(owner_id, app, environment, entry):
+    if settings.SECRETS_CACHE_TIMEOUT > 0:
+        _cache().set(secret_cache_key(owner_id, app, environment), tuple(entry), settings.SECRETS_CACHE_TIMEOUT)
+
+
+async def aget_cached_secret(owner_id, app, environment):
+    if settings.SECRETS_CACHE_TIMEOUT <= 0:
+        return None
+    entry = await _cache().aget(secret_cache_key(owner_id, app, environment))
+    secrets_cache_counters.record(entry is not None)
+    return entry
+
+
+async def acache_secret(owner_id, app, environment, entry):
+    if settings.SECRETS_CACHE_TIMEOUT > 0:
+        await _cache().aset(secret_cache_key(owner_id, app, environment), tuple(entry), settings.SECRETS_CACHE_TIMEOUT)
+
+
+def invalidate_secret(owner_id, app, environment):
+    invalidate_secrets(owner_id, [(app, environment)])
+
+
+def invalidate_secrets(owner_id, pairs):
+    keys = [secret_cache_key(owner_id, app, environment) for app, environment in pairs]
+    transaction.on_commit(lambda: _cache().delete_many(keys))
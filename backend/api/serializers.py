@@ -1,12 +1,49 @@
+import base64
+
+from django.conf import settings
 from rest_framework import serializers
+
+from .ciphertext import ciphertext_to_binary
+from .payloads import opaque_object_error
 from .models import Category, PasswordEntry, SecretBundle
 
+
+def wants_binary(context):
+    request = context.get("request")
+    renderer = getattr(request, "accepted_renderer", None)
+    return getattr(renderer, "binary_ciphertext", False)
+
+
+class CiphertextSerializerField(serializers.JSONField):
+    """
+    JSON (base64) par défaut ; octets bruts en entrée/sortie pour les formats
+    binaires (msgpack). Seules la forme et la taille sont validées : le contenu
+    est opaque pour le serveur.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, dict):
+            data = {
+                key: base64.b64encode(value).decode("ascii") if isinstance(value, (bytes, bytearray)) else value
+                for key, value in data.items()
+            }
+        error = opaque_object_error(data, settings.CIPHERTEXT_MAX_BYTES)
+        if error:
+            raise serializers.ValidationError(f"Ciphertext {error}")
+        return data
+
+    def to_representation(self, value):
+        if wants_binary(self.context):
+            return ciphertext_to_binary(value)
+        return super().to_representation(value)
+
 class CategorySerializer(serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ["id","name","description"]
 
 class PasswordSerializer(serializers.ModelSerializer):
+    ciphertext = CiphertextSerializerField()
     category = serializers.PrimaryKeyRelatedField(
         queryset=Category.objects.none(),
         allow_null=True,
@@ -14,7 +51,14 @@ class PasswordSerializer(serializers.ModelSerializer):
     )
 
     def __init__(self, *args, **kwargs):
+        # Sous-ensemble de champs (?fields=) : le reste n'est ni lu ni sérialisé.
+        only_fields = kwargs.pop("fields", None)
         super().__init__(*args, **kwargs)
+        if only_fields is not None:
+            for name in set(self.fields) - set(only_fields):
+                self.fields.pop(name)
+        if "category" not in self.fields:
+            return
         request = self.context.get("request")
         if request and getattr(request, "user", None) and request.user.is_authenticated:
             self.fields["category"].queryset = Category.objects.filter(owner=request.user)
@@ -26,6 +70,16 @@ class PasswordSerializer(serializers.ModelSerializer):
         fields = ["id","title","url","category","ciphertext","created_at","updated_at"]
 
 
+class PasswordBulkDataSerializer(serializers.ModelSerializer):
+    """Champs d'une opération de lot ; la propriété des catégories est vérifiée pour tout le lot."""
+    category = serializers.IntegerField(allow_null=True, required=False)
+    ciphertext = CiphertextSerializerField()
+
+    class Meta:
+        model = PasswordEntry
+        fields = ["title","url","category","ciphertext"]
+
+
 class SecretBundleSerializer(serializers.ModelSerializer):
     class Meta:
         model = SecretBundle
@@ -0,0 +1,37 @@
+from django.contrib.auth import get_user_model
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Category, PasswordEntry, SecretBundle
+from .secrets_cache import invalidate_secret
+from .token_versions import revocation_cache
+from .vault_version import bump_vault_version
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=PasswordEntry)
+def bump_on_save(sender, instance, **kwargs):
+    bump_vault_version(instance.owner_id)
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=PasswordEntry)
+def bump_on_delete(sender, instance, origin=None, **kwargs):
+    # Suppression en cascade d'un compte : la version disparaît avec lui.
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is get_user_model():
+        return
+    bump_vault_version(instance.owner_id)
+
+
+@receiver(post_save, sender=get_user_model())
+def refresh_revocation_state(sender, instance, **kwargs):
+    # Désactivation visible immédiatement dans ce processus, après le délai du cache ailleurs.
+    revocation_cache.evict(instance.pk)
+
+
+@receiver(post_save, sender=SecretBundle)
+@receiver(post_delete, sender=SecretBundle)
+def invalidate_cached_secret(sender, instance, **kwargs):
+    invalidate_secret(instance.owner_id, instance.app, instance.environment)
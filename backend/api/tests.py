@@ -1,9 +1,52 @@
+import base64
+import gzip
+import json
+import os
+import runpy
+from datetime import datetime, timedelta
+from importlib import import_module
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock
+
+import msgpack
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection, connections
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from django.utils import timezone
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APITestCase
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
 
-from api.models import Category, PasswordEntry
+from api.ciphertext import FORMAT_JSON, FORMAT_PACKED, pack_ciphertext, unpack_ciphertext
+from api.models import Category, PasswordEntry, SecretBundle, TokenVersion, VaultVersion
+from api.pagination import encode_cursor
+from api.authentication import add_user_claims
+from api.export import export_records, stream_export
+from api.payloads import encoded_size, opaque_object_error, payload_hash
+from api.renderers import FastJSONRenderer
+from api.secrets_cache import secret_cache_key, secrets_cache_counters
+from api.serializers import PasswordSerializer, SecretBundleSerializer
+from api.token_blacklist import VaultRefreshToken, blacklist_stats, purge_expired_tokens, revoked_jtis
+from api.token_versions import bump_token_version, revocation_cache
+from api.vault_import import VaultImport
+from api.vault_version import get_vault_version
+from api.views_metrics import readiness_probe
+from gestionnaire_mdp.compression import BrotliCodec, GzipCodec, ZstdCodec, negotiate
+from gestionnaire_mdp.db_backend.base import connection_stats
+from gestionnaire_mdp.metrics import request_metrics
+from gestionnaire_mdp.middleware import CompressionMiddleware
 
 
 class PasswordCategoryOwnershipTests(APITestCase):
@@ -120,6 +163,160 @@ class JWTLogoutTests(APITestCase):
         self.assertEqual(response.data["detail"], "'refresh' is required.")
 
 
+class StatelessJWTAuthenticationTests(APITestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.user = user_model.objects.create_user(username="stateless", password="stateless-pass")
+        PasswordEntry.objects.create(owner=self.user, title="Mine", ciphertext={"iv": "AAAAAAAAAAAAAAAA"})
+        revocation_cache.clear()
+        self.addCleanup(revocation_cache.clear)
+
+    def login(self):
+        response = self.client.post(
+            "/api/auth/jwt/create/", {"username": "stateless", "password": "stateless-pass"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        return response.data
+
+    def test_tokens_carry_user_claims(self):
+        access = AccessToken(self.login()["access"])
+
+        self.assertEqual(access["username"], "stateless")
+        self.assertIs(access["is_active"], True)
+        self.assertEqual(access["tv"], 0)
+
+    def test_owner_scoped_request_makes_no_user_query(self):
+        self.login()
+        self.client.get("/api/passwords/")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/passwords/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()), 1)
+        self.assertFalse([q for q in queries if "auth_user" in q["sql"]])
+
+    def test_revoked_tokens_are_rejected(self):
+        tokens = self.login()
+
+        bump_token_version(self.user.id)
+
+        self.assertEqual(self.client.get("/api/passwords/").status_code, status.HTTP_401_UNAUTHORIZED)
+        refresh = self.client.post("/api/auth/jwt/refresh/", {"refresh": tokens["refresh"]}, format="json")
+        self.assertEqual(refresh.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_rejected(self):
+        self.login()
+        self.client.get("/api/passwords/")
+
+        self.user.is_active = False
+        self.user.save(update_fields=["is_active"])
+
+        self.assertEqual(self.client.get("/api/passwords/").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revocation_elsewhere_is_seen_after_cache_window(self):
+        self.login()
+        self.client.get("/api/passwords/")
+        # Révocation faite par un autre processus : le cache local n'est pas invalidé.
+        TokenVersion.objects.create(user=self.user, version=1)
+
+        self.assertEqual(self.client.get("/api/passwords/").status_code, status.HTTP_200_OK)
+        with self.settings(JWT_REVOCATION_CACHE_SECONDS=0):
+            revocation_cache.evict(self.user.id)
+            self.assertEqual(self.client.get("/api/passwords/").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_whoami_uses_claims(self):
+        self.login()
+
+        response = self.client.get("/api/auth/whoami/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["id"], self.user.id)
+        self.assertEqual(response.json()["username"], "stateless")
+
+
+class TokenBlacklistPurgeTests(APITestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.user = user_model.objects.create_user(username="purge-user", password="purge-pass")
+        revoked_jtis.clear()
+        self.addCleanup(revoked_jtis.clear)
+
+    def outstanding(self, jti, expires_in):
+        now = timezone.now()
+        return OutstandingToken.objects.create(
+            user=self.user, jti=jti, token="x", created_at=now, expires_at=now + timedelta(seconds=expires_in)
+        )
+
+    def test_purge_removes_only_expired_tokens_in_batches(self):
+        for i in range(5):
+            BlacklistedToken.objects.create(token=self.outstanding(f"old-{i}", -60))
+        self.outstanding("live", 3600)
+
+        batches = list(purge_expired_tokens(batch_size=2))
+
+        self.assertEqual(batches, [2, 2, 1])
+        self.assertEqual(list(OutstandingToken.objects.values_list("jti", flat=True)), ["live"])
+        self.assertFalse(BlacklistedToken.objects.exists())
+
+    def test_purge_command_reports_throughput(self):
+        self.outstanding("old", -60)
+        out = StringIO()
+
+        call_command("purge_token_blacklist", "--batch-size", "10", stdout=out)
+
+        self.assertIn("1 jetons supprimés en 1 lots", out.getvalue())
+        self.assertIn("token_blacklist_outstandingtoken: 0 lignes", out.getvalue())
+
+    def test_replayed_refresh_token_is_rejected_from_cache(self):
+        token = VaultRefreshToken.for_user(self.user)
+        refresh = str(token)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token.access_token}")
+        logout = self.client.post("/api/auth/jwt/logout/", {"refresh": refresh}, format="json")
+        self.assertEqual(logout.status_code, status.HTTP_204_NO_CONTENT)
+
+        with CaptureQueriesContext(connection) as queries:
+            replay = self.client.post("/api/auth/jwt/refresh/", {"refresh": refresh}, format="json")
+
+        self.assertEqual(replay.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertFalse([q for q in queries if "token_blacklist" in q["sql"]])
+        self.assertEqual(revoked_jtis.hits, 1)
+
+    def test_valid_refresh_token_is_read_once_per_revocation_window(self):
+        refresh = str(VaultRefreshToken.for_user(self.user))
+
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(2):
+                response = self.client.post("/api/auth/jwt/refresh/", {"refresh": refresh}, format="json")
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        checks = [q for q in queries if 'FROM "token_blacklist_blacklistedtoken" INNER JOIN' in q["sql"]]
+        self.assertEqual(len(checks), 1)
+
+        # Révocation locale : le JTI valide en cache est remplacé immédiatement.
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        self.client.post("/api/auth/jwt/logout/", {"refresh": refresh}, format="json")
+        replay = self.client.post("/api/auth/jwt/refresh/", {"refresh": refresh}, format="json")
+        self.assertEqual(replay.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_stats_use_planner_estimates_for_row_counts(self):
+        self.outstanding("live", 3600)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE token_blacklist_outstandingtoken, token_blacklist_blacklistedtoken")
+
+        with CaptureQueriesContext(connection) as queries:
+            stats = blacklist_stats()
+
+        self.assertEqual(stats["token_blacklist_outstandingtoken"], {
+            "rows": 1, "rows_estimated": True, "bytes": stats["token_blacklist_outstandingtoken"]["bytes"],
+        })
+        # Seul le décompte des expirés reste exact.
+        counts = [q["sql"] for q in queries if "COUNT(*)" in q["sql"]]
+        self.assertEqual(len(counts), 1)
+        self.assertIn("expires_at", counts[0])
+
+
 class LegacySessionCompatibilityTests(APITestCase):
     def setUp(self):
         user_model = get_user_model()
@@ -147,3 +344,1334 @@ class LegacySessionCompatibilityTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(response["Deprecation"], "true")
         self.assertIn("/api/auth/jwt/", response["Warning"])
+
+
+class VaultVersionETagTests(APITestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(username="etag-owner", password="owner-pass")
+        self.other = user_model.objects.create_user(username="etag-other", password="other-pass")
+        self.category = Category.objects.create(owner=self.owner, name="Etag Category")
+        self.entry = PasswordEntry.objects.create(
+            owner=self.owner,
+            title="Etag entry",
+            category=self.category,
+            ciphertext={"iv": "iv", "salt": "salt", "data": "data", "key": "key"},
+        )
+        self.client.force_authenticate(user=self.owner)
+
+    def test_writes_bump_owner_version_only(self):
+        before = get_vault_version(self.owner.id)
+
+        self.entry.title = "Renamed"
+        self.entry.save()
+        Category.objects.create(owner=self.owner, name="Another")
+        self.entry.delete()
+
+        self.assertEqual(get_vault_version(self.owner.id), before + 3)
+        self.assertEqual(get_vault_version(self.other.id), 0)
+
+    def test_list_returns_304_without_evaluating_queryset(self):
+        first = self.client.get("/api/passwords/")
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        etag = first["ETag"]
+
+        # Version de voûte uniquement, aucune lecture de api_passwordentry.
+        with self.assertNumQueries(1):
+            second = self.client.get("/api/passwords/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(second.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(second["ETag"], etag)
+
+    def test_write_invalidates_etag(self):
+        etag = self.client.get("/api/categories/")["ETag"]
+
+        self.client.post("/api/categories/", {"name": "Fresh"}, format="json")
+        response = self.client.get("/api/categories/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_detail_and_list_etags_differ(self):
+        list_etag = self.client.get("/api/passwords/")["ETag"]
+        detail = self.client.get(f"/api/passwords/{self.entry.id}/", HTTP_IF_NONE_MATCH=list_etag)
+
+        self.assertEqual(detail.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(detail["ETag"], list_etag)
+
+    def test_etag_is_not_shared_between_owners(self):
+        etag = self.client.get("/api/passwords/")["ETag"]
+        self.client.force_authenticate(user=self.other)
+
+        response = self.client.get("/api/passwords/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_deleting_owner_does_not_recreate_version(self):
+        owner_id = self.owner.id
+
+        self.owner.delete()
+
+        self.assertFalse(VaultVersion.objects.filter(owner_id=owner_id).exists())
+
+
+class PasswordBulkTests(APITestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(username="bulk-owner", password="owner-pass")
+        self.other = user_model.objects.create_user(username="bulk-other", password="other-pass")
+        self.source = Category.objects.create(owner=self.owner, name="Source")
+        self.target = Category.objects.create(owner=self.owner, name="Target")
+        self.foreign = Category.objects.create(owner=self.other, name="Foreign")
+        self.entries = [
+            PasswordEntry.objects.create(
+                owner=self.owner,
+                title=f"Entry {i}",
+                category=self.source,
+                ciphertext={"iv": "iv", "salt": "salt", "data": "data", "key": "key"},
+            )
+            for i in range(3)
+        ]
+        self.client.force_authenticate(user=self.owner)
+
+    def test_mixed_batch_is_applied(self):
+        version = get_vault_version(self.owner.id)
+        response = self.client.post(
+            "/api/passwords/bulk/",
+            {
+                "operations": [
+                    {
+                        "op": "create",
+                        "data": {"title": "New", "category": self.target.id, "ciphertext": {"data": "x"}},
+                    },
+                    {
+                        "op": "update",
+                        "id": self.entries[0].id,
+                        "data": {"title": "Replaced", "ciphertext": {"data": "y"}},
+                    },
+                    {"op": "patch", "id": self.entries[1].id, "data": {"category": None}},
+                    {"op": "delete", "id": self.entries[2].id},
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual([r["status"] for r in results], [201, 200, 200, 204])
+        created = PasswordEntry.objects.get(id=results[0]["id"])
+        self.assertEqual(created.owner, self.owner)
+        self.assertEqual(created.category, self.target)
+        self.entries[0].refresh_from_db()
+        self.assertEqual(self.entries[0].title, "Replaced")
+        self.assertEqual(self.entries[0].category, self.source)
+        self.entries[1].refresh_from_db()
+        self.assertIsNone(self.entries[1].category)
+        self.assertFalse(PasswordEntry.objects.filter(id=self.entries[2].id).exists())
+        self.assertEqual(get_vault_version(self.owner.id), version + 1)
+
+    def test_reassign_query_count_is_constant(self):
+        operations = [
+            {"op": "patch", "id": entry.id, "data": {"category": self.target.id}}
+            for entry in self.entries
+        ]
+
+        # catégories, entrées, savepoint, bulk_update, version, release.
+        with self.assertNumQueries(6):
+            response = self.client.post("/api/passwords/bulk/", {"operations": operations}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(PasswordEntry.objects.filter(category=self.target).count(), 3)
+
+    def test_foreign_category_rejects_whole_batch(self):
+        response = self.client.post(
+            "/api/passwords/bulk/",
+            {
+                "operations": [
+                    {"op": "patch", "id": self.entries[0].id, "data": {"category": self.target.id}},
+                    {"op": "patch", "id": self.entries[1].id, "data": {"category": self.foreign.id}},
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["errors"][0]["index"], 1)
+        self.assertIn("category", response.data["errors"][0]["errors"])
+        self.assertFalse(PasswordEntry.objects.filter(category=self.target).exists())
+
+    def test_foreign_entry_is_not_found(self):
+        foreign_entry = PasswordEntry.objects.create(owner=self.other, title="Foreign", ciphertext={})
+
+        response = self.client.post(
+            "/api/passwords/bulk/",
+            {"operations": [{"op": "delete", "id": foreign_entry.id}]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("id", response.data["errors"][0]["errors"])
+        self.assertTrue(PasswordEntry.objects.filter(id=foreign_entry.id).exists())
+
+    def test_rejects_invalid_payloads(self):
+        for body in ({"operations": []}, {"operations": "nope"}, {"operations": [{"op": "merge"}]}):
+            response = self.client.post("/api/passwords/bulk/", body, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class PasswordSparseFieldsTests(APITestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(username="sparse-owner", password="owner-pass")
+        self.other = user_model.objects.create_user(username="sparse-other", password="other-pass")
+        self.category = Category.objects.create(owner=self.owner, name="Sparse")
+        self.entries = [
+            PasswordEntry.objects.create(
+                owner=self.owner,
+                title=f"Sparse {i}",
+                url="https://example.com",
+                category=self.category,
+                ciphertext={"iv": "iv", "data": f"data-{i}"},
+            )
+            for i in range(3)
+        ]
+        self.foreign = PasswordEntry.objects.create(owner=self.other, title="Foreign", ciphertext={"data": "x"})
+        self.client.force_authenticate(user=self.owner)
+
+    def test_list_with_fields_omits_ciphertext(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/passwords/?fields=title,category,updated_at")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data[0]), {"id", "title", "category", "updated_at"})
+        self.assertNotIn("ciphertext", ctx.captured_queries[-1]["sql"])
+
+    def test_retrieve_with_fields(self):
+        response = self.client.get(f"/api/passwords/{self.entries[0].id}/?fields=url")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"id": self.entries[0].id, "url": "https://example.com"})
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get("/api/passwords/?fields=title,owner")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("fields", response.data)
+
+    def test_batch_returns_owned_ciphertexts_in_one_query(self):
+        ids = ",".join(str(entry.id) for entry in self.entries[:2])
+
+        # Version de voûte puis une seule lecture des entrées.
+        with self.assertNumQueries(2):
+            response = self.client.get(f"/api/passwords/batch/?ids={ids},{self.foreign.id}")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        items = response.json()
+        self.assertEqual([item["id"] for item in items], [e.id for e in self.entries[:2]])
+        self.assertEqual(items[0]["ciphertext"], {"iv": "iv", "data": "data-0"})
+
+    def test_batch_rejects_invalid_ids(self):
+        too_many = ",".join(str(i) for i in range(1, 202))
+        for query in ("", "?ids=a,b", f"?ids={too_many}"):
+            response = self.client.get(f"/api/passwords/batch/{query}")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ProjectedReadPathTests(APITestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(username="fast-owner", password="owner-pass")
+        category = Category.objects.create(owner=self.owner, name="Fast")
+        PasswordEntry.objects.create(
+            owner=self.owner,
+            title="Ünïcode   entry",
+            url="https://example.com",
+            category=category,
+            ciphertext={"iv": "iv", "data": "data", "nested": {"n": [1, 2.5, None]}},
+        )
+        PasswordEntry.objects.create(owner=self.owner, title="No category", ciphertext={})
+        self.client.force_authenticate(user=self.owner)
+
+    def test_projection_matches_serializer_output(self):
+        queryset = PasswordEntry.objects.filter(owner=self.owner)
+        expected = PasswordSerializer(queryset, many=True).data
+
+        response = self.client.get("/api/passwords/")
+
+        self.assertEqual(response.content, JSONRenderer().render(expected))
+        entry = queryset.first()
+        detail = self.client.get(f"/api/passwords/{entry.id}/")
+        self.assertEqual(detail.content, JSONRenderer().render(PasswordSerializer(entry).data))
+
+    def test_fast_renderer_matches_drf_renderer(self):
+        data = PasswordSerializer(PasswordEntry.objects.filter(owner=self.owner), many=True).data
+
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_retrieve_unknown_entry_is_404(self):
+        self.assertEqual(self.client.get("/api/passwords/999999/").status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ResponseCompressionTests(APITestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(username="gzip-owner", password="owner-pass")
+        PasswordEntry.objects.bulk_create(
+            [
+                PasswordEntry(owner=self.owner, title=f"Entry {i}", ciphertext={"iv": "aXY=", "data": "ZGF0YQ==" * 8})
+                for i in range(50)
+            ]
+        )
+        SecretBundle.objects.create(owner=self.owner, app="app", environment="prod", payload={"ciphertext": "x" * 4096})
+        self.client.force_authenticate(user=self.owner)
+
+    def test_large_json_is_gzipped(self):
+        response = self.client.get("/api/passwords/", HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertTrue(response["ETag"].startswith('W/"'))
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))), 50)
+
+    def test_weak_etag_still_revalidates(self):
+        etag = self.client.get("/api/passwords/", HTTP_ACCEPT_ENCODING="gzip")["ETag"]
+
+        response = self.client.get("/api/passwords/", HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_identity_when_not_accepted(self):
+        for header in ("", "gzip;q=0", "identity"):
+            response = self.client.get("/api/passwords/", HTTP_ACCEPT_ENCODING=header)
+            self.assertFalse(response.has_header("Content-Encoding"), header)
+
+    def test_no_store_secrets_are_never_compressed(self):
+        response = self.client.get("/api/secrets/?app=app&env=prod", HTTP_ACCEPT_ENCODING="gzip, br, zstd")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_small_responses_are_left_alone(self):
+        response = self.client.get("/api/healthz/", HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_streaming_response_is_compressed_incrementally(self):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip")
+        chunks = [b'{"n": %d}\n' % i for i in range(100)]
+        middleware = CompressionMiddleware(
+            lambda _: StreamingHttpResponse(iter(chunks), content_type="application/x-ndjson")
+        )
+
+        response = middleware(request)
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(b"".join(response.streaming_content)), b"".join(chunks))
+
+    def test_accept_encoding_negotiation(self):
+        codecs = [ZstdCodec(), BrotliCodec(), GzipCodec()]
+
+        self.assertEqual(negotiate("gzip, br", codecs).name, "br")
+        self.assertEqual(negotiate("br;q=0, gzip;q=0.5", codecs).name, "gzip")
+        self.assertEqual(negotiate("*", codecs).name, "zstd")
+        self.assertIsNone(negotiate("identity", codecs))
+
+
+class BinaryCiphertextTests(APITestCase):
+    ciphertext = {
+        "iv": base64.b64encode(bytes(range(12))).decode(),
+        "salt": base64.b64encode(bytes(range(16))).decode(),
+        "key": base64.b64encode(bytes(range(256))).decode(),
+        "data": base64.b64encode(b"secret payload" * 10).decode(),
+    }
+
+    def setUp(self):
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(username="bin-owner", password="owner-pass")
+        self.entry = PasswordEntry.objects.create(owner=self.owner, title="Binary", ciphertext=self.ciphertext)
+        self.client.force_authenticate(user=self.owner)
+
+    def stored_blob(self, entry_id):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT ciphertext FROM api_passwordentry WHERE id = %s", [entry_id])
+            return bytes(cursor.fetchone()[0])
+
+    def test_standard_ciphertext_is_packed(self):
+        blob = self.stored_blob(self.entry.id)
+
+        self.assertEqual(blob[0], FORMAT_PACKED)
+        self.assertLess(len(blob), len(json.dumps(self.ciphertext)) * 3 // 4)
+        self.entry.refresh_from_db()
+        self.assertEqual(self.entry.ciphertext, self.ciphertext)
+
+    def test_blobs_written_by_the_conversion_migration_stay_readable(self):
+        migration = import_module("api.migrations.0007_passwordentry_ciphertext_binary")
+        for value in (self.ciphertext, {"iv": "not base64!", "extra": [1, {"n": None}]}):
+            with self.subTest(value=value):
+                blob = migration.pack_ciphertext(value)
+                self.assertEqual(migration.unpack_ciphertext(blob), value)
+                self.assertEqual(unpack_ciphertext(blob), value)
+
+    def test_non_standard_ciphertext_round_trips_as_json(self):
+        odd = {"iv": "not base64!", "extra": [1, {"n": None}]}
+        entry = PasswordEntry.objects.create(owner=self.owner, title="Odd", ciphertext=odd)
+
+        self.assertEqual(self.stored_blob(entry.id)[0], FORMAT_JSON)
+        entry.refresh_from_db()
+        self.assertEqual(entry.ciphertext, odd)
+
+    def test_codec_round_trip(self):
+        for value in (self.ciphertext, {"iv": "AA=="}, {"data": ""}, [1, 2], "text", {}):
+            self.assertEqual(unpack_ciphertext(pack_ciphertext(value)), value)
+
+    def test_json_representation_is_unchanged(self):
+        response = self.client.get(f"/api/passwords/{self.entry.id}/")
+
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(response.json()["ciphertext"], self.ciphertext)
+
+    def test_msgpack_list_returns_raw_bytes(self):
+        response = self.client.get("/api/passwords/", HTTP_ACCEPT="application/msgpack")
+
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        items = msgpack.unpackb(response.content)
+        self.assertEqual(items[0]["ciphertext"]["iv"], bytes(range(12)))
+        self.assertEqual(items[0]["ciphertext"]["key"], bytes(range(256)))
+
+    def test_msgpack_and_json_etags_differ(self):
+        json_etag = self.client.get("/api/passwords/")["ETag"]
+
+        response = self.client.get("/api/passwords/", HTTP_ACCEPT="application/msgpack", HTTP_IF_NONE_MATCH=json_etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_msgpack_create_accepts_raw_bytes(self):
+        body = msgpack.packb(
+            {"title": "From msgpack", "ciphertext": {"iv": b"\x00" * 12, "data": b"\xff" * 40}},
+            use_bin_type=True,
+        )
+
+        response = self.client.generic(
+            "POST", "/api/passwords/", body, content_type="application/msgpack", HTTP_ACCEPT="application/json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        entry = PasswordEntry.objects.get(id=response.json()["id"])
+        self.assertEqual(entry.ciphertext, {"iv": "AAAAAAAAAAAAAAAA", "data": base64.b64encode(b"\xff" * 40).decode()})
+        self.assertEqual(self.stored_blob(entry.id)[0], FORMAT_PACKED)
+
+
+class OpaquePayloadPassthroughTests(APITestCase):
+    payload = {"ciphertext": "QUJD", "iv": "AAAAAAAAAAAAAAAA", "salt": "c2FsdA==", "nested": {"n": [1, None]}}
+
+    def setUp(self):
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(username="raw-owner", password="owner-pass")
+        self.client.force_authenticate(user=self.owner)
+
+    def test_secret_payload_is_served_verbatim(self):
+        SecretBundle.objects.create(owner=self.owner, app="svc", environment="prod", payload=self.payload)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT payload::text FROM api_secretbundle WHERE app = 'svc'")
+            stored = cursor.fetchone()[0]
+
+        response = self.client.get("/api/secrets/?app=svc&env=prod")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, stored.encode())
+        self.assertEqual(response.json(), self.payload)
+        self.assertEqual(response["Cache-Control"], "no-store")
+
+    def test_missing_secret_is_404(self):
+        response = self.client.get("/api/secrets/?app=svc&env=missing")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_oversized_secret_payload_is_rejected(self):
+        with self.settings(SECRET_PAYLOAD_MAX_BYTES=64):
+            response = self.client.post(
+                "/api/secrets/", {"app": "svc", "env": "prod", "payload": {"data": "A" * 100}}, format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(SecretBundle.objects.exists())
+
+    def test_ciphertext_must_be_an_object(self):
+        response = self.client.post("/api/passwords/", {"title": "Bad", "ciphertext": ["iv"]}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("ciphertext", response.json())
+
+    def test_oversized_ciphertext_is_rejected(self):
+        with self.settings(CIPHERTEXT_MAX_BYTES=64):
+            response = self.client.post(
+                "/api/passwords/", {"title": "Big", "ciphertext": {"data": "A" * 100}}, format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_encoded_size_matches_compact_json(self):
+        for value in ({"iv": "abc", "data": "x" * 50}, {}, self.payload):
+            self.assertEqual(encoded_size(value), len(json.dumps(value, separators=(",", ":"))))
+
+    def test_encoded_size_counts_escapes_and_utf8_bytes(self):
+        for value in (
+            {"data": 'a"b\\c'},
+            {"data": "ligne\nsuivante\x01"},
+            {"données": "été", "emoji": "\U0001f511"},
+        ):
+            with self.subTest(value=value):
+                expected = len(json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode())
+                self.assertEqual(encoded_size(value), expected)
+
+    def test_escaped_and_non_ascii_payloads_are_measured_at_the_limit(self):
+        # 20 caractères, mais 40 octets une fois encodés : l'ancien calcul comptait 31.
+        for data in ("é" * 10 + "\"" * 10, "\x01" * 4):
+            value = {"data": data}
+            size = len(json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode())
+            with self.subTest(data=data):
+                self.assertEqual(opaque_object_error(value, size - 1), f"must not exceed {size - 1} bytes.")
+                self.assertIsNone(opaque_object_error(value, size))
+
+        with self.settings(SECRET_PAYLOAD_MAX_BYTES=50):
+            response = self.client.post(
+                "/api/secrets/", {"app": "svc", "env": "edge", "payload": {"data": "é" * 10 + "\"" * 10}},
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_nul_character_is_rejected(self):
+        response = self.client.post(
+            "/api/secrets/", {"app": "svc", "env": "edge", "payload": {"data": "a\x00b"}}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ConnectionStatsTests(APITestCase):
+    def test_backend_counts_connections_and_connect_time(self):
+        before = connection_stats.snapshot()
+        wrapper = connections.create_connection("default")
+
+        wrapper.ensure_connection()
+        wrapper.ensure_connection()
+        wrapper.close()
+
+        after = connection_stats.snapshot()
+        self.assertEqual(after["opened"] - before["opened"], 1)
+        self.assertEqual(after["closed"] - before["closed"], 1)
+        self.assertGreater(after["connect_seconds"], before["connect_seconds"])
+
+
+@override_settings(SECRETS_CACHE_TIMEOUT=300)
+class SecretsCacheTests(APITestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(username="cache-owner", password="owner-pass")
+        self.client.force_authenticate(user=self.owner)
+        SecretBundle.objects.create(owner=self.owner, app="svc", environment="prod", payload={"data": "v1"})
+        caches["secrets"].clear()
+        secrets_cache_counters.reset()
+
+    def get_secret(self):
+        return self.client.get("/api/secrets/?app=svc&env=prod")
+
+    def test_repeated_reads_are_served_from_cache(self):
+        with self.assertNumQueries(1):
+            first = self.get_secret()
+        with self.assertNumQueries(0):
+            second = self.get_secret()
+
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(second["Cache-Control"], "no-store")
+        self.assertEqual(secrets_cache_counters.snapshot(), {"hits": 1, "misses": 1, "hit_ratio": 0.5})
+
+    def test_writes_invalidate_cached_payload(self):
+        self.get_secret()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.put("/api/secrets/", {"app": "svc", "env": "prod", "payload": {"data": "v2"}}, format="json")
+        self.assertEqual(self.get_secret().json(), {"data": "v2"})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete("/api/secrets/?app=svc&env=prod")
+        self.assertEqual(self.get_secret().status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_invalidation_waits_for_commit(self):
+        self.get_secret()
+        key = secret_cache_key(self.owner.id, "svc", "prod")
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.client.put("/api/secrets/", {"app": "svc", "env": "prod", "payload": {"data": "v2"}}, format="json")
+            # Transaction encore ouverte : une lecture concurrente ne verrait que l'ancienne ligne.
+            self.assertIsNotNone(caches["secrets"].get(key))
+
+        for callback in callbacks:
+            callback()
+        self.assertIsNone(caches["secrets"].get(key))
+
+    def test_cache_is_scoped_to_owner(self):
+        self.get_secret()
+        other = get_user_model().objects.create_user(username="cache-other", password="other-pass")
+        self.client.force_authenticate(user=other)
+
+        self.assertEqual(self.get_secret().status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_shared_backend_alias_is_configurable(self):
+        shared = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "shared-stand-in"}
+        with self.settings(CACHES={**settings.CACHES, "shared": shared}, SECRETS_CACHE_ALIAS="shared"):
+            self.get_secret()
+            key = secret_cache_key(self.owner.id, "svc", "prod")
+            self.assertEqual(json.loads(caches["shared"].get(key)[1]), {"data": "v1"})
+            caches["shared"].clear()
+
+
+class SecretsBatchTests(APITestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(username="batch-secrets", password="owner-pass")
+        self.client.force_authenticate(user=self.owner)
+        SecretBundle.objects.create(owner=self.owner, app="api", environment="prod", payload={"data": "a"})
+        SecretBundle.objects.create(owner=self.owner, app="web", environment="dev", payload={"data": "b"})
+        caches["secrets"].clear()
+
+    def test_batch_get_uses_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/secrets/batch/?pair=api:prod&pair=web:dev&pair=web:prod")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Cache-Control"], "no-store")
+        body = response.json()
+        self.assertEqual(
+            [(item["app"], item["environment"], item["payload"]) for item in body["items"]],
+            [("api", "prod", {"data": "a"}), ("web", "dev", {"data": "b"})],
+        )
+        self.assertEqual(body["missing"], [{"app": "web", "environment": "prod"}])
+
+    def test_batch_get_rejects_malformed_pairs(self):
+        response = self.client.get("/api/secrets/batch/?pair=no-env")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()["errors"][0]["index"], 0)
+
+    @override_settings(SECRETS_CACHE_TIMEOUT=300)
+    def test_batch_upsert_is_a_single_statement(self):
+        self.client.get("/api/secrets/?app=api&env=prod")
+        items = [
+            {"app": "api", "env": "prod", "payload": {"data": "a2"}},
+            {"app": "new", "env": "prod", "payload": {"data": "c"}},
+        ]
+
+        with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/secrets/batch/", {"items": items}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        writes = [q["sql"] for q in queries if not q["sql"].startswith(("SAVEPOINT", "RELEASE"))]
+        self.assertEqual(len(writes), 1)
+        self.assertIn("ON CONFLICT", writes[0])
+        self.assertEqual([item["app"] for item in response.json()["stored"]], ["api", "new"])
+        self.assertEqual(SecretBundle.objects.filter(owner=self.owner).count(), 3)
+        self.assertEqual(self.client.get("/api/secrets/?app=api&env=prod").json(), {"data": "a2"})
+
+    def test_batch_upsert_rejects_duplicates_and_bad_payloads(self):
+        items = [
+            {"app": "api", "env": "prod", "payload": {"data": "x"}},
+            {"app": "api", "env": "prod", "payload": {"data": "y"}},
+            {"app": "web", "env": "dev", "payload": "not-an-object"},
+        ]
+
+        response = self.client.post("/api/secrets/batch/", {"items": items}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error["index"] for error in response.json()["errors"]], [1, 2])
+        self.assertEqual(SecretBundle.objects.get(app="api").payload, {"data": "a"})
+
+
+class SecretsListingTests(APITestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(username="list-secrets", password="owner-pass")
+        self.client.force_authenticate(user=self.owner)
+        for app in ("api", "api-admin", "web"):
+            for env_name in ("dev", "prod"):
+                SecretBundle.objects.create(
+                    owner=self.owner, app=app, environment=env_name, payload={"data": "x" * 1000}
+                )
+
+    def test_listing_never_reads_payload(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/secrets/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()), 6)
+        self.assertEqual(set(response.json()[0]), {"id", "app", "environment", "created_at", "updated_at"})
+        self.assertNotIn("payload", queries[0]["sql"])
+
+    def test_listing_matches_serializer_output(self):
+        expected = [
+            {key: value for key, value in item.items() if key != "payload"}
+            for item in SecretBundleSerializer(SecretBundle.objects.filter(owner=self.owner), many=True).data
+        ]
+
+        self.assertEqual(self.client.get("/api/secrets/").json(), json.loads(json.dumps(expected)))
+
+    def test_app_prefix_filter(self):
+        response = self.client.get("/api/secrets/?app=api")
+
+        self.assertEqual({item["app"] for item in response.json()}, {"api", "api-admin"})
+
+    def test_cursor_pagination_walks_all_bundles(self):
+        seen, url = [], "/api/secrets/?limit=4"
+        while url:
+            body = self.client.get(url).json()
+            seen += [(item["app"], item["environment"]) for item in body["results"]]
+            url = body["next"]
+
+        self.assertEqual(len(seen), 6)
+        self.assertEqual(seen, sorted(seen))
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get("/api/secrets/?cursor=not-a-cursor")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cursor_with_wrong_value_types_is_rejected(self):
+        for values in (["api", ["dev"]], [{}, "dev"], ["api", 1], ["api\u0000", "dev"]):
+            with self.subTest(values=values):
+                response = self.client.get("/api/secrets/", {"cursor": encode_cursor(values)})
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class SecretsETagTests(APITestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(username="etag-secrets", password="owner-pass")
+        self.client.force_authenticate(user=self.owner)
+        self.bundle = SecretBundle.objects.create(owner=self.owner, app="svc", environment="prod", payload={"data": "v1"})
+        caches["secrets"].clear()
+
+    def get_secret(self, **headers):
+        return self.client.get("/api/secrets/?app=svc&env=prod", **headers)
+
+    def test_etag_is_the_content_hash(self):
+        response = self.get_secret()
+
+        self.assertEqual(response["ETag"], f'"{payload_hash({"data": "v1"})}"')
+        self.assertEqual(self.bundle.content_hash, payload_hash({"data": "v1"}))
+
+    def test_revalidation_reads_only_the_hash(self):
+        etag = self.get_secret()["ETag"]
+        caches["secrets"].clear()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get_secret(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("payload", queries[0]["sql"])
+
+    @override_settings(SECRETS_CACHE_TIMEOUT=300)
+    def test_cached_bundle_revalidates_without_query(self):
+        etag = self.get_secret()["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.get_secret(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_changed_payload_returns_new_etag(self):
+        etag = self.get_secret()["ETag"]
+        self.client.put("/api/secrets/", {"app": "svc", "env": "prod", "payload": {"data": "v2"}}, format="json")
+
+        response = self.get_secret(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json(), {"data": "v2"})
+
+    def test_unchanged_push_keeps_etag(self):
+        etag = self.get_secret()["ETag"]
+        items = [{"app": "svc", "env": "prod", "payload": {"data": "v1"}}]
+        self.client.post("/api/secrets/batch/", {"items": items}, format="json")
+
+        self.assertEqual(self.get_secret(HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+@override_settings(ROOT_URLCONF="gestionnaire_mdp.asgi_urls")
+class AsyncReadPathTests(APITestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(username="async-owner", password="owner-pass", email="a@example.com")
+        SecretBundle.objects.create(owner=self.owner, app="svc", environment="prod", payload={"data": "v1"})
+        access = add_user_claims(VaultRefreshToken.for_user(self.owner), self.owner).access_token
+        self.auth = {"AUTHORIZATION": f"Bearer {access}"}
+        caches["secrets"].clear()
+        revocation_cache.clear()
+        self.addCleanup(revocation_cache.clear)
+
+    async def test_async_secret_pull(self):
+        response = await self.async_client.get("/api/secrets/?app=svc&env=prod", headers=self.auth)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {"data": "v1"})
+        self.assertEqual(response["Cache-Control"], "no-store")
+
+        revalidated = await self.async_client.get(
+            "/api/secrets/?app=svc&env=prod", headers={**self.auth, "If-None-Match": response["ETag"]}
+        )
+        self.assertEqual(revalidated.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_async_paths_require_a_valid_token(self):
+        for url in ("/api/secrets/?app=svc&env=prod", "/api/auth/whoami/"):
+            response = await self.async_client.get(url, headers={"AUTHORIZATION": "Bearer nope"})
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+            self.assertEqual(response["WWW-Authenticate"], 'Bearer realm="api"')
+
+    async def test_async_whoami(self):
+        response = await self.async_client.get("/api/auth/whoami/", headers=self.auth)
+
+        self.assertEqual(
+            response.json(), {"id": self.owner.id, "username": "async-owner", "email": "a@example.com"}
+        )
+
+    def test_wsgi_urlconf_keeps_sync_views(self):
+        for url in ("/api/secrets/", "/api/whoami/", "/api/healthz/"):
+            with self.subTest(url=url):
+                self.assertFalse(iscoroutinefunction(resolve(url, "gestionnaire_mdp.urls").func))
+                self.assertTrue(iscoroutinefunction(resolve(url).func))
+
+    def test_other_secret_operations_still_go_through_drf(self):
+        self.client.force_authenticate(user=self.owner)
+
+        self.assertEqual(len(self.client.get("/api/secrets/").json()), 1)
+        self.assertEqual(
+            self.client.delete("/api/secrets/?app=svc&env=prod").status_code, status.HTTP_204_NO_CONTENT
+        )
+
+
+class MetricsEndpointTests(APITestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(username="metrics-owner", password="owner-pass")
+        request_metrics.reset()
+        readiness_probe.reset()
+
+    def metrics(self, **extra):
+        response = self.client.get("/api/metrics/", **extra)
+        return response, response.content.decode()
+
+    def test_requests_are_counted_per_resolved_route(self):
+        self.client.force_authenticate(user=self.owner)
+        self.client.get("/api/passwords/")
+        self.client.get("/api/passwords/")
+        self.client.get("/api/does-not-exist/")
+
+        response, body = self.metrics()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        self.assertIn('route="password-list",method="GET",status="200"} 2', body)
+        self.assertIn('route="unmatched",method="GET",status="404"} 1', body)
+        self.assertIn('http_request_duration_seconds_bucket{', body)
+        self.assertIn('route="password-list",method="GET",le="+Inf"} 2', body)
+        self.assertIn('http_request_db_queries_total{', body)
+        self.assertIn('vault_cache_hit_ratio{', body)
+        self.assertIn('db_connections_open{', body)
+        db_line = next(line for line in body.splitlines()
+                       if line.startswith("http_request_db_queries_total{") and 'route="password-list"' in line)
+        self.assertGreater(int(db_line.rsplit(" ", 1)[1]), 0)
+
+    def test_access_requires_allowed_network_or_token(self):
+        with self.settings(METRICS_ALLOWED_NETWORKS=[], METRICS_TOKEN="scrape-token"):
+            self.assertEqual(self.metrics()[0].status_code, status.HTTP_403_FORBIDDEN)
+            self.assertEqual(
+                self.metrics(HTTP_AUTHORIZATION="Bearer wrong")[0].status_code, status.HTTP_403_FORBIDDEN
+            )
+            self.assertEqual(
+                self.metrics(HTTP_AUTHORIZATION="Bearer scrape-token")[0].status_code, status.HTTP_200_OK
+            )
+
+    def test_readiness_round_trip_is_cached(self):
+        with self.settings(READINESS_CACHE_SECONDS=60):
+            with self.assertNumQueries(1):
+                first = self.client.get("/api/readyz/")
+            with self.assertNumQueries(0):
+                second = self.client.get("/api/readyz/")
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.json(), {"status": "ready"})
+
+
+class ProfilingMiddlewareTests(APITestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(username="profiled-owner", password="owner-pass")
+        self.client.force_authenticate(user=self.owner)
+        SecretBundle.objects.create(owner=self.owner, app="profiled-app", environment="prod", payload={"k": "v"})
+        caches["secrets"].clear()
+
+    def test_server_timing_reports_query_count_and_phases(self):
+        with self.settings(PROFILING_SERVER_TIMING=True), CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/passwords/")
+
+        timing = response["Server-Timing"]
+        self.assertIn(f'desc="{len(queries)} queries"', timing)
+        self.assertRegex(timing, r"^db;dur=[0-9.]+;desc=\"\d+ queries\", serialize;dur=[0-9.]+, total;dur=[0-9.]+$")
+
+    def test_server_timing_can_be_disabled(self):
+        with self.settings(PROFILING_SERVER_TIMING=False):
+            response = self.client.get("/api/passwords/")
+
+        self.assertFalse(response.has_header("Server-Timing"))
+
+    def test_slow_queries_are_logged_without_parameters(self):
+        with self.settings(SLOW_QUERY_MS=0), self.assertLogs("gestionnaire_mdp.profiling", "WARNING") as logs:
+            self.client.get("/api/secrets/?app=profiled-app&env=prod")
+
+        output = "\n".join(logs.output)
+        self.assertIn("slow query", output)
+        self.assertIn("redacted", output)
+        self.assertNotIn("profiled-app", output)
+
+    def test_requests_over_query_threshold_are_logged(self):
+        with self.settings(SLOW_REQUEST_QUERIES=1), self.assertLogs("gestionnaire_mdp.profiling", "WARNING") as logs:
+            self.client.get("/api/passwords/")
+
+        self.assertTrue(any("slow request GET /api/passwords/ route=password-list" in line for line in logs.output))
+
+
+class SeedCommandTests(APITestCase):
+    def seed(self, *args):
+        call_command("seed_vault", "--users", "2", "--categories", "3", "--entries", "4", "--secrets", "2",
+                     *args, stdout=StringIO())
+        return get_user_model().objects.filter(username__startswith="seed").order_by("username")
+
+    def test_seed_vault_creates_requested_rows(self):
+        users = self.seed()
+
+        self.assertEqual(len(users), 2)
+        self.assertEqual(Category.objects.filter(owner__in=users).count(), 6)
+        self.assertEqual(PasswordEntry.objects.filter(owner__in=users).count(), 8)
+        bundle = SecretBundle.objects.filter(owner=users[0]).first()
+        self.assertEqual(bundle.content_hash, payload_hash(bundle.payload))
+        self.assertEqual(get_vault_version(users[0].id), 1)
+        self.assertTrue(set(PasswordEntry.objects.filter(owner__in=users).first().ciphertext) >= {"iv", "data"})
+
+    def test_seed_vault_is_deterministic(self):
+        def snapshot(users):
+            return list(
+                PasswordEntry.objects.filter(owner__in=users)
+                .order_by("owner__username", "title")
+                .values_list("title", "url", "ciphertext")
+            )
+
+        first = snapshot(self.seed("--seed", "3", "--batch-size", "7"))
+        get_user_model().objects.filter(username__startswith="seed").delete()
+        second = snapshot(self.seed("--seed", "3", "--batch-size", "1000"))
+
+        self.assertEqual(first, second)
+
+    def test_seed_categories_inserts_missing_rows_at_once(self):
+        owner = get_user_model().objects.create_superuser(username="seed-admin", password="admin-pass")
+        Category.objects.create(owner=owner, name="Documents")
+        version = get_vault_version(owner.id)
+
+        with CaptureQueriesContext(connection) as queries:
+            call_command("seed_categories", stdout=StringIO())
+
+        inserts = [query for query in queries if query["sql"].startswith('INSERT INTO "api_category"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(Category.objects.filter(owner=owner).count(), 14)
+        self.assertGreater(get_vault_version(owner.id), version)
+
+
+class VaultExportTests(APITestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(username="export-owner", password="owner-pass")
+        other = user_model.objects.create_user(username="export-other", password="other-pass")
+        self.category = Category.objects.create(owner=self.owner, name="Web")
+        self.ciphertext = {"iv": "AAAAAAAAAAAAAAAA", "data": "c2VjcmV0"}
+        for index in range(3):
+            PasswordEntry.objects.create(
+                owner=self.owner, title=f"Site {index}", category=self.category, ciphertext=self.ciphertext
+            )
+        SecretBundle.objects.create(owner=self.owner, app="svc", environment="prod", payload={"data": "x"})
+        PasswordEntry.objects.create(owner=other, title="Not mine", ciphertext=self.ciphertext)
+        self.client.force_authenticate(user=self.owner)
+
+    def read_lines(self, response):
+        return [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+
+    def test_export_streams_owner_records_as_ndjson(self):
+        response = self.client.get("/api/passwords/export/", HTTP_ACCEPT="application/x-ndjson")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertIn("attachment;", response["Content-Disposition"])
+        records = self.read_lines(response)
+        self.assertEqual(records[0]["type"], "meta")
+        self.assertEqual(
+            [record["type"] for record in records[1:]], ["category", "password", "password", "password", "secret"]
+        )
+        passwords = [record for record in records if record["type"] == "password"]
+        self.assertEqual({record["title"] for record in passwords}, {"Site 0", "Site 1", "Site 2"})
+        self.assertEqual(passwords[0]["ciphertext"], self.ciphertext)
+        self.assertEqual(passwords[0]["category"], self.category.id)
+        self.assertEqual(records[-1]["payload"], {"data": "x"})
+
+    def test_export_is_compressed_on_the_fly(self):
+        response = self.client.get("/api/passwords/export/", HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        body = gzip.decompress(b"".join(response.streaming_content))
+        self.assertEqual(len(body.splitlines()), 6)
+
+    def test_export_emits_bounded_chunks(self):
+        chunks = list(stream_export(self.owner.id, chunk_size=2, buffer_bytes=1))
+
+        self.assertEqual(len(chunks), 6)
+        self.assertTrue(all(chunk.endswith(b"\n") and chunk.count(b"\n") == 1 for chunk in chunks))
+
+    def test_export_pages_by_key_without_server_side_cursors(self):
+        for app, environment in (("svc", "dev"), ("api", "prod")):
+            SecretBundle.objects.create(owner=self.owner, app=app, environment=environment, payload={"data": "y"})
+        expected = list(export_records(self.owner.id, chunk_size=2))[1:]
+
+        # DB_POOL_MODE=pgbouncer : pas de curseur serveur, pages LIMIT sur la clé de tri.
+        with mock.patch.dict(connection.settings_dict, {"DISABLE_SERVER_SIDE_CURSORS": True}):
+            with CaptureQueriesContext(connection) as queries:
+                records = list(export_records(self.owner.id, chunk_size=2))[1:]
+
+        self.assertEqual(records, expected)
+        self.assertEqual(
+            [(record["app"], record["environment"]) for record in records if record["type"] == "secret"],
+            [("api", "prod"), ("svc", "dev"), ("svc", "prod")],
+        )
+        # 1 page de catégories, 2 d'entrées, 2 de bundles.
+        self.assertEqual(len([q for q in queries if q["sql"].endswith("LIMIT 2")]), 5)
+
+    @override_settings(ROOT_URLCONF="gestionnaire_mdp.asgi_urls")
+    async def test_asgi_export_streams_an_async_iterator(self):
+        token = await sync_to_async(lambda: add_user_claims(VaultRefreshToken.for_user(self.owner), self.owner))()
+        response = await self.async_client.get(
+            "/api/passwords/export/", headers={"AUTHORIZATION": f"Bearer {token.access_token}"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.is_async)
+        body = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(body.splitlines()), 6)
+
+
+class VaultImportTests(APITestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(username="import-owner", password="owner-pass")
+        self.source = user_model.objects.create_user(username="import-source", password="source-pass")
+        self.ciphertext = {"iv": "AAAAAAAAAAAAAAAA", "data": "c2VjcmV0"}
+        self.client.force_authenticate(user=self.owner)
+
+    def post(self, body, query="", **extra):
+        return self.client.post(
+            f"/api/passwords/import/{query}", data=body, content_type="application/x-ndjson", **extra
+        )
+
+    def ndjson(self, *records):
+        return b"".join(json.dumps(record).encode() + b"\n" for record in records)
+
+    def test_export_of_another_vault_imports_with_category_mapping(self):
+        category = Category.objects.create(owner=self.source, name="Web")
+        for index in range(5):
+            PasswordEntry.objects.create(
+                owner=self.source, title=f"Site {index}", category=category, ciphertext=self.ciphertext
+            )
+        SecretBundle.objects.create(owner=self.source, app="svc", environment="prod", payload={"data": "x"})
+        exported = b"".join(stream_export(self.source.id))
+        version = get_vault_version(self.owner.id)
+
+        response = self.post(exported)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["imported"], {"category": 1, "password": 5, "secret": 1})
+        self.assertEqual(response.data["errors"], [])
+        mine = Category.objects.get(owner=self.owner, name="Web")
+        entries = PasswordEntry.objects.filter(owner=self.owner)
+        self.assertEqual({entry.category_id for entry in entries}, {mine.id})
+        self.assertEqual(entries.first().ciphertext, self.ciphertext)
+        self.assertEqual(SecretBundle.objects.get(owner=self.owner).payload, {"data": "x"})
+        self.assertGreater(get_vault_version(self.owner.id), version)
+
+    def test_invalid_lines_are_reported_without_stopping_the_import(self):
+        foreign = Category.objects.create(owner=self.source, name="Foreign")
+        body = self.ndjson(
+            {"title": "Good", "ciphertext": self.ciphertext},
+            {"title": "Foreign category", "category": foreign.id, "ciphertext": self.ciphertext},
+            {"title": "No ciphertext"},
+        ) + b"{not json\n" + self.ndjson({"type": "secret", "app": "svc", "env": "prod", "payload": []})
+
+        response = self.post(body)
+
+        self.assertEqual(response.data["imported"]["password"], 1)
+        self.assertEqual([error["line"] for error in response.data["errors"]], [2, 3, 4, 5])
+        self.assertIn("category", response.data["errors"][0]["errors"])
+        self.assertEqual(response.data["error_count"], 4)
+
+    def test_large_import_uses_batched_inserts(self):
+        body = self.ndjson(*({"title": f"Entry {index}", "ciphertext": self.ciphertext} for index in range(1200)))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post(body)
+
+        self.assertEqual(response.data["imported"]["password"], 1200)
+        inserts = [query for query in queries if query["sql"].startswith('INSERT INTO "api_passwordentry"')]
+        self.assertEqual(len(inserts), 3)
+
+    def test_interrupted_import_resumes_after_last_committed_batch(self):
+        body = self.ndjson(*({"title": f"Entry {index}", "ciphertext": self.ciphertext} for index in range(7)))
+
+        class BrokenStream(BytesIO):
+            def readline(self, size=-1):
+                line = super().readline(size)
+                if line.startswith(b'{"title": "Entry 5"'):
+                    raise OSError("connection reset")
+                return line
+
+        importer = VaultImport(self.owner, "backup-1", batch_size=2)
+        with self.assertRaises(OSError):
+            importer.run(BrokenStream(body))
+        self.assertEqual(importer.summary()["committed_through"], 4)
+        self.assertEqual(PasswordEntry.objects.filter(owner=self.owner).count(), 4)
+
+        response = self.post(body, "?import_id=backup-1")
+
+        self.assertEqual(response.data["skipped"], 4)
+        self.assertEqual(response.data["imported"]["password"], 3)
+        titles = sorted(PasswordEntry.objects.filter(owner=self.owner).values_list("title", flat=True))
+        self.assertEqual(titles, [f"Entry {index}" for index in range(7)])
+
+    def test_gzip_body_is_decompressed_while_reading(self):
+        body = gzip.compress(self.ndjson({"title": "Zipped", "ciphertext": self.ciphertext}))
+
+        response = self.post(body, HTTP_CONTENT_ENCODING="gzip")
+
+        self.assertEqual(response.data["imported"]["password"], 1)
+
+
+class PasswordSearchTests(APITestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(username="search-owner", password="owner-pass")
+        other = user_model.objects.create_user(username="search-other", password="other-pass")
+        ciphertext = {"iv": "AAAAAAAAAAAAAAAA", "data": "c2VjcmV0"}
+        for owner, title, url in (
+            (self.owner, "Gmail perso", "https://mail.google.com/"),
+            (self.owner, "Mail pro", "https://outlook.office.com"),
+            (self.owner, "Banque", "https://secure.mail-bank.example/login"),
+            (self.owner, "GitHub", "https://github.com/login"),
+            (self.owner, "GitHub Enterprise", "https://user@code.github.com:8443/"),
+            (self.owner, "Phishing", "https://evilgithub.com/"),
+            (self.owner, "Phishing 2", "https://github.com.evil.example/"),
+            (other, "Mail", "https://github.com/"),
+        ):
+            PasswordEntry.objects.create(owner=owner, title=title, url=url, ciphertext=ciphertext)
+        self.client.force_authenticate(user=self.owner)
+
+    def titles(self, response):
+        return [item["title"] for item in response.data["results"]]
+
+    def test_search_matches_title_or_url_ranked_title_first(self):
+        response = self.client.get("/api/passwords/", {"search": "mail"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.titles(response), ["Mail pro", "Gmail perso", "Banque"])
+        self.assertIsNone(response.data["next"])
+        self.assertIn("ETag", response)
+
+    def test_url_host_matches_host_and_subdomains_only(self):
+        response = self.client.get("/api/passwords/", {"url_host": "GitHub.com"})
+        self.assertEqual(self.titles(response), ["GitHub", "GitHub Enterprise"])
+
+        response = self.client.get("/api/passwords/", {"url_host": "https://github.com/settings"})
+        self.assertEqual(self.titles(response), ["GitHub", "GitHub Enterprise"])
+
+        response = self.client.get("/api/passwords/", {"url_host": "github.com", "search": "enterprise"})
+        self.assertEqual(self.titles(response), ["GitHub Enterprise"])
+
+    def test_cursor_pages_cover_every_result_once(self):
+        for params in ({"search": "i"}, {"url_host": "com"}):
+            expected = self.titles(self.client.get("/api/passwords/", params))
+            seen, url, query = [], "/api/passwords/", {**params, "limit": 2}
+            while url:
+                response = self.client.get(url, query)
+                self.assertLessEqual(len(response.data["results"]), 2)
+                seen += self.titles(response)
+                url, query = response.data["next"], None
+            self.assertEqual(seen, expected)
+            self.assertGreater(len(seen), 2)
+
+    def test_invalid_parameters_are_rejected(self):
+        self.assertEqual(
+            self.client.get("/api/passwords/", {"url_host": "git hub.com"}).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+        self.assertEqual(
+            self.client.get("/api/passwords/", {"search": "x" * 201}).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+        self.assertEqual(
+            self.client.get("/api/passwords/", {"search": "mail", "cursor": "bad"}).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+    def test_forged_cursor_is_rejected(self):
+        for params, values in (
+            ({"search": "mail"}, ["x", "y"]),
+            ({"search": "mail"}, [{}, 1]),
+            ({"search": "mail"}, [0.5, True]),
+            ({"url_host": "github.com"}, [1, 2]),
+            ({"url_host": "github.com"}, ["GitHub", "2"]),
+        ):
+            with self.subTest(params=params, values=values):
+                response = self.client.get("/api/passwords/", {**params, "cursor": encode_cursor(values)})
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_blank_search_keeps_the_plain_list(self):
+        response = self.client.get("/api/passwords/", {"search": "  "})
+
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), 7)
+
+
+class CategorySummaryTests(APITestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.owner = user_model.objects.create_user(username="summary-owner", password="owner-pass")
+        other = user_model.objects.create_user(username="summary-other", password="other-pass")
+        self.web = Category.objects.create(owner=self.owner, name="Web")
+        self.empty = Category.objects.create(owner=self.owner, name="Vide")
+        ciphertext = {"iv": "AAAAAAAAAAAAAAAA", "data": "c2VjcmV0"}
+        for title, category in (("A", self.web), ("B", self.web), ("C", None)):
+            PasswordEntry.objects.create(owner=self.owner, title=title, category=category, ciphertext=ciphertext)
+        PasswordEntry.objects.create(owner=other, title="X", ciphertext=ciphertext)
+        self.latest = PasswordEntry.objects.filter(owner=self.owner, category=self.web).order_by("-updated_at")[0]
+        self.client.force_authenticate(user=self.owner)
+
+    def test_counts_and_last_update_per_category_with_uncategorized_bucket(self):
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/categories/summary/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        by_name = {item["name"]: item for item in response.data["categories"]}
+        self.assertEqual(by_name["Web"]["entry_count"], 2)
+        self.assertEqual(datetime.fromisoformat(by_name["Web"]["last_updated"]), self.latest.updated_at)
+        self.assertEqual(by_name["Vide"], {
+            "id": self.empty.id, "name": "Vide", "description": "", "entry_count": 0, "last_updated": None,
+        })
+        self.assertEqual(response.data["uncategorized"]["entry_count"], 1)
+
+    def test_summary_follows_vault_etag(self):
+        etag = self.client.get("/api/categories/summary/")["ETag"]
+        self.assertEqual(
+            self.client.get("/api/categories/summary/", HTTP_IF_NONE_MATCH=etag).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+
+        PasswordEntry.objects.filter(owner=self.owner, category__isnull=True).get().delete()
+
+        response = self.client.get("/api/categories/summary/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["uncategorized"], {"entry_count": 0, "last_updated": None})
+
+
+class AdminChangelistTests(APITestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.admin = user_model.objects.create_superuser(username="admin-user", password="admin-pass")
+        self.owner = user_model.objects.create_user(username="admin-owner", password="owner-pass")
+        category = Category.objects.create(owner=self.owner, name="Web")
+        PasswordEntry.objects.bulk_create([
+            PasswordEntry(
+                owner=self.owner, title=f"Site {index}", category=category,
+                ciphertext={"iv": "AAAAAAAAAAAAAAAA", "data": "c2VjcmV0"},
+            )
+            for index in range(30)
+        ])
+        self.bundle = SecretBundle.objects.create(
+            owner=self.owner, app="billing", environment="prod", payload={"data": "opaque-payload"}
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE api_passwordentry")
+        self.client.force_login(self.admin)
+
+    def get(self, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, [query["sql"] for query in queries]
+
+    def test_changelist_joins_related_rows_and_never_reads_ciphertext(self):
+        response, queries = self.get("/admin/api/passwordentry/")
+
+        self.assertContains(response, "Site 29")
+        self.assertFalse([sql for sql in queries if "ciphertext" in sql])
+        # Propriétaires et catégories joints : pas de requête par ligne.
+        self.assertFalse([sql for sql in queries if 'FROM "api_category"' in sql])
+
+    def test_large_unfiltered_changelist_uses_estimated_count(self):
+        with self.settings(ADMIN_EXACT_COUNT_THRESHOLD=10):
+            response, queries = self.get("/admin/api/passwordentry/")
+        self.assertFalse([sql for sql in queries if "COUNT(*)" in sql])
+        self.assertContains(response, "30 password entrys")
+
+        with self.settings(ADMIN_EXACT_COUNT_THRESHOLD=10):
+            response, queries = self.get("/admin/api/passwordentry/", {"owner": self.owner.id})
+        # Liste filtrée : compte exact, sans second COUNT(*) de toute la table.
+        self.assertEqual(len([sql for sql in queries if "COUNT(*)" in sql]), 1)
+        self.assertContains(response, "30 password entrys")
+
+    def test_filter_by_owner_id_and_search_by_app_prefix(self):
+        other = get_user_model().objects.create_user(username="admin-other", password="other-pass")
+        PasswordEntry.objects.create(owner=other, title="Other", ciphertext={"iv": "AAAAAAAAAAAAAAAA", "data": "eA=="})
+
+        response, queries = self.get("/admin/api/passwordentry/", {"owner": self.owner.id})
+        self.assertContains(response, "30 password entrys")
+        self.assertContains(response, f'href="?owner={self.owner.id}"')
+        # Filtre sur la colonne owner_id, jamais sur une jointure auth_user.
+        self.assertFalse([sql for sql in queries if "COUNT(*)" in sql and "auth_user" in sql])
+
+        response, _ = self.get("/admin/api/passwordentry/", {"owner": other.id})
+        self.assertContains(response, "1 password entry")
+
+        response, queries = self.get("/admin/api/secretbundle/", {"q": "bill"})
+        self.assertContains(response, "billing")
+        self.assertFalse([sql for sql in queries if '"payload"' in sql])
+
+        response, _ = self.get("/admin/api/secretbundle/", {"q": "admin-owner"})
+        self.assertNotContains(response, "billing")
+
+    def test_change_forms_do_not_render_encrypted_columns(self):
+        entry = PasswordEntry.objects.filter(owner=self.owner).first()
+
+        response, queries = self.get(f"/admin/api/passwordentry/{entry.id}/change/")
+        self.assertNotContains(response, "c2VjcmV0")
+        self.assertFalse([sql for sql in queries if "ciphertext" in sql])
+
+        response, _ = self.get(f"/admin/api/secretbundle/{self.bundle.id}/change/")
+        self.assertNotContains(response, "opaque-payload")
+
+
+class SettingsValidationTests(SimpleTestCase):
+    def load_settings(self, **environ):
+        with mock.patch.dict(os.environ, environ):
+            return runpy.run_path(str(Path(settings.BASE_DIR) / "gestionnaire_mdp" / "settings.py"))
+
+    def test_invalid_db_pool_mode_is_a_configuration_error(self):
+        with self.assertRaisesMessage(ImproperlyConfigured, "DB_POOL_MODE invalide: pool"):
+            self.load_settings(DB_POOL_MODE="pool")
+
+    def test_invalid_app_server_is_a_configuration_error(self):
+        with self.assertRaisesMessage(ImproperlyConfigured, "APP_SERVER invalide: daphne"):
+            self.load_settings(APP_SERVER="daphne")
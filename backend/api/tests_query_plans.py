@@ -0,0 +1,186 @@
+"""
+Régressions de plans de requête et de nombre de requêtes par endpoint.
+
+Les plans sont obtenus avec enable_seqscan/enable_sort désactivés : un
+« Seq Scan » ou un « Sort » qui subsiste signifie qu'aucun index ne sert
+le filtre et l'ordre du queryset.
+"""
+import json
+import unittest
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
+
+from api.models import Category, PasswordEntry, SecretBundle
+from api.search import filter_url_host, search_entries, trigram_available
+from api.views import CategoryViewSet, PasswordViewSet, SecretsView
+
+FORBIDDEN_NODES = {"Seq Scan", "Sort", "Incremental Sort"}
+
+
+def seed_vault(owner, entries=300, categories=20, bundles=10):
+    cats = Category.objects.bulk_create(
+        [Category(owner=owner, name=f"cat-{i:03d}") for i in range(categories)]
+    )
+    PasswordEntry.objects.bulk_create(
+        [
+            PasswordEntry(
+                owner=owner,
+                title=f"entry-{i:05d}",
+                url=f"https://site-{i}.example.com",
+                category=cats[i % categories],
+                ciphertext={"iv": "aXY=", "salt": "c2FsdA==", "data": "ZGF0YQ==" * 16, "key": "a2V5"},
+            )
+            for i in range(entries)
+        ]
+    )
+    SecretBundle.objects.bulk_create(
+        [
+            SecretBundle(owner=owner, app=f"app-{i:02d}", environment=env, payload={"ciphertext": "Y3Q="})
+            for i in range(bundles)
+            for env in ("dev", "prod")
+        ]
+    )
+
+
+def plan_nodes(plan):
+    yield plan["Node Type"]
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+@unittest.skipUnless(connection.vendor == "postgresql", "EXPLAIN checks require PostgreSQL")
+class OwnerScopedQueryPlanTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user_model = get_user_model()
+        cls.owner = user_model.objects.create_user(username="plan-owner", password="owner-pass")
+        cls.other = user_model.objects.create_user(username="plan-other", password="other-pass")
+        seed_vault(cls.owner)
+        seed_vault(cls.other)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def viewset_queryset(self, viewset_class, action):
+        request = APIRequestFactory().get("/")
+        force_authenticate(request, user=self.owner)
+        view = viewset_class(action_map={"get": action}, kwargs={}, format_kwarg=None)
+        view.request = view.initialize_request(request)
+        return view.get_queryset()
+
+    def secrets_queryset(self):
+        view = SecretsView()
+        request = APIRequestFactory().get("/")
+        force_authenticate(request, user=self.owner)
+        view.request = view.initialize_request(request)
+        return view.get_queryset()
+
+    def assertIndexOnlyPlan(self, queryset):
+        with connection.cursor() as cursor:
+            cursor.execute("SET enable_seqscan = off")
+            cursor.execute("SET enable_sort = off")
+        try:
+            plan = json.loads(queryset.explain(format="json"))[0]["Plan"]
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute("RESET enable_seqscan")
+                cursor.execute("RESET enable_sort")
+        nodes = set(plan_nodes(plan))
+        self.assertFalse(nodes & FORBIDDEN_NODES, f"{queryset.query}\n{nodes}")
+
+    def test_password_querysets(self):
+        queryset = self.viewset_queryset(PasswordViewSet, "list")
+        entry = queryset.first()
+        category = Category.objects.filter(owner=self.owner).first()
+
+        self.assertIndexOnlyPlan(queryset)
+        self.assertIndexOnlyPlan(queryset.filter(pk=entry.pk))
+        self.assertIndexOnlyPlan(queryset.filter(category=category))
+        self.assertIndexOnlyPlan(queryset.order_by("updated_at"))
+
+    def test_search_querysets_use_trigram_indexes(self):
+        if not trigram_available():
+            self.skipTest("pg_trgm is not installed")
+        queryset = self.viewset_queryset(PasswordViewSet, "list")
+
+        for filtered, index in (
+            (search_entries(queryset, "entry-0004"), "pwd_title_trgm_idx"),
+            (filter_url_host(queryset, "site-42.example.com"), "pwd_url_trgm_idx"),
+        ):
+            with connection.cursor() as cursor:
+                cursor.execute("SET enable_seqscan = off")
+            try:
+                plan = filtered.explain(format="json")
+            finally:
+                with connection.cursor() as cursor:
+                    cursor.execute("RESET enable_seqscan")
+            self.assertIn(index, plan)
+
+    def test_category_querysets(self):
+        queryset = self.viewset_queryset(CategoryViewSet, "list")
+
+        self.assertIndexOnlyPlan(queryset)
+        self.assertIndexOnlyPlan(queryset.filter(pk=queryset.first().pk))
+
+    def test_secret_bundle_querysets(self):
+        queryset = self.secrets_queryset()
+
+        self.assertIndexOnlyPlan(queryset)
+        self.assertIndexOnlyPlan(queryset.filter(app="app-01", environment="prod"))
+
+
+class EndpointQueryCountTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user_model = get_user_model()
+        cls.owner = user_model.objects.create_user(username="count-owner", password="owner-pass")
+        seed_vault(cls.owner, entries=50, categories=5, bundles=3)
+        cls.category = Category.objects.filter(owner=cls.owner).first()
+        cls.entry = PasswordEntry.objects.filter(owner=cls.owner).first()
+        # Matérialise la version de voûte pour compter un UPDATE simple par écriture.
+        cls.entry.save()
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.owner)
+
+    def test_read_endpoints(self):
+        cases = [
+            ("/api/passwords/", 2),
+            (f"/api/passwords/{self.entry.id}/", 2),
+            ("/api/categories/", 2),
+            ("/api/categories/summary/", 2),
+            (f"/api/categories/{self.category.id}/", 2),
+            ("/api/secrets/", 1),
+            ("/api/secrets/?app=app-01&env=prod", 1),
+        ]
+        for url, expected in cases:
+            with self.subTest(url=url), self.assertNumQueries(expected):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_password_write_endpoints(self):
+        ciphertext = {"iv": "aXY=", "data": "ZGF0YQ=="}
+
+        # catégorie, INSERT, version.
+        with self.assertNumQueries(3):
+            response = self.client.post(
+                "/api/passwords/",
+                {"title": "new", "category": self.category.id, "ciphertext": ciphertext},
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        created_id = response.data["id"]
+
+        # entrée, catégorie, UPDATE, version.
+        with self.assertNumQueries(4):
+            response = self.client.patch(
+                f"/api/passwords/{created_id}/", {"category": self.category.id}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # entrée, DELETE, version.
+        with self.assertNumQueries(3):
+            response = self.client.delete(f"/api/passwords/{created_id}/")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,129 @@
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+from .admin import estimated_row_count
+
+
+class RevokedJTICache:
+    """
+    État de liste noire des JTI de refresh déjà vérifiés. Un JTI révoqué est
+    gardé jusqu'à l'expiration du jeton ; un JTI valide au plus
+    JWT_REVOCATION_CACHE_SECONDS : une révocation faite par un autre
+    processus est vue au plus tard après cette fenêtre (celle déjà admise
+    pour les versions de jetons), une révocation locale immédiatement.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, jti):
+        """True si révoqué, False si vérifié valide récemment, None si inconnu."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(jti)
+            if entry is not None and entry[1] > now:
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            return None
+
+    def add(self, jti, exp):
+        self._store(jti, True, exp)
+
+    def add_valid(self, jti, exp):
+        self._store(jti, False, min(exp, time.time() + settings.JWT_REVOCATION_CACHE_SECONDS))
+
+    def _store(self, jti, revoked, until):
+        now = time.time()
+        with self._lock:
+            if jti not in self._entries and len(self._entries) >= settings.JWT_REVOKED_JTI_CACHE_SIZE:
+                self._entries = {k: v for k, v in self._entries.items() if v[1] > now}
+                if len(self._entries) >= settings.JWT_REVOKED_JTI_CACHE_SIZE:
+                    self._entries.pop(next(iter(self._entries)))
+            self._entries[jti] = (revoked, until)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+revoked_jtis = RevokedJTICache()
+
+
+class VaultRefreshToken(RefreshToken):
+    """RefreshToken dont la vérification de liste noire passe d'abord par le cache des JTI."""
+
+    def check_blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+        revoked = revoked_jtis.lookup(jti)
+        if revoked:
+            raise TokenError(_("Token is blacklisted"))
+        if revoked is False:
+            return
+        try:
+            super().check_blacklist()
+        except TokenError:
+            revoked_jtis.add(jti, self.payload["exp"])
+            raise
+        revoked_jtis.add_valid(jti, self.payload["exp"])
+
+    def blacklist(self):
+        result = super().blacklist()
+        revoked_jtis.add(self.payload[api_settings.JTI_CLAIM], self.payload["exp"])
+        return result
+
+
+def purge_expired_tokens(batch_size=1000, now=None):
+    """
+    Supprime les jetons expirés (et leur entrée de liste noire) par lots
+    courts, chacun dans sa propre transaction. Le parcours suit la clé
+    primaire : les plus anciens jetons expirent en premier, donc chaque
+    lot s'arrête tôt sans index sur expires_at. Produit le nombre de
+    jetons supprimés par lot.
+    """
+    now = now or aware_utcnow()
+    while True:
+        with transaction.atomic():
+            ids = list(
+                OutstandingToken.objects.filter(expires_at__lte=now)
+                .order_by("id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                return
+            BlacklistedToken.objects.filter(token_id__in=ids).delete()
+            OutstandingToken.objects.filter(id__in=ids).delete()
+        yield len(ids)
+
+
+def blacklist_stats():
+    """Volumétrie des tables de jetons (lignes estimées et octets sur disque)."""
+    stats = {}
+    for model in (OutstandingToken, BlacklistedToken):
+        table = model._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_total_relation_size(%s)", [table])
+            size = cursor.fetchone()[0]
+        # Estimation du planificateur, pas de COUNT(*) sur une table qui grossit à chaque refresh.
+        rows = estimated_row_count(model)
+        stats[table] = {
+            "rows": model.objects.count() if rows is None else rows,
+            "rows_estimated": rows is not None,
+            "bytes": size,
+        }
+    stats["expired"] = OutstandingToken.objects.filter(expires_at__lte=aware_utcnow()).count()
+    stats["revoked_jti_cache"] = {"hits": revoked_jtis.hits, "misses": revoked_jtis.misses}
+    return stats
@@ -0,0 +1,106 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import TokenVersion
+
+TOKEN_VERSION_CLAIM = "tv"
+
+
+class RevocationCache:
+    """
+    Cache LRU en mémoire du processus : user_id -> (is_active, version).
+    Une désactivation ou une révocation faite ailleurs est vue au plus
+    tard après `JWT_REVOCATION_CACHE_SECONDS`.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def peek(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        return None
+
+    def put(self, user_id, state):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + settings.JWT_REVOCATION_CACHE_SECONDS, state)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > settings.JWT_REVOCATION_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+    def get(self, user_id, loader):
+        state = self.peek(user_id)
+        if state is None:
+            state = loader(user_id)
+            self.put(user_id, state)
+        return state
+
+    def evict(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+revocation_cache = RevocationCache()
+
+
+def get_token_version(user_id):
+    """Version courante des jetons (0 tant qu'aucune révocation n'a eu lieu)."""
+    version = (
+        TokenVersion.objects.filter(user_id=user_id)
+        .values_list("version", flat=True)
+        .first()
+    )
+    return version or 0
+
+
+def bump_token_version(user_id):
+    """Révoque tous les jetons émis pour l'utilisateur."""
+    if not TokenVersion.objects.filter(user_id=user_id).update(version=F("version") + 1):
+        try:
+            with transaction.atomic():
+                TokenVersion.objects.create(user_id=user_id, version=1)
+        except IntegrityError:
+            TokenVersion.objects.filter(user_id=user_id).update(version=F("version") + 1)
+    revocation_cache.evict(user_id)
+
+
+def _revocation_query(user_id):
+    return get_user_model().objects.filter(pk=user_id).values_list("is_active", "token_version__version")
+
+
+def _as_state(row):
+    if row is None:
+        return False, None
+    return row[0], row[1] or 0
+
+
+def revocation_state(user_id):
+    """(is_active, version) de l'utilisateur, depuis le cache du processus."""
+    return revocation_cache.get(user_id, lambda pk: _as_state(_revocation_query(pk).first()))
+
+
+async def arevocation_state(user_id):
+    state = revocation_cache.peek(user_id)
+    if state is None:
+        state = _as_state(await _revocation_query(user_id).afirst())
+        revocation_cache.put(user_id, state)
+    return state
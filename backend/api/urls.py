@@ -1,9 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from .views import CategoryViewSet, PasswordViewSet, SecretsView, healthz
+from .views import (
+    CategoryViewSet, PasswordViewSet, SecretsBatchView, SecretsView, ahealthz, asecrets_view, healthz
+)
 from .views_auth import JWTLogoutView, csrf, login_view, logout_view, whoami
-from api.views_jwt_whoami import jwt_whoami
+from api.views_jwt_whoami import ajwt_whoami, jwt_whoami
+from .views_metrics import metrics_view, readyz
 from rest_framework_simplejwt.views import (
     TokenObtainPairView, TokenRefreshView, TokenVerifyView
 )
@@ -14,34 +17,50 @@ router = DefaultRouter()
 router.register(r"categories", CategoryViewSet, basename="category")
 router.register(r"passwords",   PasswordViewSet, basename="password")
 
-urlpatterns = [
-    # ⚠️ pas de 'api/' ici : le préfixe est posé par le projet
-    path("", include(router.urls)),
-
-    # Santé
-    path("healthz/", healthz, name="api-healthz"),
-    path("secrets/", SecretsView.as_view(), name="api-secrets"),
-
-    # Auth (sessions legacy — conservé pour compat)
-    path("auth/session/csrf/",   csrf,        name="api-session-csrf"),
-    path("auth/session/login/",  login_view,  name="api-session-login"),
-    path("auth/session/logout/", logout_view, name="api-session-logout"),
-    path("auth/session/whoami/", whoami,      name="api-session-whoami"),
-
-    # Alias historiques de compat session (deprecies)
-    path("csrf/",   csrf,        name="api-csrf"),
-    path("login/",  login_view,  name="api-login"),
-    path("logout/", logout_view, name="api-logout"),
-
-    # Whoami (DRF + JWT)
-    path("whoami/", jwt_whoami, name="api-whoami"),
-
-    # SimpleJWT
-    path("auth/jwt/create/",  TokenObtainPairView.as_view(), name="jwt-create"),
-    path("auth/jwt/logout/",  JWTLogoutView.as_view(),        name="jwt-logout"),
-    path("auth/jwt/refresh/", TokenRefreshView.as_view(),    name="jwt-refresh"),
-    path("auth/jwt/verify/",  TokenVerifyView.as_view(),     name="jwt-verify"),
-
-    # Alias explicite sous /auth/
-    path("auth/whoami/", jwt_whoami, name="jwt-whoami"),
-]
+
+def api_urlpatterns(app_server):
+    # Lectures fréquentes (secret, whoami, santé) : vues async sous ASGI ; sous WSGI,
+    # vues sync/DRF, sans boucle d'événements ni saut de thread par requête.
+    if app_server == "asgi":
+        healthz_view, secrets_endpoint, whoami_view = ahealthz, asecrets_view, ajwt_whoami
+    else:
+        healthz_view, secrets_endpoint, whoami_view = healthz, SecretsView.as_view(), jwt_whoami
+
+    return [
+        # ⚠️ pas de 'api/' ici : le préfixe est posé par le projet
+        path("", include(router.urls)),
+
+        # Santé
+        path("healthz/", healthz_view, name="api-healthz"),
+        path("readyz/", readyz, name="api-readyz"),
+        path("metrics/", metrics_view, name="api-metrics"),
+        path("secrets/", secrets_endpoint, name="api-secrets"),
+        path("secrets/batch/", SecretsBatchView.as_view(), name="api-secrets-batch"),
+
+        # Auth (sessions legacy — conservé pour compat)
+        path("auth/session/csrf/",   csrf,        name="api-session-csrf"),
+        path("auth/session/login/",  login_view,  name="api-session-login"),
+        path("auth/session/logout/", logout_view, name="api-session-logout"),
+        path("auth/session/whoami/", whoami,      name="api-session-whoami"),
+
+        # Alias historiques de compat session (deprecies)
+        path("csrf/",   csrf,        name="api-csrf"),
+        path("login/",  login_view,  name="api-login"),
+        path("logout/", logout_view, name="api-logout"),
+
+        # Whoami (DRF + JWT)
+        path("whoami/", whoami_view, name="api-whoami"),
+
+        # SimpleJWT
+        path("auth/jwt/create/",  TokenObtainPairView.as_view(), name="jwt-create"),
+        path("auth/jwt/logout/",  JWTLogoutView.as_view(),        name="jwt-logout"),
+        path("auth/jwt/refresh/", TokenRefreshView.as_view(),    name="jwt-refresh"),
+        path("auth/jwt/verify/",  TokenVerifyView.as_view(),     name="jwt-verify"),
+
+        # Alias explicite sous /auth/
+        path("auth/whoami/", whoami_view, name="jwt-whoami"),
+    ]
+
+
+# URLconf WSGI ; sous APP_SERVER=asgi, ROOT_URLCONF pointe vers gestionnaire_mdp.asgi_urls.
+urlpatterns = api_urlpatterns("wsgi")
@@ -0,0 +1,200 @@
+"""
+Import NDJSON d'une voûte (format de api.export, ou lignes d'entrées nues
+venant d'un autre gestionnaire). Le flux est lu ligne à ligne ; les
+écritures partent par lots de taille fixe, chacun dans sa transaction
+avec le point de reprise de l'import : un import interrompu reprend
+après le dernier lot validé.
+"""
+import json
+
+from django.conf import settings
+from django.db import transaction
+
+from .export import EXPORT_FORMAT, EXPORT_VERSION
+from .models import Category, ImportCheckpoint, PasswordEntry
+from .renderers import orjson
+from .secrets_batch import parse_secret_items, upsert_secret_bundles
+from .serializers import PasswordBulkDataSerializer
+from .vault_version import bump_vault_version
+
+IMPORT_BATCH_SIZE = 500
+IMPORT_MAX_ERRORS = 1000
+IMPORT_TYPES = ("meta", "category", "password", "secret")
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def iter_lines(stream, max_bytes):
+    """(numéro, octets ou None si trop longue) ; une ligne trop longue n'est jamais gardée entière."""
+    number = 0
+    while True:
+        line = stream.readline(max_bytes + 1)
+        if not line:
+            return
+        number += 1
+        if len(line) > max_bytes and not line.endswith(b"\n"):
+            while line and not line.endswith(b"\n"):
+                line = stream.readline(max_bytes + 1)
+            yield number, None
+            continue
+        yield number, line
+
+
+class VaultImport:
+    def __init__(self, owner, import_id=None, resume_from=0, batch_size=IMPORT_BATCH_SIZE):
+        self.owner = owner
+        self.import_id = import_id
+        self.batch_size = batch_size
+        self.resume_from = resume_from
+        if import_id:
+            checkpoint = ImportCheckpoint.objects.filter(owner=owner, import_id=import_id).first()
+            if checkpoint is not None:
+                self.resume_from = max(self.resume_from, checkpoint.last_line)
+
+        # Catégories du propriétaire chargées une fois : id -> id, nom -> id.
+        self.owned_categories = {}
+        self.categories_by_name = {}
+        for pk, name in Category.objects.filter(owner=owner).values_list("id", "name"):
+            self.owned_categories[pk] = pk
+            self.categories_by_name[name] = pk
+        # id de catégorie dans le fichier importé -> id chez le propriétaire.
+        self.imported_categories = {}
+
+        self.pending_entries = []
+        self.pending_secrets = {}
+        self.last_line = self.resume_from
+        self.committed_line = self.resume_from
+        self.counts = {"category": 0, "password": 0, "secret": 0}
+        self.skipped = 0
+        self.errors = []
+        self.error_count = 0
+
+    def run(self, stream):
+        """Résumé de l'import ; une erreur de lecture du flux (OSError) laisse les lots validés en place."""
+        max_bytes = settings.SECRET_PAYLOAD_MAX_BYTES + 4096
+        for number, line in iter_lines(stream, max_bytes):
+            if line is None:
+                self.error(number, {"detail": [f"Line exceeds {max_bytes} bytes."]})
+            elif line.strip():
+                self.handle_line(number, line)
+            self.last_line = number
+            if len(self.pending_entries) + len(self.pending_secrets) >= self.batch_size:
+                self.flush()
+        self.flush(final=True)
+        return self.summary()
+
+    def handle_line(self, number, line):
+        try:
+            record = _loads(line)
+        except ValueError:
+            self.error(number, {"detail": ["Invalid JSON."]})
+            return
+        if not isinstance(record, dict):
+            self.error(number, {"detail": ["Each line must be a JSON object."]})
+            return
+        kind = record.pop("type", "password")
+        if kind not in IMPORT_TYPES:
+            self.error(number, {"type": [f"Must be one of: {', '.join(IMPORT_TYPES)}."]})
+            return
+        if kind == "meta":
+            version = record.get("version", EXPORT_VERSION)
+            if record.get("format", EXPORT_FORMAT) != EXPORT_FORMAT or version not in range(1, EXPORT_VERSION + 1):
+                self.error(number, {"format": ["Unsupported export format or version."]})
+            return
+        if kind == "category":
+            # Toujours rejouées (idempotentes) : une reprise a besoin de la table de correspondance.
+            self.handle_category(number, record)
+            return
+        if number <= self.resume_from:
+            self.skipped += 1
+            return
+        if kind == "password":
+            self.handle_password(number, record)
+        else:
+            self.handle_secret(number, record)
+
+    def handle_category(self, number, record):
+        name = str(record.get("name") or "").strip()
+        max_length = Category._meta.get_field("name").max_length
+        if not name or len(name) > max_length:
+            self.error(number, {"name": [f"Required, at most {max_length} characters."]})
+            return
+        pk = self.categories_by_name.get(name)
+        if pk is None:
+            category, created = Category.objects.get_or_create(
+                owner=self.owner, name=name, defaults={"description": str(record.get("description") or "")}
+            )
+            pk = category.pk
+            self.categories_by_name[name] = pk
+            self.owned_categories[pk] = pk
+            self.counts["category"] += int(created)
+        if isinstance(record.get("id"), int):
+            self.imported_categories[record["id"]] = pk
+
+    def handle_password(self, number, record):
+        category = record.get("category")
+        if category is not None:
+            # Référence du fichier importé d'abord, puis catégorie existante du propriétaire.
+            mapped = None
+            if isinstance(category, int) and not isinstance(category, bool):
+                mapped = self.imported_categories.get(category, self.owned_categories.get(category))
+            if mapped is None:
+                self.error(number, {"category": [f'Invalid pk "{category}" - object does not exist.']})
+                return
+            record["category"] = mapped
+        serializer = PasswordBulkDataSerializer(data=record)
+        if not serializer.is_valid():
+            self.error(number, serializer.errors)
+            return
+        data = serializer.validated_data
+        self.pending_entries.append(PasswordEntry(
+            owner=self.owner,
+            title=data["title"],
+            url=data.get("url", ""),
+            category_id=data.get("category"),
+            ciphertext=data["ciphertext"],
+        ))
+
+    def handle_secret(self, number, record):
+        bundles, errors = parse_secret_items([record])
+        if errors:
+            self.error(number, errors[0]["errors"])
+            return
+        app, env_name, payload = bundles[0]
+        # Un même couple deux fois dans le lot : la dernière ligne l'emporte.
+        self.pending_secrets[app, env_name] = payload
+
+    def flush(self, final=False):
+        if not (self.pending_entries or self.pending_secrets or (final and self.import_id)):
+            return
+        with transaction.atomic():
+            if self.pending_entries:
+                PasswordEntry.objects.bulk_create(self.pending_entries, batch_size=self.batch_size)
+                # bulk_create n'émet pas de signaux.
+                bump_vault_version(self.owner.id)
+            if self.pending_secrets:
+                bundles = [(app, env_name, payload) for (app, env_name), payload in self.pending_secrets.items()]
+                upsert_secret_bundles(self.owner.id, bundles)
+            if self.import_id:
+                ImportCheckpoint.objects.update_or_create(
+                    owner=self.owner, import_id=self.import_id, defaults={"last_line": self.last_line}
+                )
+        self.committed_line = self.last_line
+        self.counts["password"] += len(self.pending_entries)
+        self.counts["secret"] += len(self.pending_secrets)
+        self.pending_entries = []
+        self.pending_secrets = {}
+
+    def error(self, number, errors):
+        self.error_count += 1
+        if len(self.errors) < IMPORT_MAX_ERRORS:
+            self.errors.append({"line": number, "errors": errors})
+
+    def summary(self):
+        return {
+            "imported": self.counts,
+            "skipped": self.skipped,
+            "committed_through": self.committed_line,
+            "error_count": self.error_count,
+            "errors": self.errors,
+        }
@@ -0,0 +1,80 @@
+import hashlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils.http import parse_etags
+
+from .models import VaultVersion
+
+_pending_bumps = ContextVar("pending_vault_bumps", default=None)
+
+
+def get_vault_version(owner_id):
+    """Version courante de la voûte (0 tant qu'aucune écriture n'a été enregistrée)."""
+    version = (
+        VaultVersion.objects.filter(owner_id=owner_id)
+        .values_list("version", flat=True)
+        .first()
+    )
+    return version or 0
+
+
+def bump_vault_version(owner_id):
+    pending = _pending_bumps.get()
+    if pending is not None:
+        pending.add(owner_id)
+        return
+    if VaultVersion.objects.filter(owner_id=owner_id).update(version=F("version") + 1):
+        return
+    try:
+        with transaction.atomic():
+            VaultVersion.objects.create(owner_id=owner_id, version=1)
+    except IntegrityError:
+        # Créée entre-temps par une requête concurrente.
+        VaultVersion.objects.filter(owner_id=owner_id).update(version=F("version") + 1)
+
+
+@contextmanager
+def coalesced_vault_bumps():
+    """Regroupe les incréments d'un lot d'écritures en un seul par propriétaire."""
+    if _pending_bumps.get() is not None:
+        yield
+        return
+    pending = set()
+    token = _pending_bumps.set(pending)
+    try:
+        yield
+    finally:
+        _pending_bumps.reset(token)
+    for owner_id in pending:
+        bump_vault_version(owner_id)
+
+
+def vault_etag(request, version):
+    """
+    ETag fort : version de la voûte + empreinte de la représentation
+    (propriétaire, chemin complet, type négocié) pour ne jamais
+    confondre deux utilisateurs ou deux vues d'une même version.
+    """
+    representation = "|".join(
+        [
+            str(request.user.id),
+            request.get_full_path(),
+            getattr(request, "accepted_media_type", "") or "",
+        ]
+    )
+    digest = hashlib.blake2b(representation.encode(), digest_size=8).hexdigest()
+    return f'"v{version}-{digest}"'
+
+
+def etag_matches(request, etag):
+    header = request.META.get("HTTP_IF_NONE_MATCH")
+    if not header:
+        return False
+    # Comparaison faible pour If-None-Match (RFC 9110 §13.1.2).
+    return any(
+        candidate == "*" or candidate.removeprefix("W/") == etag
+        for candidate in parse_etags(header)
+    )
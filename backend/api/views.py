@@ -1,11 +1,43 @@
-from rest_framework import viewsets, permissions, status
+import gzip
+import zlib
+
+from rest_framework import viewsets, permissions, serializers, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
+from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
-from .models import Category, PasswordEntry, SecretBundle
+from .authentication import aauthenticate_request, unauthorized_response
+from .bulk import BULK_MAX_OPERATIONS, apply_password_bulk
+from .export import astream_export, stream_export
+from .models import Category, ImportCheckpoint, PasswordEntry, SecretBundle
+from .pagination import NUMBER, decode_cursor, next_page_url, parse_limit
+from .projection import get_projection
+from .payloads import opaque_object_error
+from .renderers import NDJSONRenderer, binary_parsers, binary_renderers
+from .search import filter_url_host, parse_search, parse_url_host, search_entries
+from .secrets_batch import (
+    SECRETS_BATCH_MAX,
+    fetch_secret_payloads,
+    parse_secret_items,
+    parse_secret_pairs,
+    upsert_secret_bundles,
+)
+from .secrets_cache import acache_secret, aget_cached_secret, cache_secret, get_cached_secret
 from .serializers import CategorySerializer, PasswordSerializer, SecretBundleSerializer
-from django.http import JsonResponse
+from .vault_import import VaultImport
+from .vault_version import etag_matches, get_vault_version, vault_etag
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Count, DateTimeField, Max, Q, TextField, Value
+from django.db.models.functions import Cast
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
 
 class IsOwner(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
@@ -13,7 +45,58 @@ class IsOwner(permissions.BasePermission):
     def has_permission(self, request, view):
         return request.user and request.user.is_authenticated
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class VaultETagMixin:
+    """
+    Lectures conditionnelles sur la version de voûte du propriétaire :
+    un If-None-Match valide renvoie 304 sans évaluer le queryset.
+    """
+    def list(self, request, *args, **kwargs):
+        return self._conditional(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(request, super().retrieve, *args, **kwargs)
+
+    def _conditional(self, request, handler, *args, **kwargs):
+        etag = vault_etag(request, get_vault_version(request.user.id))
+        if etag_matches(request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response["ETag"] = etag
+            response["Cache-Control"] = "private, no-cache"
+        return response
+
+class ProjectedReadMixin:
+    """
+    list/retrieve servis par values_list() + RowProjection : aucune instance
+    de modèle ni de serializer par ligne. Les écritures gardent le serializer.
+    """
+    def get_read_fields(self):
+        return None
+
+    def get_projection(self, fields=None):
+        fields = fields or self.get_read_fields()
+        binary = getattr(self.request.accepted_renderer, "binary_ciphertext", False)
+        return get_projection(self.get_serializer_class(), tuple(fields) if fields else None, binary)
+
+    def list(self, request, *args, **kwargs):
+        if self.paginator is not None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(self.get_projection().project(queryset))
+
+    def retrieve(self, request, *args, **kwargs):
+        # Le queryset est déjà restreint au propriétaire : IsOwner n'a rien à refuser ici.
+        projection = self.get_projection()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset())
+        row = get_object_or_404(
+            projection.rows(queryset), **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        return Response(projection.transform(row))
+
+class CategoryViewSet(VaultETagMixin, viewsets.ModelViewSet):
     serializer_class = CategorySerializer
     permission_classes = [IsOwner]
     def get_queryset(self):
@@ -21,54 +104,318 @@ class CategoryViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
 
-class PasswordViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=["get"], url_path="summary")
+    def summary(self, request):
+        return self._conditional(request, self._summary)
+
+    def _summary(self, request):
+        """Nombre d'entrées et dernière modification par catégorie, sans transférer la voûte."""
+        # Une seule requête : les entrées du propriétaire groupées par category_id (servies par
+        # pwd_owner_category_idx), NULL compris pour les entrées sans catégorie, plus en UNION ALL
+        # les catégories vides (anti-jointure sur l'index de category_id).
+        grouped = PasswordEntry.objects.filter(owner=request.user).values(
+            "category_id", "category__name", "category__description"
+        ).annotate(entry_count=Count("id"), last_updated=Max("updated_at")).order_by()
+        empty = self.get_queryset().filter(passwords__isnull=True).values("id", "name", "description").annotate(
+            entry_count=Value(0), last_updated=Value(None, output_field=DateTimeField())
+        ).order_by()
+        to_iso = serializers.DateTimeField().to_representation
+        categories, uncategorized = [], {"entry_count": 0, "last_updated": None}
+        for row in grouped.union(empty, all=True).order_by("category__name"):
+            bucket = {"entry_count": row["entry_count"], "last_updated": row["last_updated"]}
+            if bucket["last_updated"] is not None:
+                bucket["last_updated"] = to_iso(bucket["last_updated"])
+            if row["category_id"] is None:
+                uncategorized = bucket
+            else:
+                categories.append({
+                    "id": row["category_id"], "name": row["category__name"],
+                    "description": row["category__description"], **bucket,
+                })
+        return Response({"categories": categories, "uncategorized": uncategorized})
+
+class PasswordViewSet(VaultETagMixin, ProjectedReadMixin, viewsets.ModelViewSet):
     serializer_class = PasswordSerializer
     permission_classes = [IsOwner]
+    # JSON (base64) reste la représentation par défaut ; msgpack si demandé via Accept.
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + binary_renderers()
+    parser_classes = api_settings.DEFAULT_PARSER_CLASSES + binary_parsers()
+    batch_max_ids = 200
+    search_page_size = 50
+    search_max_page_size = 200
+
+    def list(self, request, *args, **kwargs):
+        term = parse_search(request.query_params.get("search"))
+        host = parse_url_host(request.query_params.get("url_host"))
+        if term is None and host is None:
+            return super().list(request, *args, **kwargs)
+        return self._conditional(request, self._search, term, host)
+
+    def _search(self, request, term, host):
+        """Page de résultats classés ; curseur keyset sur (rank, id) ou (title, id)."""
+        queryset = self.get_queryset()
+        if host is not None:
+            queryset = filter_url_host(queryset, host)
+        if term is not None:
+            queryset = search_entries(queryset, term)
+            keys, ordering = ("rank", "id"), ("-rank", "id")
+        else:
+            keys, ordering = ("title", "id"), ("title", "id")
+
+        limit = parse_limit(request, self.search_page_size, self.search_max_page_size)
+        cursor = request.query_params.get("cursor")
+        if cursor:
+            last_key, last_id = decode_cursor(cursor, (NUMBER if term is not None else str, int))
+            after = "lt" if ordering[0].startswith("-") else "gt"
+            queryset = queryset.filter(
+                Q(**{f"{keys[0]}__{after}": last_key}) | Q(**{keys[0]: last_key, "id__gt": last_id})
+            )
+
+        # Clés du curseur lues en fin de ligne : ignorées par la projection (zip sur ses champs).
+        projection = self.get_projection()
+        rows = list(queryset.order_by(*ordering).values_list(*projection.columns, *keys)[: limit + 1])
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+        transform = projection.transformer()
+        return Response({
+            "results": [transform(row) for row in rows],
+            "next": next_page_url(request, rows[-1][-len(keys):]) if has_next else None,
+        })
+
     def get_queryset(self):
-        return PasswordEntry.objects.filter(owner=self.request.user)
+        queryset = PasswordEntry.objects.filter(owner=self.request.user)
+        fields = self.requested_fields()
+        if fields is not None:
+            # owner reste chargé pour IsOwner.has_object_permission.
+            queryset = queryset.only("owner", *fields)
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.requested_fields()
+        if fields is not None:
+            kwargs["fields"] = fields
+        return super().get_serializer(*args, **kwargs)
+
+    def get_read_fields(self):
+        return self.requested_fields()
+
+    def requested_fields(self):
+        """Champs demandés via ?fields=a,b (lectures list/retrieve seulement), sinon None."""
+        if self.action not in ("list", "retrieve"):
+            return None
+        raw = self.request.query_params.get("fields")
+        if not raw:
+            return None
+        fields = {name.strip() for name in raw.split(",") if name.strip()}
+        unknown = fields - set(PasswordSerializer.Meta.fields)
+        if unknown:
+            raise ValidationError({"fields": [f"Unknown field(s): {', '.join(sorted(unknown))}."]})
+        return ["id", *sorted(fields - {"id"})]
+
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
 
+    @action(detail=False, methods=["get"], url_path="batch")
+    def batch(self, request):
+        raw = request.query_params.get("ids") or ""
+        try:
+            ids = {int(value) for value in raw.split(",") if value.strip()}
+        except ValueError:
+            return Response({"detail": "'ids' must be a comma-separated list of integers."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if not ids:
+            return Response({"detail": "'ids' is required."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > self.batch_max_ids:
+            return Response({"detail": f"At most {self.batch_max_ids} ids per request."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        return self._conditional(request, self._batch, ids)
+
+    def _batch(self, request, ids):
+        queryset = PasswordEntry.objects.filter(owner=request.user, id__in=ids).order_by("id")
+        projection = self.get_projection(fields=("id", "ciphertext", "updated_at"))
+        return Response(projection.project(queryset), status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"], url_path="export",
+            renderer_classes=[NDJSONRenderer, *api_settings.DEFAULT_RENDERER_CLASSES])
+    def export(self, request):
+        # Sous ASGI, itérateur async : un itérateur sync serait lu en entier avant l'envoi.
+        stream = astream_export if isinstance(request._request, ASGIRequest) else stream_export
+        response = StreamingHttpResponse(stream(request.user.id), content_type="application/x-ndjson")
+        stamp = timezone.now().strftime("%Y%m%d-%H%M%S")
+        response["Content-Disposition"] = f'attachment; filename="vault-{stamp}.ndjson"'
+        # Même politique que les listes : privé, compressible (pas de no-store).
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
+    @action(detail=False, methods=["post"], url_path="import")
+    def import_vault(self, request):
+        # Corps lu en flux (jamais request.data) : la taille de l'import ne pèse pas sur la mémoire.
+        stream = request.stream
+        if stream is None:
+            return Response({"detail": "Empty body."}, status=status.HTTP_400_BAD_REQUEST)
+        if request.headers.get("Content-Encoding", "").lower() == "gzip":
+            stream = gzip.GzipFile(fileobj=stream)
+        import_id = request.query_params.get("import_id") or None
+        if import_id is not None and len(import_id) > ImportCheckpoint._meta.get_field("import_id").max_length:
+            return Response({"detail": "'import_id' is too long."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            resume_from = int(request.query_params.get("resume_from", 0))
+        except ValueError:
+            return Response({"detail": "'resume_from' must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        importer = VaultImport(request.user, import_id, resume_from)
+        try:
+            summary = importer.run(stream)
+        except (OSError, EOFError, zlib.error):
+            # Corps tronqué ou gzip invalide : les lots déjà validés restent, reprise après committed_through.
+            return Response(
+                {"detail": "Unreadable request body.", **importer.summary()}, status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(summary, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        operations = request.data.get("operations") if isinstance(request.data, dict) else request.data
+        if not isinstance(operations, list) or not operations:
+            return Response(
+                {"detail": "'operations' must be a non-empty list."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(operations) > BULK_MAX_OPERATIONS:
+            return Response(
+                {"detail": f"At most {BULK_MAX_OPERATIONS} operations per batch."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        results, errors = apply_password_bulk(request.user, operations)
+        if errors:
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+
+def secret_not_modified(content_hash):
+    response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+    response["ETag"] = f'"{content_hash}"'
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+def secret_bundle_response(request, entry):
+    """Payload jsonb renvoyé tel quel, ETag = empreinte du contenu (partagé par les chemins sync et async)."""
+    content_hash, payload = entry
+    if etag_matches(request, f'"{content_hash}"'):
+        return secret_not_modified(content_hash)
+    response = HttpResponse(payload.encode(), content_type="application/json")
+    response["ETag"] = f'"{content_hash}"'
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+def secret_read_steps(request, owner_id, app, env_name):
+    """
+    Lecture d'un bundle (cache, revalidation If-None-Match, payload jsonb::text)
+    écrite une seule fois pour les chemins sync et async : chaque `yield` confie
+    une E/S (cache ou base) à run_secret_read / arun_secret_read, qui renvoient
+    son résultat. La valeur de retour est la réponse.
+    """
+    queryset = SecretBundle.objects.filter(owner_id=owner_id, app=app, environment=env_name)
+    key = (owner_id, app, env_name)
+    entry = yield ("cache_get", key)
+    if entry is None and request.headers.get("If-None-Match"):
+        # Revalidation : index-only scan sur content_hash, payload jamais lu.
+        content_hash = yield ("first", queryset.values_list("content_hash", flat=True))
+        if content_hash is not None and etag_matches(request, f'"{content_hash}"'):
+            return secret_not_modified(content_hash)
+    if entry is None:
+        # jsonb::text inséré tel quel : ni décodage psycopg, ni réencodage.
+        entry = yield ("first", queryset.values_list("content_hash", Cast("payload", output_field=TextField())))
+        if entry is not None:
+            yield ("cache_set", key, entry)
+    if entry is None:
+        return JsonResponse({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
+    return secret_bundle_response(request, entry)
+
+
+_SECRET_READ_IO = {
+    "cache_get": lambda key: get_cached_secret(*key),
+    "cache_set": lambda key, entry: cache_secret(*key, entry),
+    "first": lambda queryset: queryset.first(),
+}
+_ASECRET_READ_IO = {
+    "cache_get": lambda key: aget_cached_secret(*key),
+    "cache_set": lambda key, entry: acache_secret(*key, entry),
+    "first": lambda queryset: queryset.afirst(),
+}
+
+
+def run_secret_read(steps):
+    result = None
+    try:
+        while True:
+            operation, *args = steps.send(result)
+            result = _SECRET_READ_IO[operation](*args)
+    except StopIteration as done:
+        return done.value
+
+
+async def arun_secret_read(steps):
+    result = None
+    try:
+        while True:
+            operation, *args = steps.send(result)
+            result = await _ASECRET_READ_IO[operation](*args)
+    except StopIteration as done:
+        return done.value
+
 
 class SecretsView(APIView):
     permission_classes = [IsAuthenticated]
+    list_fields = ("id", "app", "environment", "created_at", "updated_at")
+    page_size = 100
+    max_page_size = 500
+
+    def get_queryset(self):
+        # (app, environment) est unique par propriétaire : pas besoin de départager par id,
+        # l'index unique (owner, app, environment) sert aussi l'ordre.
+        return SecretBundle.objects.filter(owner=self.request.user).order_by("app", "environment")
 
     def get(self, request):
         app = (request.query_params.get("app") or "").strip()
         env_name = (request.query_params.get("env") or "").strip()
 
         if app and env_name:
-            try:
-                bundle = SecretBundle.objects.get(
-                    owner=request.user,
-                    app=app,
-                    environment=env_name,
-                )
-            except SecretBundle.DoesNotExist:
-                return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
-
-            response = Response(bundle.payload, status=status.HTTP_200_OK)
-            response["Cache-Control"] = "no-store"
-            return response
-
-        queryset = SecretBundle.objects.filter(owner=request.user)
-        serializer = SecretBundleSerializer(queryset, many=True)
-
-        # Do not leak payload when listing all bundles.
-        items = [
-            {
-                "id": item["id"],
-                "app": item["app"],
-                "environment": item["environment"],
-                "created_at": item["created_at"],
-                "updated_at": item["updated_at"],
-            }
-            for item in serializer.data
-        ]
-        response = Response(items, status=status.HTTP_200_OK)
+            return self._get_bundle(request, app, env_name)
+
+        # Métadonnées seulement : le payload n'est jamais lu pour la liste.
+        queryset = self.get_queryset()
+        if app:
+            queryset = queryset.filter(app__startswith=app)
+        projection = get_projection(SecretBundleSerializer, self.list_fields)
+
+        if "cursor" in request.query_params or "limit" in request.query_params:
+            body = self._page(request, queryset, projection)
+        else:
+            body = projection.project(queryset)
+        response = Response(body, status=status.HTTP_200_OK)
         response["Cache-Control"] = "no-store"
         return response
 
+    def _get_bundle(self, request, app, env_name):
+        return run_secret_read(secret_read_steps(request, request.user.pk, app, env_name))
+
+    def _page(self, request, queryset, projection):
+        limit = parse_limit(request, self.page_size, self.max_page_size)
+        cursor = request.query_params.get("cursor")
+        if cursor:
+            last_app, last_env = decode_cursor(cursor, (str, str))
+            queryset = queryset.filter(Q(app__gt=last_app) | Q(app=last_app, environment__gt=last_env))
+        items = projection.project(queryset[: limit + 1])
+        has_next = len(items) > limit
+        items = items[:limit]
+        return {
+            "results": items,
+            "next": next_page_url(request, (items[-1]["app"], items[-1]["environment"])) if has_next else None,
+        }
+
     def post(self, request):
         app = str(request.data.get("app", "")).strip()
         env_name = str(request.data.get("env", request.data.get("environment", ""))).strip()
@@ -80,9 +427,10 @@ class SecretsView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        if not isinstance(payload, dict):
+        error = opaque_object_error(payload, settings.SECRET_PAYLOAD_MAX_BYTES)
+        if error:
             return Response(
-                {"detail": "'payload' must be a JSON object."},
+                {"detail": f"'payload' {error}"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
@@ -117,11 +465,7 @@ class SecretsView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        deleted, _ = SecretBundle.objects.filter(
-            owner=request.user,
-            app=app,
-            environment=env_name,
-        ).delete()
+        deleted, _ = self.get_queryset().filter(app=app, environment=env_name).delete()
 
         if not deleted:
             return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
@@ -131,5 +475,73 @@ class SecretsView(APIView):
         return response
 
 
+class SecretsBatchView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        raw_pairs = request.query_params.getlist("pair")
+        if not raw_pairs or len(raw_pairs) > SECRETS_BATCH_MAX:
+            return Response(
+                {"detail": f"Between 1 and {SECRETS_BATCH_MAX} 'pair' query params are required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        pairs, errors = parse_secret_pairs(raw_pairs)
+        if errors:
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        items, missing = fetch_secret_payloads(request.user.pk, pairs)
+        response = Response({"items": items, "missing": missing}, status=status.HTTP_200_OK)
+        response["Cache-Control"] = "no-store"
+        return response
+
+    def post(self, request):
+        items = request.data.get("items") if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list) or not items or len(items) > SECRETS_BATCH_MAX:
+            return Response(
+                {"detail": f"'items' must be a list of 1 to {SECRETS_BATCH_MAX} bundles."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        bundles, errors = parse_secret_items(items)
+        if errors:
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = Response({"stored": upsert_secret_bundles(request.user.pk, bundles)}, status=status.HTTP_200_OK)
+        response["Cache-Control"] = "no-store"
+        return response
+
+    def put(self, request):
+        return self.post(request)
+
+
+_sync_secrets_view = SecretsView.as_view()
+
+
+@csrf_exempt
+async def asecrets_view(request):
+    """
+    /api/secrets/ sous ASGI (voir api.urls) : lecture d'un bundle (`?app=&env=`)
+    avec ORM et cache async, aucun thread bloqué pendant l'aller-retour DB. Les
+    autres opérations passent par SecretsView (DRF, sync).
+    """
+    app = request.GET.get("app", "").strip()
+    env_name = request.GET.get("env", "").strip()
+    if request.method != "GET" or not (app and env_name):
+        return await sync_to_async(_sync_secrets_view)(request)
+
+    try:
+        auth = await aauthenticate_request(request)
+    except AuthenticationFailed as exc:
+        return unauthorized_response(exc)
+    if auth is None:
+        return unauthorized_response()
+    return await arun_secret_read(secret_read_steps(request, auth[0].pk, app, env_name))
+
+
 def healthz(_request):
     return JsonResponse({"status": "ok"})
+
+
+async def ahealthz(_request):
+    return JsonResponse({"status": "ok"})
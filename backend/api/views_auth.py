@@ -8,7 +8,9 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken, TokenError
+from rest_framework_simplejwt.tokens import TokenError
+
+from .token_blacklist import VaultRefreshToken
 
 
 def with_legacy_session_headers(response):
@@ -54,7 +56,7 @@ class JWTLogoutView(APIView):
             return Response({"detail": "'refresh' is required."}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            token = RefreshToken(refresh)
+            token = VaultRefreshToken(refresh)
             token.blacklist()
         except TokenError:
             return Response({"detail": "Invalid refresh token."}, status=status.HTTP_400_BAD_REQUEST)
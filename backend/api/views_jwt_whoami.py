@@ -1,11 +1,33 @@
-from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from django.contrib.auth import get_user_model
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .authentication import aauthenticate_request, unauthorized_response
+
 
 @api_view(["GET"])
-@authentication_classes([JWTAuthentication])
 @permission_classes([IsAuthenticated])
 def jwt_whoami(request):
     u = request.user
     return Response({"id": u.id, "username": u.username, "email": getattr(u, "email", None)})
+
+
+@require_GET
+async def ajwt_whoami(request):
+    # Vue async (ASGI) : l'utilisateur vient des claims, seul l'email est lu en base.
+    try:
+        auth = await aauthenticate_request(request)
+    except AuthenticationFailed as exc:
+        return unauthorized_response(exc)
+    if auth is None:
+        return unauthorized_response()
+
+    u = auth[0]
+    email = getattr(u, "email", None) if "email" not in u.get_deferred_fields() else (
+        await get_user_model().objects.filter(pk=u.pk).values_list("email", flat=True).afirst()
+    )
+    return JsonResponse({"id": u.id, "username": u.username, "email": email})
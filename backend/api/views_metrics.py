@@ -0,0 +1,121 @@
+import hmac
+import ipaddress
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.http import require_GET
+
+from gestionnaire_mdp.db_backend.base import connection_stats
+from gestionnaire_mdp.metrics import CONTENT_TYPE, PROCESS_START, default_exposition, export_request_metrics
+
+from .secrets_cache import secrets_cache_counters
+from .token_blacklist import revoked_jtis
+from .token_versions import revocation_cache
+
+
+def metrics_allowed(request):
+    """Jeton `Authorization: Bearer <METRICS_TOKEN>` ou pair direct dans METRICS_ALLOWED_NETWORKS."""
+    token = settings.METRICS_TOKEN
+    if token:
+        header = request.META.get("HTTP_AUTHORIZATION", "")
+        scheme, _, value = header.partition(" ")
+        if scheme.lower() == "bearer" and hmac.compare_digest(value.strip().encode(), token.encode()):
+            return True
+    # REMOTE_ADDR uniquement : X-Forwarded-For est falsifiable par le client.
+    try:
+        address = ipaddress.ip_address(request.META.get("REMOTE_ADDR", ""))
+    except ValueError:
+        return False
+    return any(address in network for network in settings.METRICS_ALLOWED_NETWORKS)
+
+
+def _cache_ratios(hits, misses):
+    total = hits + misses
+    return {"_hits_total": hits, "_misses_total": misses, "_hit_ratio": hits / total if total else 0.0}
+
+
+def render_metrics():
+    exposition = default_exposition()
+    exposition.family(
+        "process_start_time_seconds", "gauge", "Demarrage du worker (epoch).",
+        (("", {}, PROCESS_START),),
+    )
+    export_request_metrics(exposition)
+
+    secrets = secrets_cache_counters.snapshot()
+    caches = {
+        "secrets": _cache_ratios(secrets["hits"], secrets["misses"]),
+        "revoked_jti": _cache_ratios(revoked_jtis.hits, revoked_jtis.misses),
+        "jwt_revocation": _cache_ratios(revocation_cache.hits, revocation_cache.misses),
+    }
+    for suffix, kind, help_text in (
+        ("_hits_total", "counter", "Lectures servies par le cache."),
+        ("_misses_total", "counter", "Lectures absentes du cache."),
+        ("_hit_ratio", "gauge", "Part des lectures servies par le cache depuis le demarrage."),
+    ):
+        exposition.family(
+            f"vault_cache{suffix}", kind, help_text,
+            (("", {"cache": name}, values[suffix]) for name, values in caches.items()),
+        )
+
+    pool = connection_stats.snapshot()
+    for name, kind, help_text, value in (
+        ("db_connections_opened_total", "counter", "Connexions PostgreSQL ouvertes.", pool["opened"]),
+        ("db_connections_closed_total", "counter", "Connexions PostgreSQL fermees.", pool["closed"]),
+        ("db_connections_open", "gauge", "Connexions PostgreSQL ouvertes par ce worker.", pool["open"]),
+        ("db_connect_seconds_total", "counter", "Temps passe a etablir des connexions.", pool["connect_seconds"]),
+        ("db_health_check_failures_total", "counter", "Connexions persistantes rejetees au health check.",
+         pool["health_check_failures"]),
+    ):
+        exposition.family(name, kind, help_text, (("", {}, value),))
+    return exposition.render()
+
+
+@require_GET
+def metrics_view(request):
+    if not metrics_allowed(request):
+        return JsonResponse({"detail": "Forbidden."}, status=403)
+    response = HttpResponse(render_metrics(), content_type=CONTENT_TYPE)
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+class ReadinessProbe:
+    """Aller-retour base mis en cache READINESS_CACHE_SECONDS : une sonde fréquente ne charge pas PostgreSQL."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._expires = 0.0
+        self._ready = False
+
+    def check(self):
+        with self._lock:
+            if time.monotonic() < self._expires:
+                return self._ready
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                    cursor.fetchone()
+                ready = True
+            except DatabaseError:
+                ready = False
+            self._ready = ready
+            self._expires = time.monotonic() + settings.READINESS_CACHE_SECONDS
+            return ready
+
+    def reset(self):
+        with self._lock:
+            self._expires = 0.0
+
+
+readiness_probe = ReadinessProbe()
+
+
+@require_GET
+def readyz(_request):
+    if readiness_probe.check():
+        return JsonResponse({"status": "ready"})
+    return JsonResponse({"status": "unavailable"}, status=503)
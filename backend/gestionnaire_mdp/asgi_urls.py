@@ -0,0 +1,10 @@
+"""URLconf de APP_SERVER=asgi : même API, lectures chaudes servies par les vues async."""
+from django.contrib import admin
+from django.urls import path, include
+
+from api.urls import api_urlpatterns, app_name
+
+urlpatterns = [
+    path('admin/', admin.site.urls),
+    path('api/', include((api_urlpatterns("asgi"), app_name))),
+]
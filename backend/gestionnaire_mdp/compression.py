@@ -0,0 +1,132 @@
+"""
+Codecs de compression HTTP : gzip toujours, brotli et zstd si les paquets
+optionnels `brotli` / `zstandard` sont installés.
+"""
+import gzip
+import zlib
+
+try:
+    import brotli
+except ImportError:  # dépendance optionnelle
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # dépendance optionnelle
+    zstandard = None
+
+
+class _StreamCompressor:
+    """Compression incrémentale : chaque morceau est vidé pour partir immédiatement."""
+
+    def __init__(self, compress, finish):
+        self.compress = compress
+        self.finish = finish
+
+
+def compress_stream(codec, chunks):
+    compressor = codec.compressobj()
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def acompress_stream(codec, chunks):
+    compressor = codec.compressobj()
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class GzipCodec:
+    name = "gzip"
+
+    def __init__(self, level=6):
+        self.level = level
+
+    def compress(self, data):
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    def compressobj(self):
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return _StreamCompressor(
+            lambda chunk: compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH),
+            compressor.flush,
+        )
+
+
+class BrotliCodec:
+    name = "br"
+
+    def __init__(self, quality=4):
+        self.quality = quality
+
+    def compress(self, data):
+        return brotli.compress(data, quality=self.quality)
+
+    def compressobj(self):
+        compressor = brotli.Compressor(quality=self.quality)
+        return _StreamCompressor(
+            lambda chunk: compressor.process(chunk) + compressor.flush(),
+            compressor.finish,
+        )
+
+
+class ZstdCodec:
+    name = "zstd"
+
+    def __init__(self, level=3):
+        self.level = level
+
+    def compress(self, data):
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def compressobj(self):
+        compressor = zstandard.ZstdCompressor(level=self.level).compressobj()
+        return _StreamCompressor(
+            lambda chunk: compressor.compress(chunk) + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+            compressor.flush,
+        )
+
+
+def available_codecs():
+    """Codecs disponibles, par ordre de préférence serveur."""
+    codecs = []
+    if zstandard is not None:
+        codecs.append(ZstdCodec())
+    if brotli is not None:
+        codecs.append(BrotliCodec())
+    codecs.append(GzipCodec())
+    return codecs
+
+
+def parse_accept_encoding(header):
+    """{'gzip': 1.0, 'br': 0.5, '*': 0.0, ...} depuis un en-tête Accept-Encoding."""
+    weights = {}
+    for part in (header or "").split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[token] = quality
+    return weights
+
+
+def negotiate(header, codecs):
+    weights = parse_accept_encoding(header)
+    wildcard = weights.get("*", 0.0)
+    for codec in codecs:
+        if weights.get(codec.name, wildcard) > 0:
+            return codec
+    return None
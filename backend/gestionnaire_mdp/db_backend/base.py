@@ -0,0 +1,75 @@
+"""
+Backend PostgreSQL de Django instrumenté : compte les ouvertures et
+fermetures de connexions, le temps d'établissement (l'attente réelle
+d'une requête sans connexion réutilisable) et les échecs de health check,
+ainsi que le nombre et la durée des requêtes SQL (voir profiling).
+"""
+import threading
+import time
+
+from django.db.backends.postgresql import base
+
+from ..profiling import record_query
+
+
+class ConnectionStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.opened = 0
+            self.closed = 0
+            self.connect_seconds = 0.0
+            self.health_check_failures = 0
+
+    def record_open(self, seconds):
+        with self._lock:
+            self.opened += 1
+            self.connect_seconds += seconds
+
+    def record_close(self):
+        with self._lock:
+            self.closed += 1
+
+    def record_health_check_failure(self):
+        with self._lock:
+            self.health_check_failures += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "opened": self.opened,
+                "closed": self.closed,
+                "open": self.opened - self.closed,
+                "connect_seconds": self.connect_seconds,
+                "connect_avg_ms": self.connect_seconds * 1000 / self.opened if self.opened else 0.0,
+                "health_check_failures": self.health_check_failures,
+            }
+
+
+connection_stats = ConnectionStats()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.execute_wrappers.append(record_query)
+
+    def get_new_connection(self, conn_params):
+        start = time.perf_counter()
+        connection = super().get_new_connection(conn_params)
+        connection_stats.record_open(time.perf_counter() - start)
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            connection_stats.record_close()
+        return super()._close()
+
+    def is_usable(self):
+        usable = super().is_usable()
+        if not usable:
+            connection_stats.record_health_check_failure()
+        return usable
@@ -0,0 +1,133 @@
+"""
+Métriques du processus au format texte Prometheus (0.0.4), sans dépendance.
+
+Les compteurs sont propres à chaque worker gunicorn : chaque série porte
+un label `worker` (pid) et les agrégations se font côté Prometheus
+(`sum by (route) (rate(...))`).
+"""
+import os
+import threading
+import time
+
+# Bornes (secondes) des histogrammes de latence.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+PROCESS_START = time.time()
+
+
+class RequestMetrics:
+    """Requêtes HTTP par route résolue (nom d'URL) : statuts, latences, requêtes SQL."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._statuses = {}    # (route, method, status) -> nombre
+            self._latencies = {}   # (route, method) -> [compteurs par borne..., +Inf, somme]
+            self._queries = {}     # route -> [requêtes SQL, secondes SQL]
+
+    def observe(self, route, method, status, seconds, queries=0, db_seconds=0.0):
+        with self._lock:
+            key = (route, method, status)
+            self._statuses[key] = self._statuses.get(key, 0) + 1
+
+            histogram = self._latencies.get((route, method))
+            if histogram is None:
+                histogram = self._latencies[(route, method)] = [0] * (len(self.buckets) + 1) + [0.0]
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram[index] += 1
+                    break
+            else:
+                histogram[len(self.buckets)] += 1
+            histogram[-1] += seconds
+
+            db = self._queries.setdefault(route, [0, 0.0])
+            db[0] += queries
+            db[1] += db_seconds
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "statuses": dict(self._statuses),
+                "latencies": {key: list(value) for key, value in self._latencies.items()},
+                "queries": {key: list(value) for key, value in self._queries.items()},
+            }
+
+
+request_metrics = RequestMetrics()
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        if value == float("inf"):
+            return "+Inf"
+        return repr(value)
+    return str(value)
+
+
+class Exposition:
+    """Accumule des familles de métriques et produit le texte exposé."""
+
+    def __init__(self, **constant_labels):
+        self.constant_labels = constant_labels
+        self.lines = []
+
+    def family(self, name, kind, help_text, samples):
+        """`samples` : itérable de (suffixe, labels, valeur)."""
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+        for suffix, labels, value in samples:
+            labels = {**self.constant_labels, **labels}
+            rendered = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+            rendered = f"{{{rendered}}}" if rendered else ""
+            self.lines.append(f"{name}{suffix}{rendered} {_format_value(value)}")
+
+    def render(self):
+        return "\n".join(self.lines) + "\n"
+
+
+def export_request_metrics(exposition, metrics=request_metrics):
+    snapshot = metrics.snapshot()
+
+    exposition.family(
+        "http_requests_total", "counter", "Requetes HTTP traitees par route, methode et statut.",
+        (("", {"route": route, "method": method, "status": status}, count)
+         for (route, method, status), count in sorted(snapshot["statuses"].items())),
+    )
+
+    def histogram_samples():
+        for (route, method), histogram in sorted(snapshot["latencies"].items()):
+            labels = {"route": route, "method": method}
+            cumulative = 0
+            for bound, count in zip(metrics.buckets + (float("inf"),), histogram):
+                cumulative += count
+                yield "_bucket", {**labels, "le": _format_value(float(bound))}, cumulative
+            yield "_sum", labels, histogram[-1]
+            yield "_count", labels, cumulative
+
+    exposition.family(
+        "http_request_duration_seconds", "histogram", "Duree de traitement des requetes HTTP.",
+        histogram_samples(),
+    )
+    exposition.family(
+        "http_request_db_queries_total", "counter", "Requetes SQL executees pendant les requetes HTTP.",
+        (("", {"route": route}, db[0]) for route, db in sorted(snapshot["queries"].items())),
+    )
+    exposition.family(
+        "http_request_db_seconds_total", "counter", "Temps passe en SQL pendant les requetes HTTP.",
+        (("", {"route": route}, float(db[1])) for route, db in sorted(snapshot["queries"].items())),
+    )
+
+
+def default_exposition():
+    return Exposition(worker=os.getpid())
@@ -1,15 +1,147 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from .compression import acompress_stream, available_codecs, compress_stream, negotiate
+from .metrics import request_metrics
+from .profiling import current_profile, logger as profiling_logger, track_queries
+
+# Tous les middlewares du projet acceptent sync et async. WhiteNoise (sync) reste
+# tel quel : Django l'adapte sous ASGI.
 
-class DisableCSRFMiddleware:
+
+class ProfilingMiddleware:
     """
-    Désactive l'enforcement CSRF pour les endpoints /api/* en mode DEBUG.
-    N'affecte pas /admin/ ni le reste lorsque DEBUG=False (prod).
+    Profil de chaque requête : nombre et durée des requêtes SQL (execute
+    wrapper du backend), temps de rendu, durée totale.
+
+    - métriques par route résolue (nom d'URL, jamais le chemin brut :
+      cardinalité bornée) ;
+    - journal des requêtes au-delà de SLOW_REQUEST_MS ou SLOW_REQUEST_QUERIES
+      (et des requêtes SQL au-delà de SLOW_QUERY_MS, paramètres masqués) ;
+    - en-tête `Server-Timing` (db, serialize, total) si PROFILING_SERVER_TIMING.
     """
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        with track_queries() as profile:
+            response = self.get_response(request)
+        self.finish(request, response, time.perf_counter() - start, profile)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        with track_queries() as profile:
+            response = await self.get_response(request)
+        self.finish(request, response, time.perf_counter() - start, profile)
+        return response
+
+    def process_template_response(self, request, response):
+        # Dernier hook avant response.render() (middleware le plus externe) :
+        # le rendu DRF (JSON, msgpack) est mesuré jusqu'au callback post-rendu.
+        profile = current_profile()
+        if profile is not None:
+            start = time.perf_counter()
+
+            def rendered(_response):
+                profile.serialize_seconds += time.perf_counter() - start
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    @staticmethod
+    def finish(request, response, seconds, profile):
+        match = getattr(request, "resolver_match", None)
+        route = (match.url_name or match.view_name or "unnamed") if match else "unmatched"
+        request_metrics.observe(route, request.method, response.status_code, seconds, profile.count, profile.seconds)
+
+        if seconds * 1000 >= settings.SLOW_REQUEST_MS or profile.count >= settings.SLOW_REQUEST_QUERIES:
+            profiling_logger.warning(
+                "slow request %s %s route=%s status=%s total=%.1fms db=%.1fms queries=%d serialize=%.1fms",
+                request.method, request.path, route, response.status_code,
+                seconds * 1000, profile.seconds * 1000, profile.count, profile.serialize_seconds * 1000,
+            )
+
+        if settings.PROFILING_SERVER_TIMING:
+            response["Server-Timing"] = (
+                f'db;dur={profile.seconds * 1000:.2f};desc="{profile.count} queries", '
+                f"serialize;dur={profile.serialize_seconds * 1000:.2f}, "
+                f"total;dur={seconds * 1000:.2f}"
+            )
+
+
+class DisableCSRFMiddleware(MiddlewareMixin):
+    """
+    Désactive l'enforcement CSRF pour les endpoints /api/* en mode DEBUG.
+    N'affecte pas /admin/ ni le reste lorsque DEBUG=False (prod).
+    """
+
+    def process_request(self, request):
         if settings.DEBUG and request.path.startswith("/api/"):
             # Indique au CsrfViewMiddleware de ne pas vérifier ce request
             setattr(request, "_dont_enforce_csrf_checks", True)
-        return self.get_response(request)
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Content-Encoding négocié (zstd, br, gzip) pour les réponses JSON/texte.
+
+    - seuil minimal (RESPONSE_COMPRESSION_MIN_SIZE) pour les réponses non streamées ;
+    - jamais sur les réponses `Cache-Control: no-store` (secrets) : la taille
+      compressée pourrait révéler le contenu (BREACH) ;
+    - compression incrémentale des StreamingHttpResponse.
+    """
+    compressible_types = ("application/json", "text/", "application/javascript", "application/x-ndjson")
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.codecs = available_codecs()
+
+    def process_response(self, request, response):
+        if not getattr(settings, "RESPONSE_COMPRESSION_ENABLED", True):
+            return response
+        if response.has_header("Content-Encoding"):
+            return response
+        if not response.get("Content-Type", "").startswith(self.compressible_types):
+            return response
+        if "no-store" in response.get("Cache-Control", ""):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        codec = negotiate(request.META.get("HTTP_ACCEPT_ENCODING", ""), self.codecs)
+        if codec is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_stream(codec, response.streaming_content)
+            else:
+                response.streaming_content = compress_stream(codec, response.streaming_content)
+            del response["Content-Length"]
+        else:
+            if len(response.content) < getattr(settings, "RESPONSE_COMPRESSION_MIN_SIZE", 1024):
+                return response
+            compressed = codec.compress(response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+
+        # Représentation différente selon l'encodage : l'ETag devient faible (comme GZipMiddleware).
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response["Content-Encoding"] = codec.name
+        return response
@@ -0,0 +1,70 @@
+"""
+Profil de la requête HTTP en cours : requêtes SQL (nombre, durée),
+temps de rendu de la réponse. Alimenté par l'execute wrapper installé
+par le backend de base de données et par ProfilingMiddleware.
+"""
+import contextvars
+import logging
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+logger = logging.getLogger("gestionnaire_mdp.profiling")
+
+SQL_LOG_MAX_CHARS = 500
+
+
+class RequestProfile:
+    __slots__ = ("count", "seconds", "serialize_seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.serialize_seconds = 0.0
+
+
+# L'objet est partagé avec les threads de sync_to_async (copie du contexte),
+# donc alimenté aussi sous ASGI.
+_current_profile = contextvars.ContextVar("current_profile", default=None)
+
+
+def current_profile():
+    return _current_profile.get()
+
+
+@contextmanager
+def track_queries():
+    profile = RequestProfile()
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+
+
+def redacted_params(params, many):
+    # Jamais les valeurs : elles peuvent contenir du chiffré ou des identifiants.
+    if params is None:
+        return "none"
+    if many:
+        return f"<{len(params) if hasattr(params, '__len__') else '?'} rows redacted>"
+    return f"<{len(params)} redacted>"
+
+
+def record_query(execute, sql, params, many, context):
+    profile = _current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - start
+        profile.count += 1
+        profile.seconds += elapsed
+        if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+            logger.warning(
+                "slow query %.1fms: %s params=%s",
+                elapsed * 1000, str(sql)[:SQL_LOG_MAX_CHARS], redacted_params(params, many),
+            )
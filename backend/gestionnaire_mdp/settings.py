@@ -1,7 +1,10 @@
 # settings.py
+import ipaddress
 import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # ───────────────────────── Base ─────────────────────────
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -53,7 +56,9 @@ INSTALLED_APPS = [
 
 # ───────────────────────── Middleware ─────────────────────────
 MIDDLEWARE = [
+    "gestionnaire_mdp.middleware.ProfilingMiddleware",  # en tête : mesure toute la chaîne
     "django.middleware.security.SecurityMiddleware",
+    "gestionnaire_mdp.middleware.CompressionMiddleware",  # avant tout ce qui lit le corps
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "corsheaders.middleware.CorsMiddleware",            # CORS avant Session
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -66,9 +71,12 @@ MIDDLEWARE = [
 
 # (optionnel) désactiver CSRF en dépannage quand DEBUG et DISABLE_CSRF=true
 if DEBUG and str(env("DISABLE_CSRF", "false")).lower() in {"1", "true", "yes"}:
-    MIDDLEWARE.insert(3, "gestionnaire_mdp.middleware.DisableCSRFMiddleware")
+    MIDDLEWARE.insert(MIDDLEWARE.index("django.contrib.sessions.middleware.SessionMiddleware"),
+                      "gestionnaire_mdp.middleware.DisableCSRFMiddleware")
 
-ROOT_URLCONF = "gestionnaire_mdp.urls"
+# Compression des réponses (gzip ; br/zstd si brotli/zstandard installés)
+RESPONSE_COMPRESSION_ENABLED = str(env("RESPONSE_COMPRESSION_ENABLED", "true")).lower() in {"1", "true", "yes"}
+RESPONSE_COMPRESSION_MIN_SIZE = int(env("RESPONSE_COMPRESSION_MIN_SIZE", "1024"))
 
 TEMPLATES = [
     {
@@ -99,16 +107,84 @@ DB_NAME = env("POSTGRES_DB", required=True)
 DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 os.environ["DATABASE_URL"] = DATABASE_URL  # <— rendu dispo pour dj-database-url & co
 
+# Connexions : "persistent" (réutilisées par thread, vérifiées avant réemploi),
+# "pgbouncer" (idem, sans curseurs côté serveur pour le pooling transactionnel),
+# "none" (une connexion par requête, ancien comportement)
+DB_POOL_MODE = env("DB_POOL_MODE", "persistent")
+if DB_POOL_MODE not in ("persistent", "pgbouncer", "none"):
+    raise ImproperlyConfigured(f"DB_POOL_MODE invalide: {DB_POOL_MODE}")
+
+# Serveur applicatif : "wsgi" (gunicorn à threads, défaut) ou "asgi" (uvicorn).
+# Sous ASGI, l'ORM tourne dans un thread neuf par requête : une connexion
+# persistante y serait abandonnée à chaque requête, d'où CONN_MAX_AGE=0
+# (à coupler avec DB_POOL_MODE=pgbouncer).
+APP_SERVER = env("APP_SERVER", "wsgi")
+if APP_SERVER not in ("wsgi", "asgi"):
+    raise ImproperlyConfigured(f"APP_SERVER invalide: {APP_SERVER}")
+# Vues async (lectures chaudes) routées seulement sous ASGI : sous WSGI, chacune
+# paierait une boucle d'événements (async_to_sync) et des sauts de thread.
+ROOT_URLCONF = "gestionnaire_mdp.asgi_urls" if APP_SERVER == "asgi" else "gestionnaire_mdp.urls"
+
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        "ENGINE": "gestionnaire_mdp.db_backend",
         "NAME": DB_NAME,
         "USER": DB_USER,
         "PASSWORD": DB_PASS,
         "HOST": DB_HOST,
         "PORT": DB_PORT,
+        "CONN_MAX_AGE": (
+            0 if DB_POOL_MODE == "none" or APP_SERVER == "asgi" else int(env("DB_CONN_MAX_AGE", "60"))
+        ),
+        "CONN_HEALTH_CHECKS": DB_POOL_MODE != "none",
+        "DISABLE_SERVER_SIDE_CURSORS": DB_POOL_MODE == "pgbouncer",
+        "OPTIONS": {"connect_timeout": int(env("DB_CONNECT_TIMEOUT", "5"))},
     }
 }
+# ───────────────────────── Cache ─────────────────────────
+# Mémoire locale par défaut ; CACHE_REDIS_URL partage le cache des secrets entre workers.
+CACHE_REDIS_URL = env("CACHE_REDIS_URL", "")
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "secrets": (
+        {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": CACHE_REDIS_URL, "KEY_PREFIX": "mdp"}
+        if CACHE_REDIS_URL
+        else {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "secrets"}
+    ),
+}
+SECRETS_CACHE_ALIAS = "secrets"
+# Secondes ; 0 désactive le cache des bundles. Désactivé par défaut sans CACHE_REDIS_URL : une
+# écriture n'invalide que la mémoire locale du worker qui la traite, pas celle des autres.
+SECRETS_CACHE_TIMEOUT = int(env("SECRETS_CACHE_TIMEOUT", "300" if CACHE_REDIS_URL else "0"))
+
+# Métriques Prometheus (/api/metrics/) : jeton Bearer et/ou réseaux du pair direct
+METRICS_TOKEN = env("METRICS_TOKEN", "")
+METRICS_ALLOWED_NETWORKS = [
+    ipaddress.ip_network(net) for net in env_list("METRICS_ALLOWED_NETWORKS", "127.0.0.1/32,::1/128")
+]
+# Secondes de cache du résultat de /api/readyz/
+READINESS_CACHE_SECONDS = float(env("READINESS_CACHE_SECONDS", "2"))
+
+# Admin : au-delà de ce nombre de lignes, les changelists non filtrées affichent
+# l'estimation de pg_class au lieu d'un COUNT(*) exact
+ADMIN_EXACT_COUNT_THRESHOLD = int(env("ADMIN_EXACT_COUNT_THRESHOLD", "100000"))
+
+# Profilage des requêtes : seuils du journal "slow request" / "slow query"
+# (paramètres SQL jamais journalisés) et en-tête Server-Timing (db, serialize, total)
+SLOW_REQUEST_MS = float(env("SLOW_REQUEST_MS", "500"))
+SLOW_REQUEST_QUERIES = int(env("SLOW_REQUEST_QUERIES", "50"))
+SLOW_QUERY_MS = float(env("SLOW_QUERY_MS", "100"))
+PROFILING_SERVER_TIMING = str(env("PROFILING_SERVER_TIMING", "true" if DEBUG else "false")).lower() in {"1", "true", "yes"}
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "gestionnaire_mdp.profiling": {"handlers": ["console"], "level": "WARNING", "propagate": False},
+    },
+}
+
 # ───────────────────────── Debug: affiche la DB courante ─────────────────────────
 if DEBUG:
     safe_url = DATABASE_URL.replace(DB_PASS, "********") if DB_PASS else DATABASE_URL
@@ -117,18 +193,42 @@ if DEBUG:
 
 # ───────────────────────── DRF ─────────────────────────
 REST_FRAMEWORK = {
+    # "stateless" : utilisateur bâti sur les claims du JWT ; "db" : chargé à chaque requête
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.authentication.StatelessJWTAuthentication"
+        if env("JWT_AUTH_MODE", "stateless") == "stateless"
+        else "rest_framework_simplejwt.authentication.JWTAuthentication",
+    ],
+    # orjson si installé ; l'API navigable n'est servie qu'en DEV
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.FastJSONRenderer",
+    ] + (["rest_framework.renderers.BrowsableAPIRenderer"] if DEBUG else []),
+    "DEFAULT_PARSER_CLASSES": [
+        "api.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ],
 }
 
+# Tailles maximales des charges chiffrées opaques (validées sans être décodées)
+CIPHERTEXT_MAX_BYTES = int(env("CIPHERTEXT_MAX_BYTES", "65536"))
+SECRET_PAYLOAD_MAX_BYTES = int(env("SECRET_PAYLOAD_MAX_BYTES", "262144"))
+
 from datetime import timedelta
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=int(env("ACCESS_TOKEN_LIFETIME_MIN", "30"))),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=int(env("REFRESH_TOKEN_LIFETIME_DAYS", "7"))),
     "BLACKLIST_AFTER_ROTATION": True,
+    "TOKEN_OBTAIN_SERIALIZER": "api.authentication.VaultTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "api.authentication.VaultTokenRefreshSerializer",
 }
 
+# Fenêtre maximale pendant laquelle un jeton révoqué ou un compte désactivé reste accepté par un autre processus
+JWT_REVOCATION_CACHE_SECONDS = int(env("JWT_REVOCATION_CACHE_SECONDS", "30"))
+JWT_REVOCATION_CACHE_SIZE = int(env("JWT_REVOCATION_CACHE_SIZE", "10000"))
+# JTI de refresh déjà vérifiés (révoqués, ou valides pendant JWT_REVOCATION_CACHE_SECONDS ; purge : manage.py purge_token_blacklist)
+JWT_REVOKED_JTI_CACHE_SIZE = int(env("JWT_REVOKED_JTI_CACHE_SIZE", "10000"))
+
 
 # ───────────────────────── Statique / WhiteNoise ─────────────────────────
 STATIC_URL = "/static/"
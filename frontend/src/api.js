@@ -222,6 +222,12 @@ api.interceptors.response.use(
   }
 );
 
+// Aligne sur BULK_MAX_OPERATIONS cote backend (api/bulk.py).
+const BULK_MAX_OPERATIONS = 1000;
+// Aligne sur PasswordViewSet.batch_max_ids cote backend.
+const BATCH_MAX_IDS = 200;
+const PASSWORD_META_FIELDS = ["id", "title", "url", "category", "updated_at"];
+
 function unpackList(res) {
   const d = res?.data;
   if (Array.isArray(d)) return d;
@@ -238,6 +244,20 @@ api.passwords = {
     const res = await api.get("passwords/");
     return unpackList(res);
   },
+  async listMeta(fields = PASSWORD_META_FIELDS) {
+    const res = await api.get("passwords/", { params: { fields: fields.join(",") } });
+    return unpackList(res);
+  },
+  async batch(ids) {
+    const items = [];
+    for (let i = 0; i < ids.length; i += BATCH_MAX_IDS) {
+      const res = await api.get("passwords/batch/", {
+        params: { ids: ids.slice(i, i + BATCH_MAX_IDS).join(",") },
+      });
+      items.push(...unpackList(res));
+    }
+    return items;
+  },
   async get(id) {
     const res = await api.get(`passwords/${id}/`);
     return unpackItem(res);
@@ -258,6 +278,16 @@ api.passwords = {
     await api.delete(`passwords/${id}/`);
     return true;
   },
+  async bulk(operations) {
+    const results = [];
+    for (let i = 0; i < operations.length; i += BULK_MAX_OPERATIONS) {
+      const res = await api.post("passwords/bulk/", {
+        operations: operations.slice(i, i + BULK_MAX_OPERATIONS),
+      });
+      results.push(...(res?.data?.results || []));
+    }
+    return results;
+  },
 };
 
 api.categories = {
@@ -278,11 +308,18 @@ api.categories = {
     await api.delete(`categories/${id}/`);
     return true;
   },
+  // Comptes par categorie (+ entrees sans categorie) calcules cote serveur.
+  async summary() {
+    const res = await api.get("categories/summary/");
+    return res?.data || { categories: [], uncategorized: { entry_count: 0, last_updated: null } };
+  },
   async reassign(sourceId, targetId) {
-    const items = await api.passwords.list();
+    const items = await api.passwords.listMeta(["id", "category"]);
     const affected = items.filter((it) => String(it.category || "") === String(sourceId));
-    for (const it of affected) {
-      await api.passwords.patch(it.id, { category: targetId || null });
+    if (affected.length) {
+      await api.passwords.bulk(
+        affected.map((it) => ({ op: "patch", id: it.id, data: { category: targetId || null } }))
+      );
     }
     return { count: affected.length };
   },
@@ -32,18 +32,16 @@ export default function CategoryGuide(){
     try {
       setLoading(true);
       setErr(null);
-      const [c = [], p = []] = await Promise.all([
-        api?.categories?.list?.() ?? Promise.resolve([]),
-        api?.passwords?.list?.() ?? Promise.resolve([]),
-      ]);
+      // Catégories et comptes en une requête : la voûte n'est pas téléchargée.
+      const summary = await (api?.categories?.summary?.() ?? Promise.resolve({}));
+      const c = summary?.categories;
       const arr = Array.isArray(c) ? c.slice() : [];
       const collator = new Intl.Collator('fr', { sensitivity: 'accent', numeric: true });
       arr.sort((a,b) => collator.compare(a?.name || '', b?.name || ''));
       setCats(arr);
-      const u = {};
-      for (const it of (Array.isArray(p) ? p : [])) {
-        const cid = String(it?.category ?? '');
-        u[cid] = (u[cid] || 0) + 1;
+      const u = { '': summary?.uncategorized?.entry_count || 0 };
+      for (const it of arr) {
+        u[String(it?.id ?? '')] = it?.entry_count || 0;
       }
       setUsage(u);
     } catch (e) {
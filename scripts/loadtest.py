@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Test de charge HTTP de l'API (bibliothèque standard uniquement, hors ligne).
+
+Rejoue un mélange pondéré et reproductible (--seed) de scénarios contre un
+serveur local, avec N clients concurrents à connexion keep-alive, puis
+affiche débit et p50/p95/p99 par scénario. Les résultats sont enregistrés
+en JSON par commit pour comparaison :
+
+    python3 scripts/loadtest.py --base-url http://localhost:8002 --concurrency 16 --requests 5000
+    python3 scripts/loadtest.py --compare loadtest-results/abc1234.json loadtest-results/def5678.json
+
+Les données de test (entrées `loadtest-*`, secrets `loadtest-*`) sont créées
+via l'API au démarrage puis supprimées (sauf --keep).
+"""
+import argparse
+import base64
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.client import HTTPConnection, HTTPSConnection
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = ROOT / "loadtest-results"
+
+# Poids par défaut : lecture majoritaire, comme l'usage réel (extension + front).
+DEFAULT_MIX = {
+    "jwt-create": 1,
+    "jwt-refresh": 4,
+    "password-list": 10,
+    "password-list-light": 15,
+    "password-batch": 15,
+    "password-update": 10,
+    "secret-pull": 35,
+    "secret-push": 5,
+    "secret-list-page": 5,
+}
+
+PREFIX = "loadtest"
+# Seules requêtes rejouées après une coupure de connexion (sans effet côté serveur).
+RETRYABLE_METHODS = ("GET", "HEAD")
+
+
+def b64(rng, size):
+    return base64.b64encode(rng.randbytes(size)).decode()
+
+
+def fake_ciphertext(rng):
+    """Tailles proches de celles produites par frontend/src/utils/crypto.js."""
+    return {"iv": b64(rng, 12), "salt": b64(rng, 16), "key": b64(rng, 32), "data": b64(rng, 160)}
+
+
+def fake_secret_payload(rng):
+    return {"iv": b64(rng, 12), "data": b64(rng, 600)}
+
+
+def percentile(sorted_values, fraction):
+    """Rang le plus proche ; `sorted_values` déjà trié."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class ApiClient:
+    """Une connexion keep-alive par client (un client par thread)."""
+
+    def __init__(self, base_url, timeout=30):
+        parts = urlsplit(base_url)
+        connection_class = HTTPSConnection if parts.scheme == "https" else HTTPConnection
+        self.connection = connection_class(parts.netloc, timeout=timeout)
+        self.prefix = parts.path.rstrip("/")
+        self.access = None
+
+    def request(self, method, path, body=None, auth=True, query=None):
+        headers = {"Accept": "application/json", "Accept-Encoding": "identity"}
+        if auth and self.access:
+            headers["Authorization"] = f"Bearer {self.access}"
+        data = None
+        if body is not None:
+            data = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        url = self.prefix + path + (f"?{urlencode(query, doseq=True)}" if query else "")
+        try:
+            self.connection.request(method, url, body=data, headers=headers)
+            response = self.connection.getresponse()
+            content = response.read()
+        except OSError:
+            # Connexion keep-alive fermée par le serveur : une nouvelle tentative pour une lecture,
+            # puis erreur. Une écriture a pu être appliquée : comptée en erreur, jamais rejouée.
+            self.connection.close()
+            if method not in RETRYABLE_METHODS:
+                raise
+            self.connection.request(method, url, body=data, headers=headers)
+            response = self.connection.getresponse()
+            content = response.read()
+        if response.status >= 400:
+            raise HttpError(method, path, response.status, content[:200])
+        return json.loads(content) if content else None
+
+    def close(self):
+        self.connection.close()
+
+
+class HttpError(Exception):
+    def __init__(self, method, path, status, content):
+        super().__init__(f"{method} {path} -> {status}: {content!r}")
+        self.status = status
+
+
+class Fixture:
+    """Données créées pour le test, partagées en lecture par les clients."""
+
+    def __init__(self, client, args, rng):
+        self.username = args.username
+        self.password = args.password
+        credentials = {"username": args.username, "password": args.password}
+        tokens = client.request("POST", "/api/auth/jwt/create/", credentials, auth=False)
+        self.access, self.refresh = tokens["access"], tokens["refresh"]
+        client.access = self.access
+
+        operations = [
+            {"op": "create", "data": {
+                "title": f"{PREFIX}-{i:05d}",
+                "url": f"https://site-{i}.example.com/login",
+                "ciphertext": fake_ciphertext(rng),
+            }}
+            for i in range(args.entries)
+        ]
+        self.entry_ids = []
+        for start in range(0, len(operations), 500):
+            result = client.request("POST", "/api/passwords/bulk/", {"operations": operations[start:start + 500]})
+            self.entry_ids.extend(item["id"] for item in result["results"])
+
+        self.secrets = [(f"{PREFIX}-app-{i:04d}", "prod") for i in range(args.secrets)]
+        items = [{"app": app, "env": env_name, "payload": fake_secret_payload(rng)} for app, env_name in self.secrets]
+        for start in range(0, len(items), 100):
+            client.request("PUT", "/api/secrets/batch/", {"items": items[start:start + 100]})
+
+    def cleanup(self, client):
+        for start in range(0, len(self.entry_ids), 1000):
+            chunk = self.entry_ids[start:start + 1000]
+            operations = [{"op": "delete", "id": pk} for pk in chunk]
+            client.request("POST", "/api/passwords/bulk/", {"operations": operations})
+        for app, env_name in self.secrets:
+            client.request("DELETE", "/api/secrets/", query={"app": app, "env": env_name})
+
+
+def make_scenarios(fixture):
+    """Nom -> fonction(client, rng) ; chaque appel = une requête HTTP mesurée."""
+
+    def jwt_create(client, rng):
+        credentials = {"username": fixture.username, "password": fixture.password}
+        client.request("POST", "/api/auth/jwt/create/", credentials, auth=False)
+
+    def jwt_refresh(client, rng):
+        client.request("POST", "/api/auth/jwt/refresh/", {"refresh": fixture.refresh}, auth=False)
+
+    def password_list(client, rng):
+        client.request("GET", "/api/passwords/")
+
+    def password_list_light(client, rng):
+        client.request("GET", "/api/passwords/", query={"fields": "title,url,category"})
+
+    def password_batch(client, rng):
+        # Pas de pagination sur /passwords/ : lecture par pages d'ids, comme la synchro du front.
+        ids = rng.sample(fixture.entry_ids, min(50, len(fixture.entry_ids)))
+        client.request("GET", "/api/passwords/batch/", query={"ids": ",".join(map(str, ids))})
+
+    def password_update(client, rng):
+        pk = rng.choice(fixture.entry_ids)
+        client.request("PATCH", f"/api/passwords/{pk}/", {"ciphertext": fake_ciphertext(rng)})
+
+    def secret_pull(client, rng):
+        app, env_name = rng.choice(fixture.secrets)
+        client.request("GET", "/api/secrets/", query={"app": app, "env": env_name})
+
+    def secret_push(client, rng):
+        app, env_name = rng.choice(fixture.secrets)
+        client.request("PUT", "/api/secrets/", {"app": app, "env": env_name, "payload": fake_secret_payload(rng)})
+
+    def secret_list_page(client, rng):
+        client.request("GET", "/api/secrets/", query={"app": PREFIX, "limit": 50})
+
+    return {
+        "jwt-create": jwt_create,
+        "jwt-refresh": jwt_refresh,
+        "password-list": password_list,
+        "password-list-light": password_list_light,
+        "password-batch": password_batch,
+        "password-update": password_update,
+        "secret-pull": secret_pull,
+        "secret-push": secret_push,
+        "secret-list-page": secret_list_page,
+    }
+
+
+def parse_mix(raw):
+    mix = dict(DEFAULT_MIX)
+    if raw:
+        mix = {}
+        for item in raw.split(","):
+            name, _, weight = item.partition("=")
+            mix[name.strip()] = float(weight or 1)
+    unknown = set(mix) - set(DEFAULT_MIX)
+    if unknown:
+        raise SystemExit(f"Scenarios inconnus : {', '.join(sorted(unknown))} (connus : {', '.join(DEFAULT_MIX)})")
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+
+def run(args):
+    mix = parse_mix(args.mix)
+    rng = random.Random(args.seed)
+    setup_client = ApiClient(args.base_url)
+    fixture = Fixture(setup_client, args, rng)
+    scenarios = make_scenarios(fixture)
+
+    # Séquence fixée à l'avance : même mélange et même ordre pour une même graine.
+    names = list(mix)
+    plan = rng.choices(names, weights=[mix[name] for name in names], k=args.requests)
+    plan_lock = threading.Lock()
+    cursor = iter(enumerate(plan))
+    timings = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+    record_lock = threading.Lock()
+
+    def worker(worker_index):
+        client = ApiClient(args.base_url)
+        client.access = fixture.access
+        worker_rng = random.Random(f"{args.seed}-{worker_index}")
+        try:
+            while True:
+                with plan_lock:
+                    step = next(cursor, None)
+                if step is None:
+                    return
+                name = step[1]
+                start = time.perf_counter()
+                failed = False
+                try:
+                    scenarios[name](client, worker_rng)
+                except (HttpError, OSError, ValueError) as exc:
+                    failed = True
+                    if args.verbose:
+                        print(f"[{name}] {exc}", file=sys.stderr)
+                elapsed = time.perf_counter() - start
+                with record_lock:
+                    if failed:
+                        errors[name] += 1
+                    else:
+                        timings[name].append(elapsed)
+        finally:
+            client.close()
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(args.concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    if not args.keep:
+        setup_client.access = fixture.access
+        fixture.cleanup(setup_client)
+    setup_client.close()
+
+    return build_report(args, mix, timings, errors, wall)
+
+
+def summarize(values, failures, wall):
+    values = sorted(values)
+    return {
+        "requests": len(values),
+        "errors": failures,
+        "rps": len(values) / wall if wall else 0.0,
+        "p50_ms": percentile(values, 0.50) * 1000,
+        "p95_ms": percentile(values, 0.95) * 1000,
+        "p99_ms": percentile(values, 0.99) * 1000,
+        "max_ms": (values[-1] if values else 0.0) * 1000,
+    }
+
+
+def git_revision():
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{revision}-dirty" if dirty else revision
+
+
+def build_report(args, mix, timings, errors, wall):
+    all_values = [value for values in timings.values() for value in values]
+    return {
+        "meta": {
+            "revision": git_revision(),
+            "label": args.label,
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "base_url": args.base_url,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "seed": args.seed,
+            "entries": args.entries,
+            "secrets": args.secrets,
+            "mix": mix,
+            "wall_seconds": wall,
+        },
+        "total": summarize(all_values, sum(errors.values()), wall),
+        "scenarios": {name: summarize(timings[name], errors[name], wall) for name in sorted(timings)},
+    }
+
+
+def print_report(report):
+    meta = report["meta"]
+    print(f"revision {meta['revision']}  concurrence {meta['concurrency']}  "
+          f"{meta['requests']} requetes en {meta['wall_seconds']:.1f}s")
+    print(f"{'scenario':<22}{'req':>7}{'err':>6}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    rows = list(report["scenarios"].items()) + [("TOTAL", report["total"])]
+    for name, row in rows:
+        print(f"{name:<22}{row['requests']:>7}{row['errors']:>6}{row['rps']:>9.1f}"
+              f"{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}{row['max_ms']:>9.1f}")
+
+
+def compare(before_path, after_path):
+    before = json.loads(Path(before_path).read_text())
+    after = json.loads(Path(after_path).read_text())
+    print(f"{before['meta']['revision']} -> {after['meta']['revision']}")
+    if before["meta"]["concurrency"] != after["meta"]["concurrency"] or before["meta"]["mix"] != after["meta"]["mix"]:
+        print("attention : concurrence ou melange differents, comparaison indicative")
+
+    def delta(old, new):
+        return f"{(new - old) / old * 100:+.0f}%" if old else "n/a"
+
+    print(f"{'scenario':<22}{'req/s':>16}{'p50 ms':>20}{'p95 ms':>20}{'p99 ms':>20}")
+    names = sorted(set(before["scenarios"]) | set(after["scenarios"]))
+    rows = [(name, before["scenarios"].get(name), after["scenarios"].get(name)) for name in names]
+    rows.append(("TOTAL", before["total"], after["total"]))
+    for name, old, new in rows:
+        if old is None or new is None:
+            print(f"{name:<22}{'(absent d un cote)':>16}")
+            continue
+        cells = []
+        for key in ("rps", "p50_ms", "p95_ms", "p99_ms"):
+            cells.append(f"{old[key]:.1f}->{new[key]:.1f} {delta(old[key], new[key]):>5}")
+        print(f"{name:<22}" + "".join(f"{cell:>20}" for cell in cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=os.environ.get("LOADTEST_BASE_URL", "http://localhost:8000"))
+    parser.add_argument("--username", default=os.environ.get("ADMIN_USERNAME"))
+    parser.add_argument("--password", default=os.environ.get("ADMIN_PASSWORD"))
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--mix", help="poids par scenario, ex. secret-pull=50,password-list=10 (defaut : melange type)")
+    parser.add_argument("--entries", type=int, default=300, help="entrees creees pour le test")
+    parser.add_argument("--secrets", type=int, default=50, help="bundles de secrets crees pour le test")
+    parser.add_argument("--label", default="")
+    parser.add_argument("--output", help=f"fichier JSON (defaut : {RESULTS_DIR.name}/<revision>.json)")
+    parser.add_argument("--keep", action="store_true", help="ne pas supprimer les donnees de test")
+    parser.add_argument("--verbose", action="store_true")
+    parser.add_argument("--compare", nargs=2, metavar=("AVANT", "APRES"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+    if not args.username or not args.password:
+        parser.error("--username/--password (ou ADMIN_USERNAME/ADMIN_PASSWORD) requis")
+
+    report = run(args)
+    print_report(report)
+    name = report["meta"]["revision"] + (f"-{args.label}" if args.label else "")
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{name}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"resultats : {output}")
+
+
+if __name__ == "__main__":
+    main()